@@ -0,0 +1,40 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+# BEGIN variants SQLite accepts for write transactions
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Stock SQLite backend plus two extra OPTIONS:
+
+    `pragmas`: PRAGMA name -> value, applied to every new connection
+    (e.g. journal_mode=WAL so readers are not blocked by a writer).
+    `transaction_mode`: how atomic blocks open their transaction. IMMEDIATE takes
+    the write lock up front, so concurrent writers wait on busy_timeout instead of
+    failing with "database is locked" when a deferred read lock cannot be upgraded.
+    """
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        self.pragmas = kwargs.pop('pragmas', {})
+        transaction_mode = kwargs.pop('transaction_mode', None)
+        if transaction_mode is not None and transaction_mode.upper() not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f"transaction_mode must be one of {', '.join(TRANSACTION_MODES)}, got {transaction_mode!r}."
+            )
+        self.transaction_mode = transaction_mode.upper() if transaction_mode else None
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        if self.transaction_mode:
+            self.cursor().execute(f"BEGIN {self.transaction_mode}")
+        else:
+            super()._start_transaction_under_autocommit()
@@ -77,13 +77,41 @@ WSGI_APPLICATION = 'scheduler.wsgi.application'
 # ------------------------
 # DATABASE (SQLite)
 # ------------------------
+# SQLite tuned for concurrent use: WAL lets schedule views read while a generated
+# timetable is being written, and writers queue on busy_timeout instead of failing.
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'scheduler.db.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'transaction_mode': config('SQLITE_TRANSACTION_MODE', default='IMMEDIATE'),
+            'pragmas': {
+                'journal_mode': config('SQLITE_JOURNAL_MODE', default='WAL'),
+                'synchronous': config('SQLITE_SYNCHRONOUS', default='NORMAL'),
+                'busy_timeout': config('SQLITE_BUSY_TIMEOUT_MS', default=20000, cast=int),
+                'mmap_size': config('SQLITE_MMAP_SIZE', default=128 * 1024 * 1024, cast=int),
+            },
+        },
     }
 }
 
+# ------------------------
+# CACHE
+# ------------------------
+# Local memory by default; point CACHE_BACKEND at e.g. FileBasedCache (with CACHE_LOCATION
+# set to a directory) to share the cache between worker processes.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='scheduler-default'),
+        'TIMEOUT': config('CACHE_TIMEOUT', default=60 * 60, cast=int),
+    }
+}
+# Lifetime of cached reference-data responses (keys are versioned, so this only bounds staleness of unused entries)
+REFERENCE_CACHE_TIMEOUT = config('REFERENCE_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+
 # ------------------------
 # REST FRAMEWORK SETTINGS
 # ------------------------
@@ -97,7 +125,7 @@ REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'scheduler_app.pagination.HybridPagination',  # ?paginate=cursor for keyset pages
     'PAGE_SIZE': 100,   # increase so dashboard shows more entries by default
 }
 
@@ -173,3 +201,21 @@ REST_API_HEALTHCHECK = {
     "status": "ok",
     "api_base": "/api/"
 }
+
+# Timetable export artifact store (rendered PDF/Excel downloads)
+EXPORT_CACHE_ALIAS = 'default'
+EXPORT_CACHE_TIMEOUT = config('EXPORT_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+EXPORT_PRERENDER_IN_BACKGROUND = config('EXPORT_PRERENDER_IN_BACKGROUND', default=True, cast=bool)
+# Worker processes rendering bundle pages (0 = one per CPU up to 4, 1 = render inline)
+EXPORT_BUNDLE_WORKERS = config('EXPORT_BUNDLE_WORKERS', default=0, cast=int)
+
+# Weekly slot layout used for MeetingTime generation, the GA and the exports.
+# Any key of scheduler_app.slot_template.DEFAULT_SLOT_TEMPLATE may be overridden here.
+TIMETABLE_SLOT_TEMPLATE = {}
+
+# GA checkpoints: snapshots of running generations, so a run cut short by a worker restart can be resumed
+GA_CHECKPOINT_DIR = config('GA_CHECKPOINT_DIR', default=os.path.join(BASE_DIR, 'ga_checkpoints'))
+# Minimum seconds between two checkpoint writes of the same run
+GA_CHECKPOINT_INTERVAL = config('GA_CHECKPOINT_INTERVAL', default=30, cast=float)
+# Checkpoints of runs that died or failed are pruned once this many seconds old (default: 7 days)
+GA_CHECKPOINT_MAX_AGE = config('GA_CHECKPOINT_MAX_AGE', default=7 * 24 * 60 * 60, cast=int)
@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class SchedulerAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'scheduler_app'
\ No newline at end of file
+    name = 'scheduler_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
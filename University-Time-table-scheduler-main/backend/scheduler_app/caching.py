@@ -0,0 +1,106 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+STATS_OUTCOMES = ('hit', 'miss')
+
+
+def _version_key(model):
+    return f"version:{model._meta.label_lower}"
+
+
+def model_version(model):
+    """Current cache version of a model; bumped whenever one of its rows (or relations) changes."""
+    version = cache.get(_version_key(model))
+    if version is None:
+        cache.add(_version_key(model), 1, None)
+        version = cache.get(_version_key(model), 1)
+    return version
+
+
+def bump_model_version(model):
+    try:
+        cache.incr(_version_key(model))
+    except ValueError:
+        # Key expired or never set: any fresh value orphans the old entries
+        cache.set(_version_key(model), model_version(model) + 1, None)
+
+
+def _record(namespace, outcome):
+    key = f"stats:{namespace}:{outcome}"
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def cache_stats():
+    """Hit/miss counters per namespace, e.g. {'department-list': {'hit': 12, 'miss': 1, 'hit_rate': 0.92}}."""
+    namespaces = cache.get('stats:namespaces', set())
+    stats = {}
+    for namespace in sorted(namespaces):
+        counts = cache.get_many([f"stats:{namespace}:{outcome}" for outcome in STATS_OUTCOMES])
+        hit = counts.get(f"stats:{namespace}:hit", 0)
+        miss = counts.get(f"stats:{namespace}:miss", 0)
+        stats[namespace] = {'hit': hit, 'miss': miss, 'hit_rate': round(hit / (hit + miss), 2) if hit + miss else None}
+    return stats
+
+
+def _register_namespace(namespace):
+    namespaces = cache.get('stats:namespaces', set())
+    if namespace not in namespaces:
+        cache.set('stats:namespaces', namespaces | {namespace}, None)
+
+
+def _reference_key(namespace, models, key):
+    versions = '.'.join(str(model_version(model)) for model in models)
+    return f"ref:{namespace}:{versions}:{key}"
+
+
+def store_reference(namespace, models, key, value):
+    """Cache `value` as cached_reference would, under the current versions of `models`."""
+    cache.set(_reference_key(namespace, models, key), value, getattr(settings, 'REFERENCE_CACHE_TIMEOUT', 60 * 60 * 24))
+
+
+def cached_reference(namespace, models, key, build):
+    """
+    Read-through cache: return the value for `key` under `namespace`, calling `build()` on a miss.
+    The key embeds the versions of `models`, so a signal-driven bump makes old entries unreachable.
+    A build that itself bumps one of `models` must store its result again with store_reference.
+    """
+    cache_key = _reference_key(namespace, models, key)
+    value = cache.get(cache_key)
+    _register_namespace(namespace)
+    if value is not None:
+        _record(namespace, 'hit')
+        return value
+    _record(namespace, 'miss')
+    value = build()
+    cache.set(cache_key, value, getattr(settings, 'REFERENCE_CACHE_TIMEOUT', 60 * 60 * 24))
+    return value
+
+
+class ReferenceCacheMixin:
+    """
+    Serve list/retrieve responses of rarely-changing reference data from the cache.
+    `cache_models` lists every model whose data ends up in the serialized rows.
+    """
+    cache_models = ()
+
+    def _cached_response(self, action, request, render):
+        models = self.cache_models or (self.get_queryset().model,)
+        data = cached_reference(
+            f"{self.basename}-{action}", models, request.get_full_path(), lambda: render().data
+        )
+        return Response(data)
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response('list', request, lambda: super(ReferenceCacheMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached_response('retrieve', request, lambda: super(ReferenceCacheMixin, self).retrieve(request, *args, **kwargs))
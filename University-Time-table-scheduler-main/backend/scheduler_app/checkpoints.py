@@ -0,0 +1,196 @@
+"""
+GA checkpoints: snapshots of a running evolution, so a run cut short by a worker restart or
+timeout can continue from its last saved generation instead of starting over.
+
+A checkpoint file is a small pickled header (for listing) followed by the zlib-compressed,
+pickled state: population genomes as id tuples, random state, generation counter, best-so-far
+timetable and progression. Files are only ever written by the server itself under
+GA_CHECKPOINT_DIR, and checkpoint ids are restricted to CHECKPOINT_ID_PATTERN.
+
+A finished run discards its checkpoint once the timetable is stored. Checkpoints of runs
+that died or failed stay resumable until they are GA_CHECKPOINT_MAX_AGE seconds old,
+then the next listing or checkpoint write prunes them.
+"""
+import logging
+import os
+import pickle
+import re
+import tempfile
+import threading
+import time
+import zlib
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_ID_PATTERN = r'^[A-Za-z0-9_-]{1,64}$'
+CHECKPOINT_SUFFIX = '.ckpt'
+
+
+def checkpoint_dir():
+    return getattr(settings, 'GA_CHECKPOINT_DIR', os.path.join(settings.BASE_DIR, 'ga_checkpoints'))
+
+
+def checkpoint_path(checkpoint_id):
+    if not re.match(CHECKPOINT_ID_PATTERN, str(checkpoint_id)):
+        raise ValueError(f"Invalid checkpoint id {checkpoint_id!r}")
+    return os.path.join(checkpoint_dir(), f"{checkpoint_id}{CHECKPOINT_SUFFIX}")
+
+
+def checkpoint_exists(checkpoint_id):
+    return os.path.exists(checkpoint_path(checkpoint_id))
+
+
+def prune_checkpoints(max_age=None):
+    """Remove checkpoints (and temp files of interrupted writes) not written for max_age seconds."""
+    max_age = getattr(settings, 'GA_CHECKPOINT_MAX_AGE', 7 * 24 * 60 * 60) if max_age is None else max_age
+    directory = checkpoint_dir()
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return
+    cutoff = time.time() - max_age
+    for name in names:
+        if not name.endswith((CHECKPOINT_SUFFIX, '.tmp')):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                logger.info("Pruned stale GA checkpoint %s", name)
+        except FileNotFoundError:
+            pass
+
+
+def _header(checkpoint_id, state):
+    params = state['params']
+    return {
+        'version': CHECKPOINT_VERSION,
+        'checkpoint_id': checkpoint_id,
+        'saved_at': timezone.now().isoformat(),
+        'generation': state['generation'],
+        'generations': params['generations'],
+        'best_fitness': state['best_fitness'],
+        'department_ids': params['department_ids'],
+        'years': params['years'],
+        'semesters': params['semesters'],
+    }
+
+
+def write_checkpoint(checkpoint_id, state):
+    """Write a checkpoint atomically: readers see the previous file or the new one, never a partial write."""
+    path = checkpoint_path(checkpoint_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    payload = zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            pickle.dump(_header(checkpoint_id, state), handle, protocol=pickle.HIGHEST_PROTOCOL)
+            handle.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    prune_checkpoints()
+
+
+def read_checkpoint(checkpoint_id, header_only=False):
+    """
+    (header, state) of a checkpoint; state is None with header_only.
+    Raises FileNotFoundError for an unknown id and ValueError for an incompatible file.
+    """
+    with open(checkpoint_path(checkpoint_id), 'rb') as handle:
+        header = pickle.load(handle)
+        if not isinstance(header, dict) or header.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Checkpoint {checkpoint_id!r} was written by an incompatible version")
+        if header_only:
+            return header, None
+        return header, pickle.loads(zlib.decompress(handle.read()))
+
+
+def list_checkpoints():
+    """Headers of every readable checkpoint, most recently saved first."""
+    prune_checkpoints()
+    try:
+        names = os.listdir(checkpoint_dir())
+    except FileNotFoundError:
+        return []
+    headers = []
+    for name in names:
+        checkpoint_id, suffix = os.path.splitext(name)
+        if suffix != CHECKPOINT_SUFFIX:
+            continue
+        try:
+            headers.append(read_checkpoint(checkpoint_id, header_only=True)[0])
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+            logger.warning("Skipping unreadable GA checkpoint %s", name)
+    return sorted(headers, key=lambda header: header['saved_at'], reverse=True)
+
+
+def discard_checkpoint(checkpoint_id):
+    try:
+        os.remove(checkpoint_path(checkpoint_id))
+    except FileNotFoundError:
+        pass
+
+
+class CheckpointWriter:
+    """
+    Rate-limited background writer for one run's checkpoints.
+
+    The GA offers a snapshot builder every generation. It is only called once
+    GA_CHECKPOINT_INTERVAL seconds have passed since the last snapshot and no earlier write
+    is still in flight; compressing and writing happen in a daemon thread, so the main loop
+    only pays for collecting the genomes.
+    """
+
+    def __init__(self, checkpoint_id, interval=None):
+        checkpoint_path(checkpoint_id)
+        self.checkpoint_id = checkpoint_id
+        self.interval = getattr(settings, 'GA_CHECKPOINT_INTERVAL', 30) if interval is None else interval
+        self.writes = 0
+        self.snapshot_seconds = 0.0  # Main-loop time spent taking snapshots
+        self.write_seconds = 0.0  # Background time spent compressing and writing
+        self._last = time.monotonic()  # First checkpoint one interval into the run
+        self._thread = None
+
+    def maybe_save(self, build_state):
+        """Write build_state() in the background if it is due; True if a snapshot was taken."""
+        if time.monotonic() - self._last < self.interval:
+            return False
+        if self._thread and self._thread.is_alive():
+            return False
+        started = time.perf_counter()
+        state = build_state()
+        self.snapshot_seconds += time.perf_counter() - started
+        self._thread = threading.Thread(
+            target=self._write, args=(state,), name=f"ga-checkpoint-{self.checkpoint_id}", daemon=True
+        )
+        self._thread.start()
+        self._last = time.monotonic()
+        return True
+
+    def _write(self, state):
+        started = time.perf_counter()
+        try:
+            write_checkpoint(self.checkpoint_id, state)
+            self.writes += 1
+        except Exception:
+            logger.exception("Failed to write GA checkpoint %s", self.checkpoint_id)
+        self.write_seconds += time.perf_counter() - started
+
+    def wait(self):
+        """Block until the last write has finished."""
+        if self._thread:
+            self._thread.join()
+
+    def stats(self):
+        return {
+            'checkpoint_id': self.checkpoint_id,
+            'writes': self.writes,
+            'snapshot_seconds': round(self.snapshot_seconds, 4),
+            'write_seconds': round(self.write_seconds, 4),
+        }
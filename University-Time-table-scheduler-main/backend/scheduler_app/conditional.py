@@ -0,0 +1,61 @@
+import hashlib
+
+from django.db.models import CharField, Count, Max, Value
+from django.utils.cache import get_conditional_response
+
+
+def _collection_stats(queryset, label):
+    """One-row (label, max(updated_at), count) query for a queryset, for combining with UNION ALL."""
+    return queryset.order_by().annotate(
+        label=Value(label, output_field=CharField())
+    ).values('label').annotate(latest=Max('updated_at'), total=Count('pk')).values_list('label', 'latest', 'total')
+
+
+def collection_validators(request, querysets):
+    """
+    ETag for a collection response.
+
+    Built from max(updated_at) and the row count of every queryset the payload is
+    rendered from (fetched in a single UNION ALL query), so edits, additions and
+    deletions all change it. The request path and query string are part of the ETag
+    since they select the page and the representation.
+
+    No Last-Modified is derived: a whole-second max(updated_at) stays the same after
+    a deletion or a second edit within the same second, so If-Modified-Since would
+    answer 304 for a changed collection.
+    """
+    stats = [_collection_stats(queryset, str(index)) for index, queryset in enumerate(querysets)]
+    rows = {label: (latest, total) for label, latest, total in stats[0].union(*stats[1:], all=True)}
+
+    parts = [request.get_full_path()]
+    for index, queryset in enumerate(querysets):
+        latest, total = rows.get(str(index), (None, 0))
+        parts.append(f"{queryset.model._meta.label}:{total}:{latest and latest.timestamp()}")
+    return '"%s"' % hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+
+class ConditionalListMixin:
+    """
+    Answer list requests with 304 Not Modified when the collection has not changed,
+    without serializing it. `conditional_dependencies` lists the models whose data is
+    rendered into each row (e.g. instructor names on courses).
+    """
+    conditional_dependencies = ()
+
+    def conditional_querysets(self, queryset):
+        return [queryset.model._default_manager.filter(pk__in=queryset.values('pk'))] + [
+            model._default_manager.all() for model in self.conditional_dependencies
+        ]
+
+    def conditional_response(self, request, queryset, render):
+        etag = collection_validators(request, self.conditional_querysets(queryset))
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = render()
+        response['ETag'] = etag
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.conditional_response(request, queryset, lambda: super(ConditionalListMixin, self).list(request, *args, **kwargs))
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import close_old_connections, connection, transaction
+
+from .caching import model_version
+from .models import Course, Instructor, MeetingTime, Room, Section, Timetable
+from .pdf_rendering import render_page_pdf
+from .timetable_grid import EXPORT_DAYS, build_timetable_grid, schedule_table_data, section_heading
+from .utils import _timetable_classes, export_timetable_pdf, export_timetable_excel
+
+logger = logging.getLogger(__name__)
+
+# Renderers for every downloadable artifact format
+EXPORT_RENDERERS = {
+    'pdf': export_timetable_pdf,
+    'excel': export_timetable_excel,
+}
+
+
+# Models whose names and times are printed on the artifacts; an edit to any of them must not
+# serve an export (or ETag) rendered before it
+EXPORT_DEPENDENCIES = (Course, Instructor, Room, Section, MeetingTime)
+
+# Render processes per bundle request unless EXPORT_BUNDLE_WORKERS says otherwise
+DEFAULT_BUNDLE_WORKERS = 4
+
+
+def _export_cache():
+    return caches[getattr(settings, 'EXPORT_CACHE_ALIAS', 'default')]
+
+
+def _artifact_key(timetable, fmt):
+    """Cache key for a rendered artifact; changes whenever the timetable or a row it prints is saved."""
+    versions = ':'.join(str(model_version(model)) for model in EXPORT_DEPENDENCIES)
+    return f"export:{timetable.pk}:{fmt}:{timetable.updated_at.timestamp():.6f}:{versions}"
+
+
+def export_artifact_etag(timetable, fmt):
+    """Strong ETag for an artifact, derived from its key so it can be checked without rendering."""
+    digest = hashlib.sha1(_artifact_key(timetable, fmt).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def get_export_artifact(timetable, fmt):
+    """Return the rendered artifact for a timetable, rendering and storing it on a cache miss."""
+    store = _export_cache()
+    key = _artifact_key(timetable, fmt)
+    content = store.get(key)
+    if content is None:
+        content = EXPORT_RENDERERS[fmt](timetable)
+        store.set(key, content, getattr(settings, 'EXPORT_CACHE_TIMEOUT', 60 * 60 * 24))
+    return content
+
+
+def invalidate_export_artifacts(timetable):
+    """
+    Drop cached artifacts for a timetable and bump its updated_at so any
+    artifact rendered concurrently from the old state is never served again.
+    """
+    _export_cache().delete_many([_artifact_key(timetable, fmt) for fmt in EXPORT_RENDERERS])
+    timetable.save(update_fields=['updated_at'])
+
+
+def prerender_export_artifacts(timetable_id):
+    """Render every export format for a timetable into the artifact store."""
+    try:
+        timetable = Timetable.objects.get(pk=timetable_id)
+        for fmt in EXPORT_RENDERERS:
+            get_export_artifact(timetable, fmt)
+        logger.info("Pre-rendered export artifacts for timetable %s", timetable_id)
+    except Timetable.DoesNotExist:
+        logger.warning("Timetable %s disappeared before its exports were pre-rendered", timetable_id)
+    except Exception:
+        logger.exception("Failed to pre-render exports for timetable %s", timetable_id)
+
+
+def _prerender_in_thread(timetable_id):
+    close_old_connections()
+    try:
+        prerender_export_artifacts(timetable_id)
+    finally:
+        connection.close()
+
+
+def schedule_export_prerender(timetable):
+    """Pre-render a timetable's exports once the current transaction commits."""
+    timetable_id = timetable.pk
+
+    def _start():
+        if getattr(settings, 'EXPORT_PRERENDER_IN_BACKGROUND', True):
+            threading.Thread(target=_prerender_in_thread, args=(timetable_id,), daemon=True).start()
+        else:
+            prerender_export_artifacts(timetable_id)
+
+    transaction.on_commit(_start)
+
+
+def _page_key(timetable, page):
+    """Content-addressed key for one rendered page: unchanged pages keep their key across edits."""
+    digest = hashlib.sha1(json.dumps(page, sort_keys=True).encode()).hexdigest()
+    return f"export-page:{timetable.pk}:{digest}"
+
+
+def bundle_pages(timetable, include_instructors=False):
+    """
+    Plain-data page payloads for a timetable bundle as (archive path, page) pairs:
+    one page per section and, optionally, one per instructor.
+    """
+    classes = list(_timetable_classes(timetable))
+    groupings = [('sections', 'section', 'instructor')]
+    if include_instructors:
+        groupings.append(('instructors', 'instructor', 'section'))
+
+    pages = []
+    for folder, group_by, detail in groupings:
+        grid = build_timetable_grid(classes, days=EXPORT_DAYS, group_by=group_by)
+        used = set()
+        for group_id in sorted(grid.sections):
+            section = grid.sections[group_id]
+            pages.append((_archive_path(folder, _archive_name(group_id), used), {
+                'title': timetable.name,
+                'heading': section_heading(section),
+                'table_data': schedule_table_data(section, detail),
+            }))
+    return pages
+
+
+def _archive_name(group_id):
+    return ''.join(ch if ch.isalnum() or ch in '-_' else '_' for ch in group_id).strip('_') or 'page'
+
+
+def _archive_path(folder, name, used):
+    """Distinct groups can sanitise to one name ('CSE 1A', 'CSE_1A'): number the later ones."""
+    path, number = f"{folder}/{name}.pdf", 2
+    while path in used:
+        path, number = f"{folder}/{name}-{number}.pdf", number + 1
+    used.add(path)
+    return path
+
+
+def _render_pages(pages):
+    """Render page payloads, in a process pool when more than one worker is configured."""
+    workers = getattr(settings, 'EXPORT_BUNDLE_WORKERS', None) or min(os.cpu_count() or 1, DEFAULT_BUNDLE_WORKERS)
+    workers = min(workers, len(pages))
+    if workers <= 1:
+        return [render_page_pdf(page) for page in pages]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(render_page_pdf, pages))
+
+
+def export_timetable_bundle(timetable, include_instructors=False):
+    """
+    Write a ZIP of per-section (and optionally per-instructor) PDFs to a temporary file.
+    Pages are cached individually, so after a slot edit only the affected pages are re-rendered.
+    """
+    store = _export_cache()
+    pages = bundle_pages(timetable, include_instructors)
+    keys = [_page_key(timetable, page) for _, page in pages]
+    rendered = store.get_many(keys)
+
+    missing = [(key, page) for key, (_, page) in zip(keys, pages) if key not in rendered]
+    if missing:
+        fresh = dict(zip([key for key, _ in missing], _render_pages([page for _, page in missing])))
+        store.set_many(fresh, getattr(settings, 'EXPORT_CACHE_TIMEOUT', 60 * 60 * 24))
+        rendered.update(fresh)
+    logger.info("Bundle for timetable %s: %d pages, %d rendered", timetable.pk, len(pages), len(missing))
+
+    archive = tempfile.TemporaryFile()
+    # PDFs are already compressed, store them as-is
+    with zipfile.ZipFile(archive, 'w', compression=zipfile.ZIP_STORED) as bundle:
+        for (path, _), key in zip(pages, keys):
+            bundle.writestr(path, rendered[key])
+    archive.seek(0)
+    return archive
@@ -2,16 +2,278 @@ import random
 import copy
 import logging
 import datetime
+import time
 from tqdm import tqdm
 
+from .caching import cached_reference
+from .checkpoints import CheckpointWriter, checkpoint_path, read_checkpoint
+from .global_occupancy import active_busy_masks
 from .models import Instructor, Room, MeetingTime, Department, Course, Section, Class
+from .room_assignment import assign_section_rooms
+from .slot_template import get_slot_template
 
 logger = logging.getLogger(__name__)
 
+# Soft-constraint penalties shared by the fitness function and slot suggestions
+LUNCH_BREAK_PENALTY = 100  # Class spanning lunch, or ending right before it
+POST_LUNCH_PENALTY = 50  # No post-lunch slot (13:45 and later) used at all
+DISTRIBUTION_PENALTY_WEIGHT = 10  # Multiplier on the std-dev of classes per weekday
+AVAILABILITY_PENALTY = 1000  # Class in blocked hours, hour over the daily maximum, or resource taken by an active timetable
+
+# Time layout comes from the slot template shared with MeetingTime generation and the exports
+SLOT_TEMPLATE = get_slot_template()
+LUNCH_START = SLOT_TEMPLATE.lunch_start
+LUNCH_END = SLOT_TEMPLATE.lunch_end
+POST_LUNCH_START = SLOT_TEMPLATE.post_lunch_start
+
+
+def suitable_meeting_times(meeting_times, course):
+    """Meeting times suitable for the course based on its duration and type"""
+    duration = getattr(course, 'duration', 1)
+    course_type = getattr(course, 'course_type', '')
+
+    # Start with all available meeting times
+    base_times = list(meeting_times)
+
+    # Exclude the template's no-lab starts (12:00 by default) for lab courses
+    if course_type == 'Lab':
+        base_times = [mt for mt in base_times if mt.start_time not in SLOT_TEMPLATE.lab_excluded_starts]
+
+    if duration == 1:
+        # All filtered meeting times are suitable for 1-hour courses
+        return base_times
+    else:
+        # For courses longer than 1 hour, only allow slots that won't cause the class to extend beyond 17:00 (by default)
+        suitable_times = []
+        for mt in base_times:
+            # Calculate the actual end time
+            start_time = mt.start_time
+            end_time = datetime.time(hour=(start_time.hour + duration) % 24, minute=start_time.minute)
+            # Check if the class ends in time
+            if end_time <= SLOT_TEMPLATE.latest_multi_hour_end:
+                suitable_times.append(mt)
+        return suitable_times
+
+
+def spans_lunch_break(start_time, end_time):
+    """Class spans lunch if it starts before lunch ends and ends after lunch starts"""
+    return start_time < LUNCH_END and end_time > LUNCH_START
+
+
+# How rooms are chosen: pinned one per section, or a gene picked per class from a shared pool
+ROOM_MODES = ('section', 'pool')
+
+# Mutation operators: blind redraws of random genes, or reassignment aimed at the genes in clashes
+MUTATION_OPERATORS = ('random', 'conflict_directed')
+CONFLICT_GENE_MUTATION_RATE = 0.5  # Chance a clashing or penalised class is reassigned per mutation
+CLEAN_GENE_MUTATION_SHARE = 0.1  # Share of mutation_rate left for clean classes while clashes remain
+
+GENE_RESOURCES = ('instructor', 'room', 'section')
+
+# Population diversity: mean share of classes assigned differently between sampled pairs of timetables
+DIVERSITY_RESPONSES = ('restart', 'hypermutation', 'none')
+DIVERSITY_SAMPLE_PAIRS = 10
+DIVERSITY_THRESHOLD = 0.05  # Below this the population has (nearly) collapsed to clones
+# Children of one parent differ by about 2 x mutation_rate, so less than this multiple means clones dominate
+CONVERGENCE_RATE_MULTIPLE = 1.5
+DIVERSITY_COOLDOWN = 10  # Generations after a response before low diversity is acted on again
+MAX_FUTILE_RESPONSES = 3  # Converged again after this many responses without improvement: stop
+RESTART_SHARE = 0.5  # Share of the non-elite population replaced by fresh random timetables
+HYPERMUTATION_FACTOR = 5  # mutation_rate multiplier during a burst (capped at 0.5)
+HYPERMUTATION_GENERATIONS = 5
+
+# Assignments that make up a class's genome; the rest of a class comes from all_classes
+GENOME_FIELDS = ('instructor', 'room', 'meeting_time')
+
+# Crossover operators by name: functions (ga, parent1, parent2) -> (child1, child2)
+CROSSOVER_OPERATORS = {}
+
+
+def crossover_operator(name):
+    """Register a crossover operator under `name`, selectable with GeneticAlgorithm(crossover_operator=name)."""
+    def register(function):
+        CROSSOVER_OPERATORS[name] = function
+        return function
+    return register
+
+
+@crossover_operator('single_point')
+def single_point_crossover(ga, parent1, parent2):
+    """One cut over the flat class list (section-major, then course-major)."""
+    crossover_point = random.randint(1, len(parent1) - 1)
+    child1 = parent1[:crossover_point] + parent2[crossover_point:]
+    child2 = parent2[:crossover_point] + parent1[crossover_point:]
+    return child1, child2
+
+
+@crossover_operator('section_block')
+def section_block_crossover(ga, parent1, parent2):
+    """Each child inherits every section's whole week from one parent, so no section's own week is torn apart."""
+    child1, child2 = [None] * len(parent1), [None] * len(parent1)
+    for block in ga.section_blocks:
+        first, second = (parent1, parent2) if random.random() < 0.5 else (parent2, parent1)
+        for index in block:
+            child1[index], child2[index] = dict(first[index]), dict(second[index])
+    return child1, child2
+
+
+@crossover_operator('uniform')
+def uniform_crossover(ga, parent1, parent2):
+    """Each class comes from either parent with equal chance."""
+    child1, child2 = [], []
+    for gene1, gene2 in zip(parent1, parent2):
+        if random.random() < 0.5:
+            gene1, gene2 = gene2, gene1
+        child1.append(dict(gene1))
+        child2.append(dict(gene2))
+    return child1, child2
+
+
+def _pmx(order1, order2, start, end):
+    """Partially mapped crossover of two equal-length sequences, each of distinct values: the result is too."""
+    child = list(order1)
+    child[start:end] = order2[start:end]
+    mapping = dict(zip(order2[start:end], order1[start:end]))
+    segment = set(order2[start:end])
+    for position in list(range(start)) + list(range(end, len(order1))):
+        value = order1[position]
+        while value in segment:
+            value = mapping[value]
+        child[position] = value
+    return child
+
+
+@crossover_operator('pmx')
+def pmx_crossover(ga, parent1, parent2):
+    """
+    PMX over meeting times: within each group of a section's interchangeable classes (same
+    duration and type) children mix the parents' time slots without handing the group
+    the same slot twice. Instructors and rooms stay with the parent the class is copied from.
+    """
+    child1, child2 = [dict(gene) for gene in parent1], [dict(gene) for gene in parent2]
+    for group in ga.slot_groups:
+        times1 = [parent1[index]['meeting_time'] for index in group]
+        times2 = [parent2[index]['meeting_time'] for index in group]
+        # PMX needs distinct slots on both sides; leave groups with repeated or missing slots as copied
+        if len(group) < 2 or None in times1 or None in times2 or \
+                len(set(times1)) < len(group) or len(set(times2)) < len(group):
+            continue
+        start, end = sorted(random.sample(range(len(group) + 1), 2))
+        for child, order in ((child1, _pmx(times1, times2, start, end)), (child2, _pmx(times2, times1, start, end))):
+            for index, meeting_time in zip(group, order):
+                child[index]['meeting_time'] = meeting_time
+    return child1, child2
+
+# Days the GA schedules
+TEACHING_DAYS = SLOT_TEMPLATE.teaching_days
+# Room-hours available per room each week: the grid's teaching slots on the scheduled days
+WEEKLY_ROOM_HOURS = len(TEACHING_DAYS) * (len(SLOT_TEMPLATE.grid_time_slots()) - 1)
+
+
+def quarter_cells(meeting_time, duration):
+    """Quarter-hour cells (day, index) a class covers, so 13:45 and 14:00 starts still collide."""
+    start = meeting_time.start_time.hour * 60 + meeting_time.start_time.minute
+    return [(meeting_time.day, quarter) for quarter in range(start // 15, (start + 60 * (duration or 1)) // 15)]
+
+
+class RoomSlotIndex:
+    """Bookings per (room, quarter-hour) for one individual: O(duration) clash checks instead of rescanning classes."""
+
+    def __init__(self, individual=()):
+        self.booked = {}
+        for class_obj in individual:
+            self.add(class_obj)
+
+    def _keys(self, class_obj, room=None):
+        room = room or class_obj.get('room')
+        if not room or not class_obj.get('meeting_time'):
+            return []
+        return [(room.id,) + cell for cell in quarter_cells(class_obj['meeting_time'], class_obj.get('duration', 1))]
+
+    def add(self, class_obj):
+        for key in self._keys(class_obj):
+            self.booked[key] = self.booked.get(key, 0) + 1
+
+    def remove(self, class_obj):
+        for key in self._keys(class_obj):
+            if self.booked.get(key, 0) > 1:
+                self.booked[key] -= 1
+            else:
+                self.booked.pop(key, None)
+
+    def is_free(self, room, class_obj):
+        return not any(key in self.booked for key in self._keys(class_obj, room))
+
+
+class GeneOccupancy:
+    """
+    Quarter-hour busy masks per instructor, room and section of one individual, plus
+    instructor hours per day. Lift a class out with remove(index) before changing it and
+    put it back with add(index), so candidate slots are checked with one AND each.
+    """
+
+    def __init__(self, ga, individual):
+        self.ga = ga
+        self.individual = individual
+        self.genes = {}  # (kind, id) -> {index: mask}
+        self.masks = {}  # (kind, id) -> OR of its genes, rebuilt lazily
+        self.hours = {}  # (instructor id, day) -> booked hours
+        for index in range(len(individual)):
+            self.add(index)
+
+    def _entries(self, index):
+        class_obj = self.individual[index]
+        if not class_obj.get('meeting_time'):
+            return None, []
+        bits = self.ga._occupancy_mask(class_obj['meeting_time'], class_obj.get('duration', 1) or 1)
+        return bits, [(kind, class_obj[kind].id) for kind in GENE_RESOURCES if class_obj.get(kind)]
+
+    def add(self, index):
+        bits, keys = self._entries(index)
+        for key in keys:
+            self.genes.setdefault(key, {})[index] = bits
+            self.masks.pop(key, None)
+        class_obj = self.individual[index]
+        if bits and class_obj.get('instructor'):
+            day = (class_obj['instructor'].id, class_obj['meeting_time'].day)
+            self.hours[day] = self.hours.get(day, 0) + (class_obj.get('duration', 1) or 1)
+
+    def remove(self, index):
+        bits, keys = self._entries(index)
+        for key in keys:
+            self.genes.get(key, {}).pop(index, None)
+            self.masks.pop(key, None)
+        class_obj = self.individual[index]
+        if bits and class_obj.get('instructor'):
+            day = (class_obj['instructor'].id, class_obj['meeting_time'].day)
+            self.hours[day] -= class_obj.get('duration', 1) or 1
+
+    def mask(self, kind, resource):
+        key = (kind, resource.id)
+        mask = self.masks.get(key)
+        if mask is None:
+            mask = 0
+            for bits in self.genes.get(key, {}).values():
+                mask |= bits
+            self.masks[key] = mask
+        return mask
+
 
 class GeneticAlgorithm:
     def __init__(self, department_ids, years, semesters, population_size=50,
-                 mutation_rate=0.1, elite_rate=0.1, generations=500, progress_bar=True):
+                 mutation_rate=0.1, elite_rate=0.1, generations=500, progress_bar=True, room_mode='section',
+                 respect_active=True, mutation_operator='random', crossover_operator='single_point',
+                 diversity_response='none', checkpoint_id=None):
+        if room_mode not in ROOM_MODES:
+            raise ValueError(f"room_mode must be one of {ROOM_MODES}, got {room_mode!r}")
+        if mutation_operator not in MUTATION_OPERATORS:
+            raise ValueError(f"mutation_operator must be one of {MUTATION_OPERATORS}, got {mutation_operator!r}")
+        if crossover_operator not in CROSSOVER_OPERATORS:
+            raise ValueError(f"crossover_operator must be one of {tuple(CROSSOVER_OPERATORS)}, got {crossover_operator!r}")
+        if diversity_response not in DIVERSITY_RESPONSES:
+            raise ValueError(f"diversity_response must be one of {DIVERSITY_RESPONSES}, got {diversity_response!r}")
+        if checkpoint_id is not None:
+            checkpoint_path(checkpoint_id)
         self.department_ids = department_ids if isinstance(department_ids, list) else [department_ids]
         self.years = years if isinstance(years, list) else [years]
         self.semesters = semesters if isinstance(semesters, list) else [semesters]
@@ -20,6 +282,14 @@ class GeneticAlgorithm:
         self.elite_rate = elite_rate
         self.generations = generations
         self.progress_bar = progress_bar
+        self.room_mode = room_mode
+        self.mutation_operator = mutation_operator
+        self.crossover_operator = crossover_operator
+        self.diversity_response = diversity_response
+        self.respect_active = respect_active
+        self.checkpoint_id = checkpoint_id
+        self.resume_state = None  # Set by from_checkpoint(): evolve() continues this run
+        self.run_stats = {}
 
         logger.info("GA Initializing with: department_ids=%s, years=%s, semesters=%s", department_ids, years, semesters)
 
@@ -30,63 +300,91 @@ class GeneticAlgorithm:
             year__in=self.years,
             semester__in=self.semesters
         )
-        self.instructors = Instructor.objects.filter(is_available=True)
-        self.rooms = Room.objects.filter(is_available=True)
-        # exclude lunch break slots and Saturday to focus on weekday scheduling
+        # Reference data changes rarely: load it as plain lists through the versioned cache
+        self.instructors = cached_reference(
+            'ga-instructors', (Instructor,), 'available',
+            lambda: list(Instructor.objects.filter(is_available=True))
+        )
+        self.rooms = cached_reference(
+            'ga-rooms', (Room,), 'available', lambda: list(Room.objects.filter(is_available=True))
+        )
+        # exclude lunch break slots and days outside the template's teaching days
         # Note: meeting_times will be filtered per course based on duration in generate_initial_population
-        self.all_meeting_times = MeetingTime.objects.filter(
-            is_lunch_break=False,
-            day__in=['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
-        ).order_by('day', 'start_time')
+        self.all_meeting_times = cached_reference(
+            'ga-meeting-times', (MeetingTime,), 'weekdays',
+            lambda: list(MeetingTime.objects.filter(
+                is_lunch_break=False,
+                day__in=TEACHING_DAYS
+            ).order_by('day', 'start_time'))
+        )
         self.meeting_times = list(self.all_meeting_times)  # For backward compatibility
 
-        # Assign room to the section based on student strength
-        self._assign_rooms_to_sections()
+        # Instructors and rooms booked by active timetables of other sections in the same term are
+        # fixed busy time, so departments can be generated separately without double-booking shared resources
+        self.external_busy = (
+            active_busy_masks(self.sections.values_list('id', flat=True), self.semesters) if respect_active
+            else {'instructor': {}, 'room': {}}
+        )
+
+        # Availability and occupancy bits per (meeting time, duration), so each check is a single AND
+        self._availability_masks = {}
+        self._occupancy_masks = {}
+
+        # Assign room to the section based on student strength, unless rooms are chosen per class
+        self._pool_candidates = {}
+        if self.room_mode == 'section':
+            self._assign_rooms_to_sections()
 
         logger.info("GA Data Loaded: %d sections, %d instructors, %d rooms, %d meeting_times",
-                    self.sections.count(), self.instructors.count(), self.rooms.count(), len(self.meeting_times))
+                    self.sections.count(), len(self.instructors), len(self.rooms), len(self.meeting_times))
 
         # Generate the required classes list (list of dicts) used by GA
         self.all_classes = self._generate_required_classes()
 
-    def _assign_rooms_to_sections(self):
-        """Assign one room per section based on student strength, preferring larger rooms and lab rooms for sections with labs"""
-        # Sort sections by student strength in descending order
-        sorted_sections = sorted(self.sections, key=lambda s: s.num_students, reverse=True)
-
-        # Keep track of assigned rooms
-        assigned_rooms = set()
-
-        for section in sorted_sections:
-            # Check if section has any lab courses
-            has_labs = section.courses.filter(course_type='Lab').exists()
-
-            if has_labs:
-                # For sections with labs, prioritize lab rooms that can accommodate students
-                available_rooms = [room for room in self.rooms if room.id not in assigned_rooms and room.room_type == 'Lab' and room.capacity >= section.num_students]
-                if not available_rooms:
-                    # Fallback to any room if no lab rooms available
-                    available_rooms = [room for room in self.rooms if room.id not in assigned_rooms and room.capacity >= section.num_students]
-                available_rooms.sort(key=lambda r: r.capacity, reverse=True)
-            else:
-                # For non-lab sections, use any room based on capacity
-                available_rooms = [room for room in self.rooms if room.id not in assigned_rooms and room.capacity >= section.num_students]
-                available_rooms.sort(key=lambda r: r.capacity, reverse=True)
-
-            if available_rooms:
-                # Assign the largest available room
-                assigned_room = available_rooms[0]
-                section.room = assigned_room
-                assigned_rooms.add(assigned_room.id)
-                logger.info("Assigned room %s (capacity %d, type: %s) to section %s (students %d, has_labs: %s)",
-                           assigned_room.room_number, assigned_room.capacity, assigned_room.room_type, section.section_id, section.num_students, has_labs)
-            else:
-                logger.warning("No suitable room found for section %s (students %d)", section.section_id, section.num_students)
-                section.room = None
+        # Class indexes per section, and per section's interchangeable classes, for the crossover operators
+        self.section_blocks = self._group_classes(lambda class_obj: class_obj['section'].id)
+        self.slot_groups = self._group_classes(lambda class_obj: (
+            class_obj['section'].id, class_obj['duration'], getattr(class_obj['course'], 'course_type', '')
+        ))
 
-        # Save the section assignments to database
-        for section in sorted_sections:
-            section.save()
+    @classmethod
+    def from_checkpoint(cls, checkpoint_id, **overrides):
+        """
+        A GA rebuilt with a checkpoint's parameters whose evolve() continues the saved run,
+        checkpointing under the same id. Raises FileNotFoundError for an unknown checkpoint
+        and ValueError if the classes to schedule changed since it was written.
+        """
+        _, state = read_checkpoint(checkpoint_id)
+        params = dict(state['params'], checkpoint_id=checkpoint_id)
+        params.update(overrides)
+        ga = cls(**params)
+        if [class_obj['id'] for class_obj in ga.all_classes] != state['classes']:
+            raise ValueError(f"Sections or courses changed since checkpoint {checkpoint_id!r} was saved")
+        ga.resume_state = state
+        return ga
+
+    def checkpoint_params(self):
+        """Constructor arguments that recreate this run, as stored in its checkpoints"""
+        return {
+            'department_ids': self.department_ids, 'years': self.years, 'semesters': self.semesters,
+            'population_size': self.population_size, 'mutation_rate': self.mutation_rate,
+            'elite_rate': self.elite_rate, 'generations': self.generations, 'room_mode': self.room_mode,
+            'respect_active': self.respect_active, 'mutation_operator': self.mutation_operator,
+            'crossover_operator': self.crossover_operator, 'diversity_response': self.diversity_response,
+        }
+
+    def _group_classes(self, key):
+        groups = {}
+        for index, class_obj in enumerate(self.all_classes):
+            groups.setdefault(key(class_obj), []).append(index)
+        return list(groups.values())
+
+    def _assign_rooms_to_sections(self):
+        """Assign one room per section: best fit by student strength, lab rooms for sections with labs"""
+        assignment = assign_section_rooms(self.sections, self.rooms)
+        rooms_by_id = {room.id: room for room in self.rooms}
+        for section in self.sections:
+            section.room = rooms_by_id.get(assignment.get(section.id))
 
     def _generate_required_classes(self):
         """
@@ -129,118 +427,148 @@ class GeneticAlgorithm:
 
     def _get_suitable_meeting_times(self, course):
         """Get meeting times suitable for the course based on its duration and type"""
-        duration = getattr(course, 'duration', 1)
-        course_type = getattr(course, 'course_type', '')
-
-        # Start with all available meeting times
-        base_times = list(self.all_meeting_times)
+        return suitable_meeting_times(self.all_meeting_times, course)
+
+    def _availability_mask(self, meeting_time, duration):
+        key = (meeting_time.id, duration)
+        mask = self._availability_masks.get(key)
+        if mask is None:
+            mask = self._availability_masks[key] = SLOT_TEMPLATE.availability_mask(
+                meeting_time.day, meeting_time.start_time, duration
+            )
+        return mask
+
+    def _occupancy_mask(self, meeting_time, duration):
+        key = (meeting_time.id, duration)
+        mask = self._occupancy_masks.get(key)
+        if mask is None:
+            mask = self._occupancy_masks[key] = SLOT_TEMPLATE.occupancy_mask(
+                meeting_time.day, meeting_time.start_time, duration
+            )
+        return mask
 
-        # Exclude 12:00 slot for lab courses
-        if course_type == 'Lab':
-            base_times = [mt for mt in base_times if mt.start_time != datetime.time(12, 0)]
+    def _externally_busy(self, kind, resource, meeting_time, duration):
+        """Instructor or room already booked by an active timetable during the class."""
+        busy = self.external_busy[kind].get(resource.id) if resource else None
+        if not busy or not meeting_time:
+            return False
+        return bool(busy & self._occupancy_mask(meeting_time, duration or 1))
 
-        if duration == 1:
-            # All filtered meeting times are suitable for 1-hour courses
-            return base_times
-        else:
-            # For courses longer than 1 hour, only allow slots that won't cause the class to extend beyond 17:00
-            suitable_times = []
-            for mt in base_times:
-                # Calculate the actual end time
-                start_time = mt.start_time
-                end_time = datetime.time(hour=(start_time.hour + duration) % 24, minute=start_time.minute)
-                # Check if the class ends by 17:00
-                if end_time <= datetime.time(17, 0):
-                    suitable_times.append(mt)
-            return suitable_times
+    def _instructor_free(self, instructor, meeting_time, duration):
+        """Instructor neither blocked nor teaching in an active timetable during the class (no instructor or time: free)."""
+        if not instructor or not meeting_time:
+            return True
+        if instructor.unavailable_slots and instructor.unavailable_slots & self._availability_mask(meeting_time, duration or 1):
+            return False
+        return not self._externally_busy('instructor', instructor, meeting_time, duration)
 
-    def generate_initial_population(self):
-        """Generate initial population of timetables"""
-        population = []
+    def _room_free(self, room, meeting_time, duration):
+        return not self._externally_busy('room', room, meeting_time, duration)
 
-        for _ in range(self.population_size):
-            individual = copy.deepcopy(self.all_classes)
-            used_rooms = {}  # Track used rooms per (day, start_time) to avoid conflicts
+    def _available_instructors(self, instructors, class_obj):
+        """Instructors free at the class's current time, or all of them if none is."""
+        free = [i for i in instructors if self._instructor_free(i, class_obj.get('meeting_time'), class_obj.get('duration', 1))]
+        return free or instructors
 
-            # Assign random instructor, room, and time to each class
-            for idx, class_obj in enumerate(individual):
-                # Assign instructor from course instructors, fallback to any available
-                try:
-                    available_instructors = list(class_obj['course'].instructors.all())
-                except Exception:
-                    available_instructors = []
+    def _available_times(self, meeting_times, class_obj):
+        """Meeting times the class's instructor and room are free in, or all of them if none is."""
+        duration = class_obj.get('duration', 1)
+        free = [
+            mt for mt in meeting_times
+            if self._instructor_free(class_obj.get('instructor'), mt, duration) and self._room_free(class_obj.get('room'), mt, duration)
+        ]
+        return free or meeting_times
 
-                if available_instructors:
-                    class_obj['instructor'] = random.choice(available_instructors)
-                elif self.instructors:
-                    class_obj['instructor'] = random.choice(list(self.instructors))
-                else:
-                    class_obj['instructor'] = None
+    def generate_initial_population(self):
+        """Generate initial population of timetables"""
+        return [self._random_individual() for _ in range(self.population_size)]
+
+    def _random_individual(self):
+        """One timetable seeded with random, clash-avoiding assignments"""
+        individual = copy.deepcopy(self.all_classes)
+        used_rooms = {}  # Track used rooms per (day, start_time) to avoid conflicts
+        daily_hours = {}  # Hours per (instructor, day), against max_hours_per_day
+        room_index = RoomSlotIndex()  # Room-pool mode: bookings per (room, quarter-hour)
+
+        # Assign random instructor, room, and time to each class
+        for idx, class_obj in enumerate(individual):
+            # Assign instructor from course instructors, fallback to any available
+            try:
+                available_instructors = list(class_obj['course'].instructors.all())
+            except Exception:
+                available_instructors = []
 
-                # Assign meeting time based on course duration, ensuring no conflicts with previous classes
-                suitable_times = self._get_suitable_meeting_times(class_obj['course'])
-                available_times = []
-                for mt in suitable_times:
-                    conflict = False
-                    for prev_class in individual[:idx]:
-                        if prev_class.get('meeting_time') and prev_class.get('instructor') == class_obj.get('instructor') and self._same_time_slot(prev_class, {'meeting_time': mt, 'duration': class_obj.get('duration', 1)}):
-                            conflict = True
-                            break
-                        if prev_class.get('meeting_time') and prev_class.get('section') == class_obj.get('section') and self._same_time_slot(prev_class, {'meeting_time': mt, 'duration': class_obj.get('duration', 1)}):
-                            conflict = True
-                            break
-                    if not conflict:
-                        available_times.append(mt)
-
-                if available_times:
-                    class_obj['meeting_time'] = random.choice(available_times)
-                elif suitable_times:
-                    # Fallback to any suitable time if no conflict-free time found
-                    class_obj['meeting_time'] = random.choice(suitable_times)
+            if available_instructors:
+                class_obj['instructor'] = random.choice(available_instructors)
+            elif self.instructors:
+                class_obj['instructor'] = random.choice(list(self.instructors))
+            else:
+                class_obj['instructor'] = None
+
+            # Assign meeting time based on course duration, ensuring no conflicts with previous classes
+            suitable_times = self._get_suitable_meeting_times(class_obj['course'])
+            instructor = class_obj.get('instructor')
+            duration = class_obj.get('duration', 1) or 1
+            section_room = class_obj['section'].room if self.room_mode == 'section' else None
+            available_times = []
+            for mt in suitable_times:
+                if instructor and not self._instructor_free(instructor, mt, duration):
+                    continue
+                if section_room and not self._room_free(section_room, mt, duration):
+                    continue
+                if instructor and instructor.max_hours_per_day and \
+                        daily_hours.get((instructor.id, mt.day), 0) + duration > instructor.max_hours_per_day:
+                    continue
+                conflict = False
+                for prev_class in individual[:idx]:
+                    if prev_class.get('meeting_time') and prev_class.get('instructor') == class_obj.get('instructor') and self._same_time_slot(prev_class, {'meeting_time': mt, 'duration': class_obj.get('duration', 1)}):
+                        conflict = True
+                        break
+                    if prev_class.get('meeting_time') and prev_class.get('section') == class_obj.get('section') and self._same_time_slot(prev_class, {'meeting_time': mt, 'duration': class_obj.get('duration', 1)}):
+                        conflict = True
+                        break
+                if not conflict:
+                    available_times.append(mt)
+
+            if available_times:
+                class_obj['meeting_time'] = random.choice(available_times)
+            elif suitable_times:
+                # Fallback to any suitable time if no conflict-free time found, outside blocked hours if possible
+                class_obj['meeting_time'] = random.choice(self._available_times(suitable_times, class_obj))
+            else:
+                # Fallback to any meeting time if no suitable ones found
+                if self.meeting_times:
+                    class_obj['meeting_time'] = random.choice(list(self.meeting_times))
                 else:
-                    # Fallback to any meeting time if no suitable ones found
-                    if self.meeting_times:
-                        class_obj['meeting_time'] = random.choice(list(self.meeting_times))
-                    else:
-                        class_obj['meeting_time'] = None
-
-                # Assign room from section's assigned room, fallback to course requirements, ensuring no conflict
-                if class_obj['section'].room:
-                    # Check if room is available at this time
-                    time_key = (class_obj['meeting_time'].day, class_obj['meeting_time'].start_time) if class_obj['meeting_time'] else None
-                    if time_key and time_key not in used_rooms:
-                        used_rooms[time_key] = set()
-                    if time_key and class_obj['section'].room.id not in used_rooms[time_key]:
-                        class_obj['room'] = class_obj['section'].room
-                        used_rooms[time_key].add(class_obj['section'].room.id)
-                    else:
-                        # Room not available, fallback
-                        suitable_rooms = self._get_suitable_rooms(class_obj['course'])
-                        available_rooms = [r for r in suitable_rooms if time_key and r.id not in used_rooms[time_key]]
-                        if available_rooms:
-                            class_obj['room'] = random.choice(available_rooms)
-                            used_rooms[time_key].add(class_obj['room'].id)
-                        elif self.rooms:
-                            available_rooms = [r for r in list(self.rooms) if time_key and r.id not in used_rooms[time_key]]
-                            if available_rooms:
-                                class_obj['room'] = random.choice(available_rooms)
-                                used_rooms[time_key].add(class_obj['room'].id)
-                            else:
-                                class_obj['room'] = None
-                        else:
-                            class_obj['room'] = None
+                    class_obj['meeting_time'] = None
+
+            if instructor and class_obj['meeting_time']:
+                key = (instructor.id, class_obj['meeting_time'].day)
+                daily_hours[key] = daily_hours.get(key, 0) + duration
+
+            if self.room_mode == 'pool':
+                # Room is a gene: any compatible room free for the whole class
+                class_obj['room'] = self._choose_pool_room(class_obj, room_index)
+                room_index.add(class_obj)
+            # Assign room from section's assigned room, fallback to course requirements, ensuring no conflict
+            elif class_obj['section'].room:
+                # Check if room is available at this time
+                time_key = (class_obj['meeting_time'].day, class_obj['meeting_time'].start_time) if class_obj['meeting_time'] else None
+                if time_key and time_key not in used_rooms:
+                    used_rooms[time_key] = set()
+                if time_key and class_obj['section'].room.id not in used_rooms[time_key] and \
+                        self._room_free(class_obj['section'].room, class_obj['meeting_time'], duration):
+                    class_obj['room'] = class_obj['section'].room
+                    used_rooms[time_key].add(class_obj['section'].room.id)
                 else:
-                    # Fallback to course requirements if section has no room assigned
+                    # Room not available, fallback
                     suitable_rooms = self._get_suitable_rooms(class_obj['course'])
-                    time_key = (class_obj['meeting_time'].day, class_obj['meeting_time'].start_time) if class_obj['meeting_time'] else None
-                    if time_key and time_key not in used_rooms:
-                        used_rooms[time_key] = set()
-                    available_rooms = [r for r in suitable_rooms if time_key and r.id not in used_rooms[time_key]]
+                    available_rooms = [r for r in suitable_rooms if time_key and r.id not in used_rooms[time_key] and self._room_free(r, class_obj['meeting_time'], duration)]
                     if available_rooms:
                         class_obj['room'] = random.choice(available_rooms)
                         used_rooms[time_key].add(class_obj['room'].id)
                     elif self.rooms:
-                        available_rooms = [r for r in list(self.rooms) if time_key and r.id not in used_rooms[time_key]]
+                        available_rooms = [r for r in list(self.rooms) if time_key and r.id not in used_rooms[time_key] and self._room_free(r, class_obj['meeting_time'], duration)]
                         if available_rooms:
                             class_obj['room'] = random.choice(available_rooms)
                             used_rooms[time_key].add(class_obj['room'].id)
@@ -248,10 +576,27 @@ class GeneticAlgorithm:
                             class_obj['room'] = None
                     else:
                         class_obj['room'] = None
+            else:
+                # Fallback to course requirements if section has no room assigned
+                suitable_rooms = self._get_suitable_rooms(class_obj['course'])
+                time_key = (class_obj['meeting_time'].day, class_obj['meeting_time'].start_time) if class_obj['meeting_time'] else None
+                if time_key and time_key not in used_rooms:
+                    used_rooms[time_key] = set()
+                available_rooms = [r for r in suitable_rooms if time_key and r.id not in used_rooms[time_key] and self._room_free(r, class_obj['meeting_time'], duration)]
+                if available_rooms:
+                    class_obj['room'] = random.choice(available_rooms)
+                    used_rooms[time_key].add(class_obj['room'].id)
+                elif self.rooms:
+                    available_rooms = [r for r in list(self.rooms) if time_key and r.id not in used_rooms[time_key] and self._room_free(r, class_obj['meeting_time'], duration)]
+                    if available_rooms:
+                        class_obj['room'] = random.choice(available_rooms)
+                        used_rooms[time_key].add(class_obj['room'].id)
+                    else:
+                        class_obj['room'] = None
+                else:
+                    class_obj['room'] = None
 
-            population.append(individual)
-
-        return population
+        return individual
 
     def _get_suitable_rooms(self, course):
         """Get rooms suitable for the course"""
@@ -261,11 +606,54 @@ class GeneticAlgorithm:
             course_type = ''
 
         if course_type == 'Lab':
-            return list(self.rooms.filter(room_type='Lab'))
+            return [room for room in self.rooms if room.room_type == 'Lab']
         else:
-            return list(self.rooms.filter(capacity__gte=getattr(course, 'max_students', 0)))
-
-
+            min_capacity = getattr(course, 'max_students', 0)
+            return [room for room in self.rooms if room.capacity >= min_capacity]
+
+    def _pool_rooms(self, class_obj):
+        """Room-pool candidates: rooms seating the section, lab rooms for labs (any fitting room if none)."""
+        course_type = getattr(class_obj['course'], 'course_type', '')
+        students = getattr(class_obj['section'], 'num_students', 0) or 0
+        key = (course_type == 'Lab', students)
+        candidates = self._pool_candidates.get(key)
+        if candidates is None:
+            fitting = [room for room in self.rooms if room.capacity >= students]
+            typed = [room for room in fitting if (room.room_type == 'Lab') == (course_type == 'Lab')]
+            candidates = self._pool_candidates[key] = typed or fitting or list(self.rooms)
+        return candidates
+
+    def _choose_pool_room(self, class_obj, room_index):
+        """A random candidate room free for the class's whole time range, else any candidate."""
+        candidates = self._pool_rooms(class_obj)
+        if not candidates:
+            return None
+        free = [
+            room for room in candidates
+            if room_index.is_free(room, class_obj) and self._room_free(room, class_obj['meeting_time'], class_obj.get('duration', 1))
+        ]
+        return random.choice(free or candidates)
+
+    def room_utilisation(self, individual):
+        """
+        Share of available room-hours a timetable books: overall, and per room number.
+        Available hours are the grid's teaching slots on the scheduled weekdays.
+        """
+        booked = {}
+        for class_obj in individual:
+            if class_obj.get('room') and class_obj.get('meeting_time'):
+                booked[class_obj['room'].id] = booked.get(class_obj['room'].id, 0) + (class_obj.get('duration', 1) or 1)
+        capacity = WEEKLY_ROOM_HOURS * len(self.rooms)
+        return {
+            'room_mode': self.room_mode,
+            'rooms_used': len(booked),
+            'rooms_available': len(self.rooms),
+            'overall': round(100 * sum(booked.values()) / capacity, 1) if capacity else 0.0,
+            'per_room': {
+                room.room_number: round(100 * booked[room.id] / WEEKLY_ROOM_HOURS, 1)
+                for room in self.rooms if room.id in booked
+            },
+        }
 
     def calculate_fitness(self, individual):
         """Calculate fitness score for an individual timetable"""
@@ -274,6 +662,7 @@ class GeneticAlgorithm:
         soft_constraint_penalty = 0
         distribution_penalty = 0
         lunch_break_penalty = 0
+        availability_violations = 0
         total_classes = len(individual)
 
         if total_classes == 0:
@@ -288,6 +677,12 @@ class GeneticAlgorithm:
                 else:
                     unassigned_penalty += 40  # Increased penalty for theory classes
 
+            # Instructor blocked, or instructor/room taken by an active timetable, during the class
+            if not self._instructor_free(class_obj.get('instructor'), class_obj.get('meeting_time'), class_obj.get('duration', 1)):
+                availability_violations += 1
+            if not self._room_free(class_obj.get('room'), class_obj.get('meeting_time'), class_obj.get('duration', 1)):
+                availability_violations += 1
+
             # Soft constraint for labs in lab rooms
             if class_obj.get('course') and class_obj.get('room'):
                 if class_obj['course'].course_type == 'Lab' and class_obj['room'].room_type != 'Lab':
@@ -295,35 +690,34 @@ class GeneticAlgorithm:
 
             # Penalty for classes that span lunch break
             if self._spans_lunch_break(class_obj):
-                lunch_break_penalty += 100  # High penalty for spanning lunch break
+                lunch_break_penalty += LUNCH_BREAK_PENALTY  # High penalty for spanning lunch break
 
             # Penalty for any class scheduled right before lunch break (ending at 13:00) to avoid discontinuity
             if class_obj.get('meeting_time'):
                 start_time, end_time = self._get_class_time_range(class_obj)
-                if end_time == datetime.time(13, 0):
-                    lunch_break_penalty += 100  # Moderate penalty for any class ending right before lunch
+                if end_time == LUNCH_START:
+                    lunch_break_penalty += LUNCH_BREAK_PENALTY  # Moderate penalty for any class ending right before lunch
 
         # Check conflicts only between fully assigned classes
         fully_assigned_classes = [cls for cls in individual if all([cls.get('instructor'), cls.get('room'), cls.get('meeting_time')])]
         num_fully_assigned = len(fully_assigned_classes)
 
-        # Add distribution penalty (only for weekdays since Saturday is excluded)
+        # Add distribution penalty (only for the teaching days the GA schedules)
         scheduled_days = [c['meeting_time'].day for c in fully_assigned_classes if c.get('meeting_time')]
         if scheduled_days:
-            days_of_week = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
-            day_counts = [scheduled_days.count(day) for day in days_of_week]
+            day_counts = [scheduled_days.count(day) for day in TEACHING_DAYS]
 
             mean = sum(day_counts) / len(day_counts)
             variance = sum([(count - mean) ** 2 for count in day_counts]) / len(day_counts)
             std_dev = variance ** 0.5
-            distribution_penalty = std_dev * 10
+            distribution_penalty = std_dev * DISTRIBUTION_PENALTY_WEIGHT
 
         # Add penalty for not using post-lunch slots (13:45 and later)
-        post_lunch_times = [mt for mt in self.meeting_times if mt.start_time >= datetime.time(13, 45)]
+        post_lunch_times = [mt for mt in self.meeting_times if mt.start_time >= POST_LUNCH_START]
         post_lunch_scheduled = [c for c in fully_assigned_classes if c.get('meeting_time') and c['meeting_time'] in post_lunch_times]
         if post_lunch_times and len(post_lunch_scheduled) == 0:
             # Penalty if no post-lunch slots are used at all - increased to 50 points
-            post_lunch_penalty = 50
+            post_lunch_penalty = POST_LUNCH_PENALTY
         else:
             post_lunch_penalty = 0
 
@@ -356,8 +750,18 @@ class GeneticAlgorithm:
                 if self._has_conflict(class1, class2):
                     conflicts += 1
 
-        # Total penalties: conflicts (increased weight) + unassigned classes + post-lunch penalty + classes_per_week penalty + lunch break penalty
-        total_penalties = (conflicts * 1000) + (unassigned_penalty * 50) + (soft_constraint_penalty * 10) + distribution_penalty + post_lunch_penalty + classes_per_week_penalty + lunch_break_penalty
+        # Hours beyond each instructor's daily maximum
+        daily_hours = {}
+        for class_obj in fully_assigned_classes:
+            instructor = class_obj['instructor']
+            if instructor.max_hours_per_day:
+                key = (instructor, class_obj['meeting_time'].day)
+                daily_hours[key] = daily_hours.get(key, 0) + (class_obj.get('duration', 1) or 1)
+        for (instructor, _), hours in daily_hours.items():
+            availability_violations += max(0, hours - instructor.max_hours_per_day)
+
+        # Total penalties: conflicts (increased weight) + unassigned classes + post-lunch penalty + classes_per_week penalty + lunch break penalty + instructor availability
+        total_penalties = (conflicts * 1000) + (unassigned_penalty * 50) + (soft_constraint_penalty * 10) + distribution_penalty + post_lunch_penalty + classes_per_week_penalty + lunch_break_penalty + availability_violations * AVAILABILITY_PENALTY
 
         max_possible_penalties = (total_classes * (total_classes - 1) / 2) * 1000 + total_classes * 50 + total_classes * 10 + (total_classes * 5) + 50 + (total_classes * 100) + (total_classes * 100)
         if max_possible_penalties == 0:
@@ -427,11 +831,7 @@ class GeneticAlgorithm:
         if not start_time or not end_time:
             return False
 
-        lunch_start = datetime.time(13, 0)
-        lunch_end = datetime.time(13, 45)
-
-        # Class spans lunch if it starts before lunch ends and ends after lunch starts
-        return start_time < lunch_end and end_time > lunch_start
+        return spans_lunch_break(start_time, end_time)
 
     def selection(self, population, fitness_scores):
         """Tournament selection"""
@@ -447,41 +847,159 @@ class GeneticAlgorithm:
         return selected
 
     def crossover(self, parent1, parent2):
-        """Single point crossover"""
+        """Recombine two parents with the configured operator (see CROSSOVER_OPERATORS)."""
         if len(parent1) != len(parent2):
             return parent1, parent2
 
         if len(parent1) < 2:
             return parent1, parent2
 
-        crossover_point = random.randint(1, len(parent1) - 1)
-        child1 = parent1[:crossover_point] + parent2[crossover_point:]
-        child2 = parent2[:crossover_point] + parent1[crossover_point:]
-        return child1, child2
+        return CROSSOVER_OPERATORS[self.crossover_operator](self, parent1, parent2)
 
     def mutate(self, individual):
-        """Mutate an individual by changing random assignments for each class."""
-        for class_to_mutate in individual:
-            if random.random() < self.mutation_rate:
-                mutation_type = random.choice(['instructor', 'time'])  # Removed 'room' since rooms are now fixed per section
+        """Mutate an individual with the configured operator (see MUTATION_OPERATORS)."""
+        if self.mutation_operator == 'conflict_directed':
+            return self._mutate_conflict_directed(individual)
+        return self._mutate_random(individual)
+
+    def _mutate_random(self, individual, rate=None, skip=()):
+        """Mutate an individual by changing random assignments for each class (except those in skip)."""
+        rate = self.mutation_rate if rate is None else rate
+        # Rooms are fixed per section unless they are a gene (room-pool mode)
+        mutation_types = ['instructor', 'time', 'room'] if self.room_mode == 'pool' else ['instructor', 'time']
+        room_index = None
+        for index, class_to_mutate in enumerate(individual):
+            if index not in skip and random.random() < rate:
+                mutation_type = random.choice(mutation_types)
 
                 if mutation_type == 'instructor':
                     available_instructors = list(class_to_mutate['course'].instructors.all())
                     if available_instructors:
-                        class_to_mutate['instructor'] = random.choice(available_instructors)
+                        class_to_mutate['instructor'] = random.choice(self._available_instructors(available_instructors, class_to_mutate))
                     elif self.instructors:
-                        class_to_mutate['instructor'] = random.choice(list(self.instructors))
+                        class_to_mutate['instructor'] = random.choice(self._available_instructors(list(self.instructors), class_to_mutate))
                     # If no instructors available, leave as is (shouldn't happen in practice)
+                    continue
 
-                elif mutation_type == 'time':
+                if self.room_mode == 'pool':
+                    if room_index is None:
+                        room_index = RoomSlotIndex(individual)
+                    room_index.remove(class_to_mutate)
+
+                if mutation_type == 'time':
                     suitable_times = self._get_suitable_meeting_times(class_to_mutate['course'])
                     if suitable_times:
-                        class_to_mutate['meeting_time'] = random.choice(suitable_times)
+                        class_to_mutate['meeting_time'] = random.choice(self._available_times(suitable_times, class_to_mutate))
                     elif self.meeting_times:
                         class_to_mutate['meeting_time'] = random.choice(list(self.meeting_times))
                     # If no times available, leave as is (shouldn't happen in practice)
+
+                if room_index is not None:
+                    # Move to a free compatible room when the new time (or a room mutation) asks for it
+                    room = class_to_mutate.get('room')
+                    if mutation_type == 'room' or not room or not room_index.is_free(room, class_to_mutate) or \
+                            not self._room_free(room, class_to_mutate['meeting_time'], class_to_mutate.get('duration', 1)):
+                        class_to_mutate['room'] = self._choose_pool_room(class_to_mutate, room_index)
+                    room_index.add(class_to_mutate)
         return individual
 
+    def conflicting_genes(self, individual):
+        """
+        (hard, soft) sets of class indexes. Hard: unassigned, clashing on an instructor, room or
+        section, in blocked or externally booked time, or past an instructor's daily maximum.
+        Soft: otherwise clean classes with a lab outside a lab room or spanning lunch.
+        """
+        hard, soft = set(), set()
+        by_day, daily = {}, {}
+        for index, class_obj in enumerate(individual):
+            instructor, room, meeting_time = class_obj.get('instructor'), class_obj.get('room'), class_obj.get('meeting_time')
+            if not (instructor and room and meeting_time):
+                hard.add(index)
+                continue
+            duration = class_obj.get('duration', 1)
+            if not self._instructor_free(instructor, meeting_time, duration) or not self._room_free(room, meeting_time, duration):
+                hard.add(index)
+            if (class_obj['course'].course_type == 'Lab' and room.room_type != 'Lab') or self._spans_lunch_break(class_obj):
+                soft.add(index)
+            by_day.setdefault(meeting_time.day, []).append(index)
+            if instructor.max_hours_per_day:
+                daily.setdefault((instructor, meeting_time.day), []).append(index)
+
+        # Only classes on the same day can clash
+        for indexes in by_day.values():
+            for position, i in enumerate(indexes):
+                for j in indexes[position + 1:]:
+                    if self._has_conflict(individual[i], individual[j]):
+                        hard.update((i, j))
+        for (instructor, _), indexes in daily.items():
+            if sum(individual[i].get('duration', 1) or 1 for i in indexes) > instructor.max_hours_per_day:
+                hard.update(indexes)
+        return hard, soft - hard
+
+    def _mutate_conflict_directed(self, individual):
+        """
+        Reassign mostly the classes in clashes (or, once there are none, those carrying soft
+        penalties), drawing from slots where the class would clash with nothing. Clean classes
+        still mutate at a fraction of mutation_rate so the search keeps exploring.
+        """
+        hard, soft = self.conflicting_genes(individual)
+        targets = hard or soft
+        if targets:
+            occupancy = GeneOccupancy(self, individual)
+            for index in random.sample(sorted(targets), len(targets)):
+                if random.random() < CONFLICT_GENE_MUTATION_RATE:
+                    occupancy.remove(index)
+                    self._reassign_conflict_free(individual[index], occupancy)
+                    occupancy.add(index)
+        rate = self.mutation_rate * CLEAN_GENE_MUTATION_SHARE if hard else self.mutation_rate
+        return self._mutate_random(individual, rate=rate, skip=targets)
+
+    def _reassign_conflict_free(self, class_obj, occupancy):
+        """
+        Move a class (already lifted out of `occupancy`) to a random clash-free (time, instructor,
+        room), keeping its instructor and room where they fit. Falls back to a blind time redraw.
+        """
+        course, section = class_obj['course'], class_obj['section']
+        duration = class_obj.get('duration', 1) or 1
+        instructors = list(course.instructors.all()) or list(self.instructors)
+        if self.room_mode == 'pool':
+            rooms = list(self._pool_rooms(class_obj))
+        else:
+            rooms = [class_obj.get('room') or section.room]
+
+        candidates = []
+        for mt in self._get_suitable_meeting_times(course):
+            start, end = self._get_class_time_range({'meeting_time': mt, 'duration': duration})
+            if spans_lunch_break(start, end):
+                continue
+            bits = self._occupancy_mask(mt, duration)
+            if occupancy.mask('section', section) & bits:
+                continue
+            free_instructors = [
+                i for i in instructors
+                if self._instructor_free(i, mt, duration) and not occupancy.mask('instructor', i) & bits
+                and (not i.max_hours_per_day or occupancy.hours.get((i.id, mt.day), 0) + duration <= i.max_hours_per_day)
+            ]
+            free_rooms = [
+                r for r in rooms
+                if r is None or (self._room_free(r, mt, duration) and not occupancy.mask('room', r) & bits)
+            ]
+            if free_instructors and free_rooms:
+                candidates.append((mt, free_instructors, free_rooms))
+
+        if not candidates:
+            suitable_times = self._get_suitable_meeting_times(course)
+            if suitable_times:
+                class_obj['meeting_time'] = random.choice(self._available_times(suitable_times, class_obj))
+            return
+
+        mt, free_instructors, free_rooms = random.choice(candidates)
+        class_obj['meeting_time'] = mt
+        if class_obj.get('instructor') not in free_instructors:
+            class_obj['instructor'] = random.choice(free_instructors)
+        if class_obj.get('room') not in free_rooms:
+            class_obj['room'] = random.choice(free_rooms)
+
     def _repair_individual(self, individual):
         """Repair an individual by assigning suitable values to any None fields"""
         for class_obj in individual:
@@ -489,15 +1007,15 @@ class GeneticAlgorithm:
                 # Assign instructor from course instructors, fallback to any available
                 available_instructors = list(class_obj['course'].instructors.all())
                 if available_instructors:
-                    class_obj['instructor'] = random.choice(available_instructors)
+                    class_obj['instructor'] = random.choice(self._available_instructors(available_instructors, class_obj))
                 elif self.instructors:
-                    class_obj['instructor'] = random.choice(list(self.instructors))
+                    class_obj['instructor'] = random.choice(self._available_instructors(list(self.instructors), class_obj))
                 else:
                     logger.warning(f"Could not repair instructor for class {class_obj.get('id')}: No available instructors.")
 
             if not class_obj.get('room'):
                 # Assign room based on course requirements, fallback to any available
-                suitable_rooms = self._get_suitable_rooms(class_obj['course'])
+                suitable_rooms = self._pool_rooms(class_obj) if self.room_mode == 'pool' else self._get_suitable_rooms(class_obj['course'])
                 if suitable_rooms:
                     class_obj['room'] = random.choice(suitable_rooms)
                 elif self.rooms:
@@ -509,13 +1027,69 @@ class GeneticAlgorithm:
                 # Assign meeting time based on course duration
                 suitable_times = self._get_suitable_meeting_times(class_obj['course'])
                 if suitable_times:
-                    class_obj['meeting_time'] = random.choice(suitable_times)
+                    class_obj['meeting_time'] = random.choice(self._available_times(suitable_times, class_obj))
                 elif self.meeting_times:
                     class_obj['meeting_time'] = random.choice(list(self.meeting_times))
                 else:
                     logger.warning(f"Could not repair meeting_time for class {class_obj.get('id')}: No available meeting times.")
         return individual
 
+    @staticmethod
+    def _genome(individual):
+        return tuple(
+            tuple(class_obj[field].id if class_obj.get(field) else None for field in GENOME_FIELDS)
+            for class_obj in individual
+        )
+
+    def _individuals_from_genomes(self, genomes):
+        """Rebuild individuals from _genome tuples, loading each instructor, room and meeting time once"""
+        ids = [set() for _ in GENOME_FIELDS]
+        for genome in genomes:
+            for gene in genome:
+                for field_ids, object_id in zip(ids, gene):
+                    field_ids.add(object_id)
+        lookups = [
+            model.objects.in_bulk(field_ids - {None})
+            for model, field_ids in zip((Instructor, Room, MeetingTime), ids)
+        ]
+
+        individuals = []
+        for genome in genomes:
+            individual = copy.deepcopy(self.all_classes)
+            for class_obj, gene in zip(individual, genome):
+                for field, lookup, object_id in zip(GENOME_FIELDS, lookups, gene):
+                    class_obj[field] = lookup.get(object_id)
+            individuals.append(individual)
+        return individuals
+
+    def _checkpoint_state(self, generation, population, best_individual, params, **progress):
+        """Everything evolve() needs to carry on from the top of `generation`"""
+        return dict(
+            progress,
+            params=params,
+            classes=[class_obj['id'] for class_obj in self.all_classes],
+            generation=generation,
+            population=[self._genome(individual) for individual in population],
+            best=self._genome(best_individual) if best_individual else None,
+            run_stats=copy.deepcopy(self.run_stats),
+            random_state=random.getstate(),
+        )
+
+    def population_diversity(self, population):
+        """
+        (distinct, hamming): share of distinct timetables in the population, and the mean share
+        of classes assigned differently between DIVERSITY_SAMPLE_PAIRS random pairs.
+        """
+        genomes = [self._genome(individual) for individual in population]
+        if len(genomes) < 2 or not genomes[0]:
+            return 1.0, 1.0
+        distinct = len(set(genomes)) / len(genomes)
+        distances = []
+        for _ in range(DIVERSITY_SAMPLE_PAIRS):
+            first, second = random.sample(genomes, 2)
+            distances.append(sum(a != b for a, b in zip(first, second)) / len(first))
+        return round(distinct, 3), round(sum(distances) / len(distances), 3)
+
     def _meets_classes_per_week(self, individual):
         """Check if the individual meets classes_per_week requirements for all courses"""
         fully_assigned_classes = [cls for cls in individual if all([cls.get('instructor'), cls.get('room'), cls.get('meeting_time')])]
@@ -539,19 +1113,69 @@ class GeneticAlgorithm:
         return True
 
     def evolve(self):
-        """Main evolution algorithm"""
-        population = self.generate_initial_population()
-        best_fitness = 0
-        best_individual = None
-        generations_without_improvement = 0
-        max_generations_without_improvement = 200
-        fitness_progression = []  # Track fitness scores per generation
+        """
+        Main evolution algorithm.
 
-        generation_range = range(self.generations)
+        With a checkpoint_id, the state at the top of a generation is handed to a background
+        writer at most once per GA_CHECKPOINT_INTERVAL seconds. A GA from from_checkpoint()
+        carries on from the saved generation with the saved random state.
+        """
+        max_generations_without_improvement = 200
+        started = time.perf_counter()
+        params = self.checkpoint_params()
+        base_mutation_rate = self.mutation_rate
+        converged_below = max(DIVERSITY_THRESHOLD, CONVERGENCE_RATE_MULTIPLE * base_mutation_rate)
+        state, self.resume_state = self.resume_state, None
+        if state:
+            restored = self._individuals_from_genomes(state['population'] + ([state['best']] if state['best'] else []))
+            population = restored[:len(state['population'])]
+            best_individual = restored[-1] if state['best'] else None
+            best_fitness = state['best_fitness']
+            fitness_progression = list(state['fitness_progression'])
+            generations_without_improvement = state['generations_without_improvement']
+            cooldown_until = state['cooldown_until']
+            hypermutation_until = state['hypermutation_until']
+            futile_responses = state['futile_responses']
+            started -= state['seconds']
+            first_generation = state['generation']
+            self.run_stats = state['run_stats']
+            self.run_stats.setdefault('resumed_at', []).append(first_generation)
+            random.setstate(state['random_state'])
+            logger.info("GA resuming checkpoint %s at generation %d", self.checkpoint_id, first_generation)
+        else:
+            population = self.generate_initial_population()
+            best_fitness = 0
+            best_individual = None
+            generations_without_improvement = 0
+            fitness_progression = []  # Track fitness scores per generation
+            # Generation and seconds at which the best timetable first had no hard conflicts
+            self.run_stats = {
+                'mutation_operator': self.mutation_operator, 'crossover_operator': self.crossover_operator,
+                'feasible_generation': None, 'feasible_seconds': None,
+                'diversity': [],  # Sampled mean Hamming share per generation
+                'diversity_events': [],  # Restarts and hypermutation bursts triggered by low diversity
+                'diversity_threshold': round(converged_below, 3),
+            }
+            cooldown_until = 0
+            hypermutation_until = 0
+            futile_responses = 0  # Diversity responses since the best fitness last improved
+            first_generation = 0
+        checkpoint = CheckpointWriter(self.checkpoint_id) if self.checkpoint_id else None
+
+        generation_range = range(first_generation, self.generations)
         if self.progress_bar:
             generation_range = tqdm(generation_range, desc="Evolving Timetable")
 
         for generation in generation_range:
+            if checkpoint:
+                checkpoint.maybe_save(lambda: self._checkpoint_state(
+                    generation, population, best_individual, params,
+                    best_fitness=best_fitness, fitness_progression=list(fitness_progression),
+                    generations_without_improvement=generations_without_improvement,
+                    cooldown_until=cooldown_until, hypermutation_until=hypermutation_until,
+                    futile_responses=futile_responses, seconds=time.perf_counter() - started,
+                ))
+
             fitness_scores = [self.calculate_fitness(individual) for individual in population]
             current_best_fitness = max(fitness_scores)
             current_best_individual = population[fitness_scores.index(current_best_fitness)]
@@ -571,11 +1195,21 @@ class GeneticAlgorithm:
                 best_fitness = current_best_fitness
                 best_individual = copy.deepcopy(current_best_individual)
                 generations_without_improvement = 0
+                futile_responses = 0
             else:
                 generations_without_improvement += 1
             
             # Record the best fitness for this generation
             fitness_progression.append(round(best_fitness, 2))
+            self.run_stats['generations'] = generation + 1
+
+            # Hard conflicts are only checked until the first feasible best is recorded, and for the stop rule below
+            current_is_feasible = None
+            if self.run_stats['feasible_generation'] is None:
+                current_is_feasible = not self.conflicting_genes(current_best_individual)[0]
+                if current_is_feasible:
+                    self.run_stats['feasible_generation'] = generation
+                    self.run_stats['feasible_seconds'] = round(time.perf_counter() - started, 3)
 
             if self.progress_bar:
                 generation_range.set_postfix(best_fitness=f"{best_fitness:.2f}%", refresh=True)
@@ -584,10 +1218,39 @@ class GeneticAlgorithm:
                 logger.info("GA stopping early due to no improvement for %d generations", max_generations_without_improvement)
                 break
 
-            # Only stop early if ALL classes are fully assigned AND classes_per_week requirements are met
+            # Only stop early if ALL classes are fully assigned AND classes_per_week requirements are met.
+            # The conflict-directed operator also waits for a timetable without hard conflicts.
             if current_is_fully_assigned and self._meets_classes_per_week(current_best_individual):
-                logger.info("GA found fully assigned solution meeting classes_per_week (fitness=%.2f), stopping early", current_best_fitness)
-                break
+                if self.mutation_operator != 'conflict_directed':
+                    logger.info("GA found fully assigned solution meeting classes_per_week (fitness=%.2f), stopping early", current_best_fitness)
+                    break
+                if current_is_feasible is None:
+                    current_is_feasible = not self.conflicting_genes(current_best_individual)[0]
+                if current_is_feasible:
+                    logger.info("GA found conflict-free solution meeting classes_per_week (fitness=%.2f), stopping early", current_best_fitness)
+                    break
+
+            # A collapsed population only re-evaluates clones: restart part of it or mutate harder
+            distinct, diversity = self.population_diversity(population)
+            self.run_stats['diversity'].append(diversity)
+            restart = False
+            if diversity < converged_below and self.diversity_response != 'none' and generation >= cooldown_until:
+                if futile_responses >= MAX_FUTILE_RESPONSES:
+                    logger.info("GA stopping early: population converged again after %d diversity responses", futile_responses)
+                    self.run_stats['stopped_converged'] = generation
+                    break
+                self.run_stats['diversity_events'].append({
+                    'generation': generation, 'action': self.diversity_response,
+                    'diversity': diversity, 'distinct': distinct
+                })
+                futile_responses += 1
+                cooldown_until = generation + DIVERSITY_COOLDOWN
+                restart = self.diversity_response == 'restart'
+                if self.diversity_response == 'hypermutation':
+                    hypermutation_until = generation + HYPERMUTATION_GENERATIONS
+            self.mutation_rate = (
+                min(0.5, base_mutation_rate * HYPERMUTATION_FACTOR) if generation < hypermutation_until else base_mutation_rate
+            )
 
             selected_population = self.selection(population, fitness_scores)
             new_population = []
@@ -612,10 +1275,21 @@ class GeneticAlgorithm:
 
             population = new_population[:len(population)]
 
+            if restart:
+                # Keep the elite, reseed a share of the rest from scratch
+                fresh = int((len(population) - elite_size) * RESTART_SHARE)
+                population[elite_size:elite_size + fresh] = [self._random_individual() for _ in range(fresh)]
+
         # Repair the best individual to ensure all classes are fully assigned
         if best_individual:
             best_individual = self._repair_individual(best_individual)
 
+        self.mutation_rate = base_mutation_rate
+        if checkpoint:
+            # A write still in flight must land before the caller can discard the checkpoint
+            checkpoint.wait()
+            self.run_stats['checkpoints'] = checkpoint.stats()
+        self.run_stats['seconds'] = round(time.perf_counter() - started, 3)
         logger.info("GA Finished: Best fitness=%.2f", best_fitness if best_fitness is not None else -1)
         if best_individual:
             logger.info("GA Best Individual: %d classes", len(best_individual))
@@ -0,0 +1,67 @@
+import hashlib
+import logging
+
+from django.db.models import Count, Max
+
+from .caching import cached_reference
+from .models import Class, Timetable
+from .slot_template import get_slot_template
+
+logger = logging.getLogger(__name__)
+
+
+def _active_stamp(active):
+    """Changes whenever an active timetable is added, removed, deactivated or edited (edits bump updated_at)."""
+    stamp = active.aggregate(count=Count('id'), changed=Max('updated_at'))
+    return f"{stamp['count']}:{stamp['changed'].timestamp() if stamp['changed'] else 0:.6f}"
+
+
+def same_parity_semesters(semesters):
+    """
+    Every semester sharing a parity with `semesters`. Odd and even semesters run in different
+    terms, so activate() only replaces timetables of the same parity and both stay active.
+    """
+    parities = {int(semester) % 2 for semester in semesters}
+    return [semester for semester in range(1, 9) if semester % 2 in parities]
+
+
+def build_busy_masks(rows):
+    """{'instructor': {id: mask}, 'room': {id: mask}} of quarter-hour bits (SlotTemplate.occupancy_mask)."""
+    template = get_slot_template()
+    masks = {'instructor': {}, 'room': {}}
+    for row in rows:
+        bits = template.occupancy_mask(row['meeting_time__day'], row['meeting_time__start_time'], row['course__duration'])
+        for kind in masks:
+            resource = row[f'{kind}_id']
+            masks[kind][resource] = masks[kind].get(resource, 0) | bits
+    return masks
+
+
+def active_busy_masks(exclude_section_ids=(), semesters=None):
+    """
+    Instructors and rooms already booked by every active timetable, as weekly busy masks.
+
+    Only timetables of the same semester parity as `semesters` count (all of them when
+    None): an odd-semester timetable does not block an even-semester run. Classes of
+    `exclude_section_ids` are left out: a run regenerating those sections replaces their
+    timetable rather than working around it. Built with one query and cached until the
+    set of active timetables (or one of them) changes.
+    """
+    exclude_section_ids = sorted(exclude_section_ids)
+    active = Timetable.objects.filter(is_active=True)
+    if semesters is not None:
+        semesters = same_parity_semesters(semesters)
+        active = active.filter(semester__in=semesters)
+    key = f"{_active_stamp(active)}:{semesters}:{hashlib.sha1(str(exclude_section_ids).encode()).hexdigest()}"
+
+    def build():
+        rows = list(
+            Class.objects.filter(timetables__in=active).exclude(section_id__in=exclude_section_ids)
+            .order_by().distinct().values(
+                'instructor_id', 'room_id', 'meeting_time__day', 'meeting_time__start_time', 'course__duration'
+            )
+        )
+        logger.info("Global occupancy: %d classes from active timetables", len(rows))
+        return build_busy_masks(rows)
+
+    return cached_reference('active-occupancy', (), key, build)
@@ -1,6 +1,6 @@
 from django.core.management.base import BaseCommand
-from scheduler_app.models import Department, Course, Section
-import json
+from scheduler_app.importers import CurriculumImporter, program_rows
+from scheduler_app.models import Department, Section
 
 class Command(BaseCommand):
     help = 'Add curriculum data to the database'
@@ -257,82 +257,18 @@ class Command(BaseCommand):
             }
         ]
 
-        # Create departments
-        departments = {}
-        for program_data in curriculum_data:
-            program = program_data['program']
-            code = program.replace(' ', '').upper()[:3]  # e.g., DAT for Data Science, COM for Computer Science Engineering, INF for Information Technology
-            if program == "Data Science":
-                code = "DS"
-            elif program == "Computer Science Engineering":
-                code = "CSE"
-            elif program == "Information Technology":
-                code = "IT"
-            dept, created = Department.objects.get_or_create(
-                code=code,
-                defaults={'name': program}
-            )
-            departments[program] = dept
-            if created:
-                self.stdout.write(self.style.SUCCESS(f"Created department: {dept}"))
-            else:
-                self.stdout.write(f"Department {dept} already exists.")
-
-        # Create courses
-        added_courses = 0
-        for program_data in curriculum_data:
-            program = program_data['program']
-            dept = departments[program]
-            for course_data in program_data['curriculum']:
-                semester = course_data['semester']
-                year = (semester + 1) // 2
-                sem = semester % 2
-                if sem == 0:
-                    sem = 2
-                duration = 1 if course_data['type'] == 'Theory' else 2
-                # Set max_students based on department
-                if dept.code == 'DS':
-                    max_students = 60
-                elif dept.code == 'IT':
-                    max_students = 60
-                elif dept.code == 'CSE':
-                    max_students = 120
-                else:
-                    max_students = 120  # default
-
-                course, created = Course.objects.get_or_create(
-                    course_id=course_data['course_code'],
-                    department=dept,
-                    defaults={
-                        'course_name': course_data['course_name'],
-                        'course_type': course_data['type'],
-                        'credits': course_data['credits'],
-                        'max_students': max_students,
-                        'duration': duration,
-                        'year': year,
-                        'semester': course_data['semester'],
-                        'classes_per_week': course_data['credits']
-                    }
-                )
-                if created:
-                    self.stdout.write(self.style.SUCCESS(f"Added course: {course}"))
-                    added_courses += 1
-                else:
-                    # Update max_students and semester for existing courses
-                    updated = False
-                    if course.max_students != max_students:
-                        course.max_students = max_students
-                        updated = True
-                    if course.semester != course_data['semester']:
-                        course.semester = course_data['semester']
-                        updated = True
-                    if updated:
-                        course.save()
-                        self.stdout.write(f"Updated course: {course}")
-                    else:
-                        self.stdout.write(f"Course {course} already exists.")
-
-        self.stdout.write(self.style.SUCCESS(f"Total courses added: {added_courses}"))
+        # Create departments and courses in bulk; re-running only updates what changed
+        report = CurriculumImporter().run(program_rows(
+            curriculum_data,
+            department_codes={"Data Science": "DS", "Computer Science Engineering": "CSE", "Information Technology": "IT"},
+            max_students={"DS": 60, "IT": 60, "CSE": 120}
+        ))
+        self.stdout.write(self.style.SUCCESS(
+            f"Departments added: {report['departments']['created']}, courses added: {report['courses']['created']}, "
+            f"updated: {report['courses']['updated']}, unchanged: {report['courses']['unchanged']}"
+        ))
+        for error in report['errors']:
+            self.stdout.write(f"Skipped entry {error['row']}: {error['error']}")
 
         # Create sections
         added_sections = 0
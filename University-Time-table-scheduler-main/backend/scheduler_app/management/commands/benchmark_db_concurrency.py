@@ -0,0 +1,122 @@
+import statistics
+import threading
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from scheduler_app.models import Class, Timetable
+from scheduler_app.views import TimetableViewSet
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure view_schedule latency from parallel readers while a generated timetable is being '
+        'persisted. Timetables written by the benchmark are deleted again when it finishes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--timetable', type=int, help='Timetable to read and copy (default: most recent)')
+        parser.add_argument('--readers', type=int, default=8, help='Concurrent reader threads (default: 8)')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds to run (default: 10)')
+        parser.add_argument('--hold', type=float, default=1.0, help='Seconds each write transaction stays open (default: 1)')
+
+    def handle(self, *args, **options):
+        timetable = (
+            Timetable.objects.filter(pk=options['timetable']).first() if options['timetable']
+            else Timetable.objects.order_by('-created_at').first()
+        )
+        if timetable is None or not timetable.classes.exists():
+            raise CommandError('No timetable with classes to benchmark against; generate one first.')
+
+        with connection.cursor() as cursor:
+            journal_mode = cursor.execute('PRAGMA journal_mode').fetchone()[0]
+        self.stdout.write(
+            f"Timetable {timetable.pk} ({timetable.classes.count()} classes), journal_mode={journal_mode}, "
+            f"transaction_mode={getattr(connection, 'transaction_mode', None) or 'DEFERRED'}, "
+            f"{options['readers']} readers for {options['duration']:.0f}s"
+        )
+
+        deadline = time.monotonic() + options['duration']
+        view = TimetableViewSet.as_view({'get': 'view_schedule'})
+        factory = APIRequestFactory()
+        user = User(username='benchmark')
+        lock = threading.Lock()
+        latencies, errors, writes, copies = [], [], [], []
+
+        def read():
+            try:
+                while time.monotonic() < deadline:
+                    request = factory.get(f'/api/timetables/{timetable.pk}/view_schedule/')
+                    force_authenticate(request, user=user)
+                    started = time.perf_counter()
+                    try:
+                        view(request, pk=timetable.pk).render()
+                    except OperationalError as exc:
+                        with lock:
+                            errors.append(str(exc))
+                        continue
+                    with lock:
+                        latencies.append(time.perf_counter() - started)
+            finally:
+                connection.close()
+
+        def write():
+            # Same shape as generate(): one transaction creating the timetable and all of its classes
+            source = list(timetable.classes.all())
+            try:
+                while time.monotonic() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        with transaction.atomic():
+                            copy = Timetable.objects.create(
+                                name=f"Benchmark {uuid.uuid4().hex[:8]}", department_id=timetable.department_id,
+                                year=timetable.year, semester=timetable.semester
+                            )
+                            for class_obj in source:
+                                created = Class.objects.create(
+                                    class_id=f"{class_obj.class_id}_{uuid.uuid4().hex[:4]}",
+                                    course_id=class_obj.course_id, instructor_id=class_obj.instructor_id,
+                                    meeting_time_id=class_obj.meeting_time_id, room_id=class_obj.room_id,
+                                    section_id=class_obj.section_id
+                                )
+                                copy.classes.add(created)
+                            time.sleep(options['hold'])
+                        with lock:
+                            copies.append(copy.pk)
+                    except OperationalError as exc:
+                        with lock:
+                            errors.append(str(exc))
+                        continue
+                    writes.append(time.perf_counter() - started)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=write)] + [threading.Thread(target=read) for _ in range(options['readers'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with transaction.atomic():
+            Class.objects.filter(timetables__in=copies).delete()
+            Timetable.objects.filter(pk__in=copies).delete()
+
+        if latencies:
+            self.stdout.write(
+                f"  reads   {len(latencies):6d}  p50 {statistics.median(latencies) * 1000:8.2f} ms  "
+                f"p95 {_percentile(latencies, 0.95) * 1000:8.2f} ms  max {max(latencies) * 1000:8.2f} ms"
+            )
+        self.stdout.write(f"  writes  {len(writes):6d}  mean {statistics.mean(writes) * 1000 if writes else 0:8.2f} ms")
+        if errors:
+            self.stdout.write(self.style.WARNING(f"  {len(errors)} operations failed, e.g. {errors[0]}"))
+        else:
+            self.stdout.write(self.style.SUCCESS('  No lock errors'))
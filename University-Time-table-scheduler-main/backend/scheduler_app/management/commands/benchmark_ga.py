@@ -0,0 +1,65 @@
+import itertools
+import random
+import statistics
+
+from django.core.management.base import BaseCommand, CommandError
+
+from scheduler_app.genetic_algorithm import CROSSOVER_OPERATORS, DIVERSITY_RESPONSES, MUTATION_OPERATORS, GeneticAlgorithm
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare GA mutation and crossover operators on the same data: time and generations until the best '
+        'timetable has no hard conflicts, and final fitness. Runs are seeded, so every operator '
+        'starts from the same random streams.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--department_ids', nargs='+', type=int, default=[1], help='Departments to schedule (default: [1])')
+        parser.add_argument('--years', nargs='+', type=int, default=[1], help='Years to schedule (default: [1])')
+        parser.add_argument('--semester', type=int, default=1, help='Semester to schedule (default: 1)')
+        parser.add_argument('--operators', nargs='+', choices=MUTATION_OPERATORS, default=list(MUTATION_OPERATORS),
+                            help='Mutation operators to compare (default: all)')
+        parser.add_argument('--crossovers', nargs='+', choices=list(CROSSOVER_OPERATORS), default=['single_point'],
+                            help='Crossover operators to compare (default: single_point)')
+        parser.add_argument('--runs', type=int, default=3, help='Seeded runs per operator (default: 3)')
+        parser.add_argument('--generations', type=int, default=200, help='Generations per run (default: 200)')
+        parser.add_argument('--population', type=int, default=30, help='Population size (default: 30)')
+        parser.add_argument('--diversity-response', choices=DIVERSITY_RESPONSES, default='none',
+                            help='Reaction to a collapsed population (default: none)')
+        parser.add_argument('--room-mode', choices=['section', 'pool'], default='section', help='Room mode (default: section)')
+        parser.add_argument('--seed', type=int, default=0, help='Base random seed (default: 0)')
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{options['runs']} runs x {options['generations']} generations, population {options['population']}, "
+            f"room_mode={options['room_mode']}, diversity_response={options['diversity_response']}"
+        )
+        for crossover, operator in itertools.product(options['crossovers'], options['operators']):
+            runs = []
+            for run in range(options['runs']):
+                random.seed(options['seed'] + run)
+                ga = GeneticAlgorithm(
+                    department_ids=options['department_ids'], years=options['years'], semesters=[options['semester']],
+                    population_size=options['population'], generations=options['generations'], progress_bar=False,
+                    room_mode=options['room_mode'], mutation_operator=operator, crossover_operator=crossover,
+                    diversity_response=options['diversity_response']
+                )
+                if not ga.all_classes:
+                    raise CommandError('No classes to schedule for these departments, years and semester.')
+                _, fitness, _ = ga.evolve()
+                runs.append(dict(ga.run_stats, fitness=fitness))
+
+            feasible = [run for run in runs if run['feasible_generation'] is not None]
+            line = (
+                f"  {crossover:<13} {operator:<18} feasible {len(feasible)}/{len(runs)}  "
+                f"fitness {statistics.mean(run['fitness'] for run in runs):6.2f}  "
+                f"run {statistics.mean(run['seconds'] for run in runs):7.2f} s  "
+                f"diversity events {statistics.mean(len(run['diversity_events']) for run in runs):4.1f}"
+            )
+            if feasible:
+                line += (
+                    f"  time-to-feasible median {statistics.median(run['feasible_seconds'] for run in feasible):7.2f} s"
+                    f" / {statistics.median(run['feasible_generation'] for run in feasible):.0f} generations"
+                )
+            self.stdout.write(line)
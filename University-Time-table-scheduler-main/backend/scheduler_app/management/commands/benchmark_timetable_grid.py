@@ -0,0 +1,163 @@
+import datetime
+import random
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from scheduler_app.models import Instructor, Room, MeetingTime, Course, Section, Class
+from scheduler_app.timetable_grid import (
+    EXPORT_DAYS, STANDARD_TIME_SLOTS, abbreviate_course_name, build_timetable_grid, render_cell
+)
+
+
+def _synthetic_classes(num_sections, classes_per_section, seed=42):
+    """Build an in-memory timetable (no database access) shaped like a generated one."""
+    rng = random.Random(seed)
+    instructors = [Instructor(id=i, instructor_id=f"I{i}", name=f"Instructor {i}", email=f"i{i}@example.com") for i in range(1, 61)]
+    rooms = [Room(id=i, room_number=f"R{i:03d}", capacity=60) for i in range(1, num_sections + 1)]
+    courses = [
+        Course(id=i, course_id=f"C{i:03d}", course_name=f"Course Number {i}",
+               course_type='Lab' if i % 4 == 0 else 'Theory', duration=2 if i % 4 == 0 else 1)
+        for i in range(1, 41)
+    ]
+    starts = [datetime.time(9, 0), datetime.time(10, 0), datetime.time(11, 0), datetime.time(12, 0),
+              datetime.time(13, 45), datetime.time(14, 45), datetime.time(15, 45)]
+    meeting_times = [
+        MeetingTime(id=len(EXPORT_DAYS) * i + d, pid=f"MT-{day[:3]}-{start:%H%M}", day=day, start_time=start,
+                    end_time=datetime.time(start.hour + 1, start.minute))
+        for i, start in enumerate(starts) for d, day in enumerate(EXPORT_DAYS)
+    ]
+    lab_meeting_times = [mt for mt in meeting_times if mt.start_time in (datetime.time(9, 0), datetime.time(10, 0), datetime.time(13, 45))]
+
+    classes = []
+    for s in range(1, num_sections + 1):
+        section = Section(id=s, section_id=f"SEC-{s:02d}", year=1, semester=1)
+        for n in range(classes_per_section):
+            course = rng.choice(courses)
+            classes.append(Class(
+                class_id=f"{section.section_id}_{course.course_id}_{n}",
+                course=course,
+                instructor=rng.choice(instructors),
+                room=rooms[s - 1],
+                section=section,
+                meeting_time=rng.choice(lab_meeting_times if course.duration > 1 else meeting_times),
+            ))
+    return classes
+
+
+def _legacy_render(classes):
+    """Previous export rendering: per-section expansion plus an O(slots^2) colspan rescan per cell."""
+    sections = {}
+    section_rooms = {}
+    for cls in classes:
+        section_id = cls.section.section_id
+        if section_id not in sections:
+            sections[section_id] = []
+            section_rooms[section_id] = set()
+        sections[section_id].append(cls)
+        section_rooms[section_id].add(cls.room.room_number)
+
+    legend_map = {}
+    for cls in classes:
+        key = abbreviate_course_name(cls.course.course_name)
+        if key not in legend_map:
+            legend_map[key] = {'course_short': key, 'course': cls.course.course_name, 'instructors': set()}
+        legend_map[key]['instructors'].add(cls.instructor.name)
+
+    rendered = []
+    for section_id, section_classes in sections.items():
+        schedule = {day: {} for day in EXPORT_DAYS}
+        for cls in section_classes:
+            day = cls.meeting_time.day
+            if day not in EXPORT_DAYS:
+                continue
+            duration_hours = getattr(cls.course, 'duration', 1)
+            start_time = cls.meeting_time.start_time
+            for i in range(duration_hours):
+                slot_start = datetime.time(hour=(start_time.hour + i) % 24, minute=start_time.minute)
+                slot_end = datetime.time(hour=(slot_start.hour + 1) % 24, minute=slot_start.minute)
+                time_slot = f"{slot_start}-{slot_end}"
+                is_start = (i == 0)
+                schedule.setdefault(day, {})
+                schedule[day].setdefault(time_slot, [])
+                schedule[day][time_slot].append({
+                    'course': cls.course.course_name,
+                    'course_id': cls.course.course_id,
+                    'instructor': cls.instructor.name,
+                    'room': cls.room.room_number,
+                    'section': cls.section.section_id,
+                    'course_type': cls.course.course_type,
+                    'duration': duration_hours,
+                    'is_start': is_start,
+                    'colspan': duration_hours if is_start else 1
+                })
+
+        for day in EXPORT_DAYS:
+            for slot_index, time_slot in enumerate(STANDARD_TIME_SLOTS):
+                if time_slot == '13:00:00-13:45:00':
+                    rendered.append("LUNCH BREAK")
+                    continue
+                day_classes = schedule[day].get(time_slot, [])
+                skip_slot = False
+                for prev_index in range(slot_index):
+                    prev_slot = STANDARD_TIME_SLOTS[prev_index]
+                    prev_classes = schedule[day].get(prev_slot, [])
+                    for prev_cls in prev_classes:
+                        if prev_cls['is_start'] and prev_cls['colspan'] > 1:
+                            start_index = STANDARD_TIME_SLOTS.index(prev_slot)
+                            end_index = start_index + prev_cls['colspan'] - 1
+                            if slot_index <= end_index:
+                                skip_slot = True
+                                break
+                    if skip_slot:
+                        break
+                if skip_slot:
+                    rendered.append("")
+                    continue
+
+                multi_hour_class = next((cls for cls in day_classes if cls['is_start'] and cls['colspan'] > 1), None)
+                cell_content_lines = []
+                for cls in day_classes:
+                    cell_content_lines.append(abbreviate_course_name(cls['course']))
+                    cell_content_lines.append(cls['instructor'])
+                    if multi_hour_class and cls['is_start']:
+                        end_slot = STANDARD_TIME_SLOTS[slot_index + cls['colspan'] - 1]
+                        cell_content_lines.append(f"({time_slot.split('-')[0][:5]} - {end_slot.split('-')[1][:5]})")
+                    cell_content_lines.append("")
+                rendered.append("\n".join(cell_content_lines).strip())
+    return rendered
+
+
+def _grid_render(classes):
+    grid = build_timetable_grid(classes, days=EXPORT_DAYS)
+    return [
+        render_cell(section, day, slot_index)
+        for section in grid.sections.values()
+        for day in EXPORT_DAYS
+        for slot_index in range(len(STANDARD_TIME_SLOTS))
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Micro-benchmark the shared timetable grid builder against the previous per-export rendering.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sections', type=int, default=40, help='Number of sections (default: 40)')
+        parser.add_argument('--classes-per-section', type=int, default=30, help='Classes per section (default: 30)')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed repetitions per implementation (default: 20)')
+
+    def handle(self, *args, **options):
+        classes = _synthetic_classes(options['sections'], options['classes_per_section'])
+        repeat = options['repeat']
+        self.stdout.write(f"Rendering {options['sections']} sections / {len(classes)} classes, {repeat} runs each")
+
+        if _legacy_render(classes) != _grid_render(classes):
+            self.stderr.write(self.style.WARNING("Grid rendering differs from the legacy rendering"))
+
+        results = {}
+        for label, render in (('legacy', _legacy_render), ('grid', _grid_render)):
+            best = min(timeit.repeat(lambda: render(classes), number=1, repeat=repeat))
+            results[label] = best
+            self.stdout.write(f"  {label:<8} best {best * 1000:8.2f} ms")
+
+        self.stdout.write(self.style.SUCCESS(f"Speed-up: {results['legacy'] / results['grid']:.2f}x"))
@@ -3,7 +3,7 @@ import logging
 import datetime
 from django.core.management.base import BaseCommand
 from scheduler_app.models import Department
-from scheduler_app.genetic_algorithm import GeneticAlgorithm
+from scheduler_app.genetic_algorithm import CROSSOVER_OPERATORS, GeneticAlgorithm
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +31,45 @@ class Command(BaseCommand):
             default=1,
             help='Semester to schedule (default: 1)'
         )
+        parser.add_argument(
+            '--room-mode',
+            choices=['section', 'pool'],
+            default='section',
+            help='One room per section, or a room chosen per class from the pool (default: section)'
+        )
+        parser.add_argument(
+            '--mutation-operator',
+            choices=['random', 'conflict_directed'],
+            default='random',
+            help='Mutation operator (default: random)'
+        )
+        parser.add_argument(
+            '--crossover-operator',
+            choices=list(CROSSOVER_OPERATORS),
+            default='single_point',
+            help='Crossover operator (default: single_point)'
+        )
+        parser.add_argument(
+            '--diversity-response',
+            choices=['restart', 'hypermutation', 'none'],
+            default='none',
+            help='Reaction to a collapsed population (default: none)'
+        )
+        parser.add_argument(
+            '--ignore-active',
+            action='store_true',
+            help='Ignore instructors and rooms already booked by active timetables'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            metavar='CHECKPOINT_ID',
+            help='Checkpoint the run under this id (every GA_CHECKPOINT_INTERVAL seconds)'
+        )
+        parser.add_argument(
+            '--resume',
+            metavar='CHECKPOINT_ID',
+            help='Continue a checkpointed run with its saved parameters instead of starting a new one'
+        )
         parser.add_argument(
             '--no-progress-bar',
             action='store_true',
@@ -46,25 +85,59 @@ class Command(BaseCommand):
         semester = options['semester']
         progress_bar = not options['no_progress_bar']
 
-        self.stdout.write(f"Parameters: department_ids={department_ids}, years={years}, semester={semester}")
+        if not options['resume']:
+            self.stdout.write(f"Parameters: department_ids={department_ids}, years={years}, semester={semester}, room_mode={options['room_mode']}")
 
         # --- Run the Genetic Algorithm ---
         try:
-            ga = GeneticAlgorithm(
-                department_ids=department_ids,
-                years=years,
-                semesters=[semester],
-                population_size=50,
-                generations=100,  # Keep it short for debugging
-                progress_bar=progress_bar
-            )
+            if options['resume']:
+                ga = GeneticAlgorithm.from_checkpoint(options['resume'], progress_bar=progress_bar)
+                self.stdout.write(
+                    f"Resuming checkpoint {options['resume']} at generation {ga.resume_state['generation']} "
+                    f"of {ga.generations} (department_ids={ga.department_ids}, years={ga.years}, semesters={ga.semesters})"
+                )
+            else:
+                ga = GeneticAlgorithm(
+                    department_ids=department_ids,
+                    years=years,
+                    semesters=[semester],
+                    population_size=50,
+                    generations=100,  # Keep it short for debugging
+                    progress_bar=progress_bar,
+                    room_mode=options['room_mode'],
+                    respect_active=not options['ignore_active'],
+                    mutation_operator=options['mutation_operator'],
+                    crossover_operator=options['crossover_operator'],
+                    diversity_response=options['diversity_response'],
+                    checkpoint_id=options['checkpoint']
+                )
 
             self.stdout.write(f"GA initialized. Number of classes to schedule: {len(ga.all_classes)}")
+            self.stdout.write(
+                f"Busy from active timetables: {len(ga.external_busy['instructor'])} instructors, "
+                f"{len(ga.external_busy['room'])} rooms"
+            )
 
             best_solution, fitness, fitness_progression = ga.evolve()
 
             self.stdout.write(self.style.SUCCESS("GA execution finished."))
             self.stdout.write(f"Best solution fitness: {fitness}")
+            self.stdout.write(
+                f"Feasible after {ga.run_stats['feasible_generation']} generations "
+                f"({ga.run_stats['feasible_seconds']}s)" if ga.run_stats['feasible_generation'] is not None
+                else "No conflict-free timetable found"
+            )
+            if 'checkpoints' in ga.run_stats:
+                checkpoints = ga.run_stats['checkpoints']
+                self.stdout.write(
+                    f"Checkpoint {checkpoints['checkpoint_id']}: {checkpoints['writes']} writes, "
+                    f"{checkpoints['snapshot_seconds']}s on the main loop, {checkpoints['write_seconds']}s writing"
+                )
+            for event in ga.run_stats['diversity_events']:
+                self.stdout.write(
+                    f"Generation {event['generation']}: diversity {event['diversity']} "
+                    f"({event['distinct']:.0%} distinct), {event['action']}"
+                )
 
             if best_solution:
                 self.stdout.write(f"Number of classes in solution: {len(best_solution)}")
@@ -94,6 +167,12 @@ class Command(BaseCommand):
 
                 self.stdout.write(f"\nPost-lunch slots used: {post_lunch_count} out of {len(best_solution)} total classes")
 
+                utilisation = ga.room_utilisation(best_solution)
+                self.stdout.write(
+                    f"Room utilisation: {utilisation['overall']}% of room-hours, "
+                    f"{utilisation['rooms_used']}/{utilisation['rooms_available']} rooms used"
+                )
+
                 # Check classes per week requirement
                 self.stdout.write("\nClasses per course:")
                 course_counts = {}
@@ -0,0 +1,43 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from scheduler_app.importers import IMPORT_BATCH_SIZE, ImportFormatError, import_curriculum_file
+
+
+class Command(BaseCommand):
+    help = (
+        'Import courses from a curriculum CSV, JSON, JSON Lines or XLSX file. '
+        'Rows need department_code, course_code, course_name, semester and optionally type, credits, '
+        'max_students, duration, year, classes_per_week, department_name and sections (";"-separated).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Curriculum file (.csv, .json, .jsonl, .xlsx)')
+        parser.add_argument('--format', choices=['csv', 'json', 'jsonl', 'xlsx'], help='Override the format detected from the extension')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help=f'Rows per write batch (default: {IMPORT_BATCH_SIZE})')
+        parser.add_argument('--dry-run', action='store_true', help='Validate and count changes without writing')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            with open(options['path'], 'rb') as stream:
+                report = import_curriculum_file(
+                    stream, filename=options['path'], fmt=options['format'],
+                    batch_size=options['batch_size'], dry_run=options['dry_run']
+                )
+        except (OSError, ImportFormatError) as exc:
+            raise CommandError(str(exc))
+
+        for error in report['errors'][:20]:
+            self.stderr.write(f"Row {error['row']}: {error['error']}")
+        if len(report['errors']) > 20:
+            self.stderr.write(f"... and {len(report['errors']) - 20} more errors")
+
+        summary = {key: value for key, value in report.items() if key != 'errors'}
+        self.stdout.write(json.dumps(summary))
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Checked' if options['dry_run'] else 'Imported'} {report['rows']} rows in "
+            f"{time.perf_counter() - started:.2f}s with {len(report['errors'])} errors"
+        ))
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler_app', '0015_timetable_fitness_progression'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='class',
+            index=models.Index(fields=['meeting_time', 'instructor'], name='class_time_instructor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='class',
+            index=models.Index(fields=['section', 'meeting_time'], name='class_section_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['department', 'year', 'semester'], name='course_dept_year_sem_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='meetingtime',
+            index=models.Index(fields=['day', 'start_time'], name='meetingtime_day_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='section',
+            index=models.Index(fields=['department', 'year', 'semester'], name='section_dept_year_sem_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timetable',
+            index=models.Index(fields=['department', 'year', 'semester', 'is_active'], name='timetable_dept_year_sem_idx'),
+        ),
+    ]
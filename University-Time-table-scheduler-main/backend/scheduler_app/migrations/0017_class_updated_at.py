@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler_app', '0016_scheduling_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='class',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler_app', '0017_class_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='instructor',
+            name='max_hours_per_day',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='instructor',
+            name='unavailable_slots',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
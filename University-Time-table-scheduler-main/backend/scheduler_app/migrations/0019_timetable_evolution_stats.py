@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler_app', '0018_instructor_availability'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timetable',
+            name='evolution_stats',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -10,6 +10,9 @@ class Instructor(models.Model):
     name = models.CharField(max_length=100)
     email = models.EmailField(unique=True)
     is_available = models.BooleanField(default=True)
+    # Weekly bitmask of blocked clock hours, laid out by the slot template (0 = always available)
+    unavailable_slots = models.BigIntegerField(default=0)
+    max_hours_per_day = models.PositiveSmallIntegerField(null=True, blank=True)
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -19,6 +22,10 @@ class Instructor(models.Model):
     def __str__(self):
         return f"{self.instructor_id} - {self.name}"
 
+    def is_blocked(self, day, start_time, duration=1):
+        from .slot_template import get_slot_template
+        return bool(self.unavailable_slots & get_slot_template().availability_mask(day, start_time, duration))
+
 # -------------------------
 # Room
 # -------------------------
@@ -68,6 +75,9 @@ class MeetingTime(models.Model):
 
     class Meta:
         ordering = ['pid']
+        indexes = [
+            models.Index(fields=['day', 'start_time'], name='meetingtime_day_start_idx'),
+        ]
 
     def __str__(self):
         return f"{self.day} {self.start_time}-{self.end_time}"
@@ -75,63 +85,25 @@ class MeetingTime(models.Model):
     @classmethod
     def generate_default_slots(cls, overwrite=False):
         """
-        Create default meeting time slots for Mon–Sat.
-        - Standard class slots (1 hour) from 09:00 to 19:00 with lunch break.
-        - Lunch slot is 13:00 - 13:45 (45 minutes) and marked is_lunch_break=True.
-        - Post-lunch slots: 13:45-14:45, 14:45-15:45, etc.
-        - If a slot with same day + start_time + end_time exists, it will not duplicate.
+        Create the meeting time slots defined by the slot template (see slot_template.py):
+        hourly slots, the weekday lunch break (is_lunch_break=True) and the post-lunch slots.
+        - Existing slots are read in one query; only missing day + start_time + end_time slots are inserted.
         - If overwrite=True, existing slots with exact times will be skipped but can be removed first externally.
         """
-        import datetime
-        created = 0
-
-        DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-
-        # standard hourly slots: 09:00-10:00, 10:00-11:00, ..., 18:00-19:00
-        hourly_starts = [datetime.time(hour=h, minute=0) for h in range(9, 19)]
-        # lunch slot
-        lunch_start = datetime.time(hour=13, minute=0)
-        lunch_end = datetime.time(hour=13, minute=45)
-        # post-lunch slots
-        post_lunch_starts = [datetime.time(hour=13, minute=45), datetime.time(hour=14, minute=45), datetime.time(hour=15, minute=45)]
-
-        for day in DAYS:
-            # Create hourly slots but skip creating a 13:00-14:00 hour; instead we create lunch and post-lunch slots
-            for start in hourly_starts:
-                # determine end time for this slot
-                end_hour = (start.hour + 1)
-                end_time = datetime.time(hour=end_hour, minute=0)
-
-                # If this is the 13:00 hourly slot, skip its normal creation; we'll create lunch and post-lunch separately
-                if start == lunch_start:
-                    continue
-
-                # Skip duplicates
-                exists = cls.objects.filter(day=day, start_time=start, end_time=end_time).exists()
-                if not exists:
-                    pid = f"MT-{day[:3].upper()}-{start.strftime('%H%M')}"
-                    cls.objects.create(pid=pid, day=day, start_time=start, end_time=end_time, is_lunch_break=False)
-                    created += 1
-
-            # Ensure lunch slot exists (13:00 - 13:45) for weekdays only
-            if day != 'Saturday':
-                lunch_exists = cls.objects.filter(day=day, start_time=lunch_start, end_time=lunch_end).exists()
-                if not lunch_exists:
-                    pid = f"MT-{day[:3].upper()}-LUNCH"
-                    cls.objects.create(pid=pid, day=day, start_time=lunch_start, end_time=lunch_end, is_lunch_break=True)
-                    created += 1
-
-                # Create post-lunch slots (13:45-14:45, 14:45-15:45, 15:45-16:45) for weekdays only
-                for post_start in post_lunch_starts:
-                    post_end_hour = (post_start.hour + 1)
-                    post_end = datetime.time(hour=post_end_hour, minute=post_start.minute)
-                    post_exists = cls.objects.filter(day=day, start_time=post_start, end_time=post_end).exists()
-                    if not post_exists:
-                        pid = f"MT-{day[:3].upper()}-{post_start.strftime('%H%M')}"
-                        cls.objects.create(pid=pid, day=day, start_time=post_start, end_time=post_end, is_lunch_break=False)
-                        created += 1
-
-        return created
+        from .caching import bump_model_version
+        from .slot_template import get_slot_template
+
+        existing = set(cls.objects.values_list('day', 'start_time', 'end_time'))
+        missing = [
+            cls(pid=pid, day=day, start_time=start, end_time=end, is_lunch_break=is_lunch)
+            for pid, day, start, end, is_lunch in get_slot_template().meeting_slots()
+            if (day, start, end) not in existing
+        ]
+        if missing:
+            cls.objects.bulk_create(missing, ignore_conflicts=True)
+            # bulk_create sends no post_save, so invalidate cached meeting times here
+            bump_model_version(cls)
+        return len(missing)
 
 
 # -------------------------
@@ -198,6 +170,9 @@ class Course(models.Model):
     class Meta:
         ordering = ['department__name', 'course_name']
         unique_together = ('course_id', 'department')
+        indexes = [
+            models.Index(fields=['department', 'year', 'semester'], name='course_dept_year_sem_idx'),
+        ]
 
     def __str__(self):
         return f"{self.course_id} - {self.course_name}"
@@ -235,6 +210,9 @@ class Section(models.Model):
 
     class Meta:
         ordering = ['section_id']
+        indexes = [
+            models.Index(fields=['department', 'year', 'semester'], name='section_dept_year_sem_idx'),
+        ]
 
     def __str__(self):
         return f"{self.section_id} - Year {self.year}"
@@ -251,9 +229,14 @@ class Class(models.Model):
     room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name='classes')
     section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='classes')
     created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['meeting_time']
+        indexes = [
+            models.Index(fields=['meeting_time', 'instructor'], name='class_time_instructor_idx'),
+            models.Index(fields=['section', 'meeting_time'], name='class_section_time_idx'),
+        ]
 
     def __str__(self):
         return f"{self.course.course_name} - {self.section.section_id}"
@@ -276,6 +259,7 @@ class Timetable(models.Model):
     classes = models.ManyToManyField(Class, blank=True, related_name='timetables')
     fitness = models.IntegerField(default=0)
     fitness_progression = JSONField(default=list, blank=True)  # Store fitness scores per generation
+    evolution_stats = JSONField(default=dict, blank=True)  # Run metadata: operators, time-to-feasible, diversity per generation
     is_active = models.BooleanField(default=False)
     created_by = models.CharField(max_length=100, default="admin")
     created_at = models.DateTimeField(default=timezone.now)
@@ -283,6 +267,9 @@ class Timetable(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['department', 'year', 'semester', 'is_active'], name='timetable_dept_year_sem_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.department.name} Year {self.year}"
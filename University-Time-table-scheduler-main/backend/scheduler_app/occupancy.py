@@ -0,0 +1,289 @@
+import datetime
+
+from django.core.cache import cache
+
+from .caching import model_version
+from .genetic_algorithm import (
+    DISTRIBUTION_PENALTY_WEIGHT, LUNCH_BREAK_PENALTY, LUNCH_START, POST_LUNCH_PENALTY, POST_LUNCH_START,
+    spans_lunch_break, suitable_meeting_times
+)
+from .models import Instructor
+from .slot_template import get_slot_template
+
+# Conflict kinds, in the order they are reported
+RESOURCE_KINDS = ('instructor', 'room', 'section')
+
+WEEKDAYS = get_slot_template().teaching_days
+
+# Indexes are keyed on updated_at, so a stale one is simply never read again
+OCCUPANCY_CACHE_TIMEOUT = 60 * 60
+
+
+def occupied_hours(day, start_time, duration_hours):
+    """(day, 'HH:MM') cells a class starting at start_time occupies, one per hour."""
+    return [
+        (day, datetime.time(hour=(start_time.hour + i) % 24, minute=start_time.minute).strftime('%H:%M'))
+        for i in range(duration_hours)
+    ]
+
+
+def class_details(class_obj):
+    """Index entry for a Class instance (course, section, room, instructor and meeting_time loaded)."""
+    meeting_time = class_obj.meeting_time
+    return {
+        'instructor': class_obj.instructor_id,
+        'room': class_obj.room_id,
+        'section': class_obj.section_id,
+        'day': meeting_time.day,
+        'start_time': meeting_time.start_time,
+        'end_time': meeting_time.end_time,
+        'duration': class_obj.course.duration or 1,
+        'course_name': class_obj.course.course_name,
+        'section_name': class_obj.section.section_id,
+        'room_number': class_obj.room.room_number,
+        'instructor_name': class_obj.instructor.name,
+        'instructor_unavailable': class_obj.instructor.unavailable_slots,
+        'instructor_max_hours': class_obj.instructor.max_hours_per_day,
+    }
+
+
+class TimetableOccupancy:
+    """
+    Index of which instructors, rooms and sections are busy in each hourly cell of a timetable.
+
+    `cells[(day, 'HH:MM')][kind][resource_id]` is the set of class_ids holding that
+    resource in that hour, so checking a move touches only the cells it would occupy.
+    `masks[kind][resource_id]` mirrors this as a weekly bitmask (one bit per cell,
+    see `cell_bits`) so whole-week availability is a single AND. Instructors'
+    blocked hours and daily limits ride along for the availability checks.
+    """
+
+    def __init__(self):
+        self.cells = {}
+        self.classes = {}
+        self.masks = {kind: {} for kind in RESOURCE_KINDS}
+        self.cell_bits = {}
+        self.availability = {}  # instructor id -> (unavailable_slots mask, max_hours_per_day)
+        self.daily_hours = {}  # (instructor id, day) -> booked hours
+
+    def _bit(self, cell):
+        bit = self.cell_bits.get(cell)
+        if bit is None:
+            bit = self.cell_bits[cell] = 1 << len(self.cell_bits)
+        return bit
+
+    @classmethod
+    def from_timetable(cls, timetable):
+        occupancy = cls()
+        rows = timetable.classes.values(
+            'class_id', 'instructor_id', 'room_id', 'section_id',
+            'meeting_time__day', 'meeting_time__start_time', 'meeting_time__end_time', 'course__duration',
+            'course__course_name', 'section__section_id', 'room__room_number', 'instructor__name',
+            'instructor__unavailable_slots', 'instructor__max_hours_per_day'
+        )
+        for row in rows:
+            occupancy.add_class(row['class_id'], {
+                'instructor': row['instructor_id'],
+                'room': row['room_id'],
+                'section': row['section_id'],
+                'day': row['meeting_time__day'],
+                'start_time': row['meeting_time__start_time'],
+                'end_time': row['meeting_time__end_time'],
+                'duration': row['course__duration'] or 1,
+                'course_name': row['course__course_name'],
+                'section_name': row['section__section_id'],
+                'room_number': row['room__room_number'],
+                'instructor_name': row['instructor__name'],
+                'instructor_unavailable': row['instructor__unavailable_slots'],
+                'instructor_max_hours': row['instructor__max_hours_per_day'],
+            })
+        return occupancy
+
+    def add_class(self, class_id, details):
+        self.classes[class_id] = details
+        instructor_day = (details['instructor'], details['day'])
+        self.daily_hours[instructor_day] = self.daily_hours.get(instructor_day, 0) + details['duration']
+        self.track_availability(details)
+        for cell in occupied_hours(details['day'], details['start_time'], details['duration']):
+            busy = self.cells.setdefault(cell, {kind: {} for kind in RESOURCE_KINDS})
+            bit = self._bit(cell)
+            for kind in RESOURCE_KINDS:
+                busy[kind].setdefault(details[kind], set()).add(class_id)
+                self.masks[kind][details[kind]] = self.masks[kind].get(details[kind], 0) | bit
+
+    def track_availability(self, details):
+        """Record the blocked hours and daily maximum of the instructor in `details`, if they are given."""
+        if 'instructor_unavailable' in details:
+            self.availability[details['instructor']] = (details['instructor_unavailable'] or 0, details['instructor_max_hours'])
+
+    def remove_class(self, class_id):
+        details = self.classes.pop(class_id, None)
+        if details is None:
+            return None
+        self.daily_hours[(details['instructor'], details['day'])] -= details['duration']
+        for cell in occupied_hours(details['day'], details['start_time'], details['duration']):
+            busy = self.cells.get(cell)
+            if busy is None:
+                continue
+            for kind in RESOURCE_KINDS:
+                holders = busy[kind].get(details[kind])
+                if holders is not None:
+                    holders.discard(class_id)
+                    if not holders:
+                        del busy[kind][details[kind]]
+                        self.masks[kind][details[kind]] &= ~self.cell_bits[cell]
+        return details
+
+    def move_class(self, class_id, day, start_time, end_time):
+        details = self.remove_class(class_id)
+        if details is not None:
+            self.add_class(class_id, dict(details, day=day, start_time=start_time, end_time=end_time))
+
+    def busy_mask(self, resources):
+        """Cells where any of the given instructor, room or section is already booked."""
+        return (self.masks['instructor'].get(resources['instructor'], 0)
+                | self.masks['room'].get(resources['room'], 0)
+                | self.masks['section'].get(resources['section'], 0))
+
+    def slot_mask(self, day, start_time, duration):
+        mask = 0
+        for cell in occupied_hours(day, start_time, duration):
+            mask |= self._bit(cell)
+        return mask
+
+    def availability_conflicts(self, day, start_time, duration, instructor_id, exclude_class_id=None):
+        """
+        'availability' if the instructor is blocked in any hour of the slot, 'max_hours' if it
+        would take them past their daily maximum (the excluded class's own hours not counted).
+        """
+        unavailable, max_hours = self.availability.get(instructor_id, (0, None))
+        kinds = []
+        if unavailable & get_slot_template().availability_mask(day, start_time, duration):
+            kinds.append('availability')
+        if max_hours:
+            hours = self.daily_hours.get((instructor_id, day), 0)
+            moved = self.classes.get(exclude_class_id)
+            if moved is not None and moved['instructor'] == instructor_id and moved['day'] == day:
+                hours -= moved['duration']
+            if hours + duration > max_hours:
+                kinds.append('max_hours')
+        return kinds
+
+    def conflicts(self, day, start_time, duration, resources, exclude_class_id=None):
+        """
+        Every clash a class using `resources` ({'instructor': id, 'room': id, 'section': id})
+        would have if it started at start_time on day; one entry per clashing class and kind,
+        then one per instructor availability rule the slot breaks.
+        """
+        found = {}
+        for cell in occupied_hours(day, start_time, duration):
+            busy = self.cells.get(cell)
+            if busy is None:
+                continue
+            for kind in RESOURCE_KINDS:
+                for class_id in busy[kind].get(resources[kind], ()):
+                    if class_id != exclude_class_id:
+                        found.setdefault((class_id, kind), None)
+
+        conflicts = []
+        for class_id, kind in found:
+            details = self.classes[class_id]
+            conflicts.append({
+                'type': kind,
+                'class_id': class_id,
+                'day': details['day'],
+                'time': f"{details['start_time'].strftime('%H:%M')}-{details['end_time'].strftime('%H:%M')}",
+                'section': details['section_name'],
+                'course': details['course_name'],
+                'room': details['room_number'],
+                'instructor': details['instructor_name']
+            })
+
+        kinds = self.availability_conflicts(day, start_time, duration, resources['instructor'], exclude_class_id)
+        if kinds:
+            moved = self.classes.get(exclude_class_id) or resources
+            end_time = datetime.time(hour=(start_time.hour + duration) % 24, minute=start_time.minute)
+            for kind in kinds:
+                conflicts.append({
+                    'type': kind,
+                    'class_id': exclude_class_id,
+                    'day': day,
+                    'time': f"{start_time.strftime('%H:%M')}-{end_time.strftime('%H:%M')}",
+                    'section': moved.get('section_name', ''),
+                    'course': moved.get('course_name', ''),
+                    'room': moved.get('room_number', ''),
+                    'instructor': moved.get('instructor_name', '')
+                })
+        return conflicts
+
+
+def suggest_free_slots(occupancy, class_id, details, course, meeting_times):
+    """
+    Every (day, start) a class could move to without an instructor, room or section clash
+    or breaking the instructor's availability, honouring the GA's slot rules (duration, lab, lunch), best first by the GA's soft penalties.
+    `occupancy` is modified: the class is lifted out of it before the search.
+    """
+    occupancy.remove_class(class_id)
+    # The class may be missing from the index (no timetable): its instructor's rules still apply
+    occupancy.track_availability(details)
+    busy = occupancy.busy_mask(details)
+    duration = details['duration']
+
+    # The section's other classes drive the distribution and post-lunch penalties
+    day_counts = dict.fromkeys(WEEKDAYS, 0)
+    uses_post_lunch = False
+    for other in occupancy.classes.values():
+        if other['section'] == details['section']:
+            if other['day'] in day_counts:
+                day_counts[other['day']] += 1
+            uses_post_lunch = uses_post_lunch or other['start_time'] >= POST_LUNCH_START
+
+    slots = []
+    for mt in suitable_meeting_times(meeting_times, course):
+        end_time = datetime.time(hour=(mt.start_time.hour + duration) % 24, minute=mt.start_time.minute)
+        if mt.day not in day_counts or spans_lunch_break(mt.start_time, end_time):
+            continue
+        if occupancy.slot_mask(mt.day, mt.start_time, duration) & busy:
+            continue
+        if occupancy.availability_conflicts(mt.day, mt.start_time, duration, details['instructor']):
+            continue
+
+        counts = [count + (day == mt.day) for day, count in day_counts.items()]
+        mean = sum(counts) / len(counts)
+        penalty = (sum((count - mean) ** 2 for count in counts) / len(counts)) ** 0.5 * DISTRIBUTION_PENALTY_WEIGHT
+        if end_time == LUNCH_START:
+            penalty += LUNCH_BREAK_PENALTY
+        if not uses_post_lunch and mt.start_time < POST_LUNCH_START:
+            penalty += POST_LUNCH_PENALTY
+
+        slots.append({
+            'day': mt.day,
+            'start_time': mt.start_time.strftime('%H:%M'),
+            'end_time': end_time.strftime('%H:%M'),
+            'time_slot': f"{mt.start_time.strftime('%H:%M')}-{end_time.strftime('%H:%M')}",
+            'is_current': mt.day == details['day'] and mt.start_time == details['start_time'],
+            'penalty': round(penalty, 2),
+        })
+
+    slots.sort(key=lambda slot: (slot['penalty'], WEEKDAYS.index(slot['day']), slot['start_time']))
+    return slots
+
+
+def _occupancy_key(timetable):
+    # Instructor availability is part of the index, so edits to it retire cached copies too
+    return f"occupancy:{timetable.pk}:{timetable.updated_at.timestamp():.6f}:{model_version(Instructor)}"
+
+
+def get_timetable_occupancy(timetable):
+    """Occupancy index for a timetable, built with one query and cached until the timetable changes."""
+    key = _occupancy_key(timetable)
+    occupancy = cache.get(key)
+    if occupancy is None:
+        occupancy = TimetableOccupancy.from_timetable(timetable)
+        cache.set(key, occupancy, OCCUPANCY_CACHE_TIMEOUT)
+    return occupancy
+
+
+def store_timetable_occupancy(timetable, occupancy):
+    """Cache an incrementally updated index under the timetable's current updated_at."""
+    cache.set(_occupancy_key(timetable), occupancy, OCCUPANCY_CACHE_TIMEOUT)
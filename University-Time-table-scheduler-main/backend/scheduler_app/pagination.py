@@ -0,0 +1,46 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """Keyset pagination on the primary key: no COUNT and no OFFSET scans, however deep the page."""
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    ordering = 'id'
+
+
+class HybridPagination(PageNumberPagination):
+    """
+    Page-number pagination (with `count`, which the dashboard reads) unless the client
+    opts into cursors with ?paginate=cursor; the `next`/`previous` links then carry ?cursor=.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    cursor_class = KeysetCursorPagination
+    paginate_by_default = True
+
+    def _wants_cursor(self, request):
+        params = request.query_params
+        return params.get('paginate') == 'cursor' or self.cursor_class.cursor_query_param in params
+
+    def is_paginating(self, request):
+        return self.paginate_by_default or self._wants_cursor(request)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor = None
+        if self._wants_cursor(request):
+            self.cursor = self.cursor_class()
+            return self.cursor.paginate_queryset(queryset, request, view)
+        if not self.paginate_by_default:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor is not None:
+            return self.cursor.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class OptionalCursorPagination(HybridPagination):
+    """Unpaginated by default (full listings the frontend relies on); ?paginate=cursor pages with cursors."""
+    paginate_by_default = False
@@ -0,0 +1,68 @@
+# Pure ReportLab helpers (no Django imports) so pages can be rendered in worker processes
+from io import BytesIO
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+
+def pdf_styles():
+    """Return (sample styles, title style, section title style) used by timetable PDFs."""
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'TitleStyle',
+        parent=styles['Title'],
+        fontSize=14,
+        alignment=1,
+        spaceAfter=8
+    )
+    section_title_style = ParagraphStyle(
+        'SectionTitleStyle',
+        parent=styles['Heading2'],
+        fontSize=12,
+        alignment=1,
+        spaceAfter=6
+    )
+    return styles, title_style, section_title_style
+
+
+def landscape_document(buffer):
+    return SimpleDocTemplate(buffer, pagesize=landscape(A4), rightMargin=36, leftMargin=36,
+                             topMargin=36, bottomMargin=18)
+
+
+def schedule_table(table_data):
+    """Day x time-slot schedule table with the timetable header styling."""
+    col_widths = [60] + [80] * (len(table_data[0]) - 1)  # Adjust column widths
+    table = Table(table_data, colWidths=col_widths, repeatRows=1)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2f4f4f')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        ('FONTSIZE', (0, 1), (-1, -1), 7),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ]))
+    return table
+
+
+def render_page_pdf(page):
+    """
+    Render a single schedule page to PDF bytes.
+    `page` is plain data: {'title': ..., 'heading': ..., 'table_data': [[...], ...]}.
+    """
+    buffer = BytesIO()
+    doc = landscape_document(buffer)
+    _, title_style, section_title_style = pdf_styles()
+    doc.build([
+        Paragraph(page['title'], title_style),
+        Spacer(1, 6),
+        Paragraph(page['heading'], section_title_style),
+        Spacer(1, 6),
+        schedule_table(page['table_data']),
+    ])
+    return buffer.getvalue()
@@ -0,0 +1,164 @@
+import hashlib
+import logging
+
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .caching import bump_model_version, cached_reference, store_reference
+from .models import Course, Room, Section
+
+logger = logging.getLogger(__name__)
+
+# Assignment costs: seats left empty, plus penalties for a room of the wrong kind
+LAB_MISMATCH_COST = 1000  # Section with labs placed outside a lab room
+LAB_ROOM_WASTE_COST = 100  # Section without labs occupying a lab room
+UNASSIGNED_COST = 10 ** 6  # Section left without a room
+INFEASIBLE_COST = 10 ** 9  # Room too small for the section
+
+# Cached assignments are dropped when any of these change
+ROOM_ASSIGNMENT_MODELS = (Section, Room, Course)
+
+
+def section_needs(section_ids):
+    """id -> {'num_students', 'has_labs', 'room_id'} for the sections, lab needs annotated in one query."""
+    has_labs = Exists(Course.objects.filter(sections=OuterRef('pk'), course_type='Lab'))
+    rows = Section.objects.filter(pk__in=section_ids).annotate(has_labs=has_labs).order_by().values(
+        'id', 'section_id', 'num_students', 'has_labs', 'room_id'
+    )
+    return {row['id']: row for row in rows}
+
+
+def _cost(need, room):
+    if room is None:
+        return UNASSIGNED_COST
+    if room.capacity < need['num_students']:
+        return INFEASIBLE_COST
+    cost = room.capacity - need['num_students']
+    if need['has_labs'] and room.room_type != 'Lab':
+        cost += LAB_MISMATCH_COST
+    elif not need['has_labs'] and room.room_type == 'Lab':
+        cost += LAB_ROOM_WASTE_COST
+    return cost
+
+
+def best_fit_assignment(needs, rooms):
+    """
+    Greedy capacity-sorted matching: largest sections first, each taking the smallest free
+    room that fits, lab rooms for sections with labs and other rooms for the rest.
+    Returns (assignment, clean) where clean is False when some section had to fall back
+    to a room of the other kind or got none.
+    """
+    free = sorted(rooms, key=lambda room: (room.capacity, room.room_number))
+    assignment = {}
+    clean = True
+    for need in sorted(needs, key=lambda need: (-need['num_students'], not need['has_labs'], need['section_id'])):
+        fitting = [room for room in free if room.capacity >= need['num_students']]
+        preferred = [room for room in fitting if (room.room_type == 'Lab') == need['has_labs']]
+        room = (preferred or fitting or [None])[0]
+        clean = clean and bool(preferred)
+        if room is not None:
+            free.remove(room)
+        assignment[need['id']] = room
+    return assignment, clean
+
+
+def hungarian(costs):
+    """
+    Minimum-cost assignment of rows to columns (len(rows) <= len(columns)).
+    Returns the column chosen for each row; O(rows^2 * columns).
+    """
+    rows, columns = len(costs), len(costs[0]) if costs else 0
+    u, v = [0] * (rows + 1), [0] * (columns + 1)
+    owner, way = [0] * (columns + 1), [0] * (columns + 1)
+    for row in range(1, rows + 1):
+        owner[0] = row
+        column = 0
+        min_slack = [float('inf')] * (columns + 1)
+        used = [False] * (columns + 1)
+        while owner[column]:
+            used[column] = True
+            current, delta, next_column = owner[column], float('inf'), 0
+            for candidate in range(1, columns + 1):
+                if used[candidate]:
+                    continue
+                slack = costs[current - 1][candidate - 1] - u[current] - v[candidate]
+                if slack < min_slack[candidate]:
+                    min_slack[candidate], way[candidate] = slack, column
+                if min_slack[candidate] < delta:
+                    delta, next_column = min_slack[candidate], candidate
+            for candidate in range(columns + 1):
+                if used[candidate]:
+                    u[owner[candidate]] += delta
+                    v[candidate] -= delta
+                else:
+                    min_slack[candidate] -= delta
+            column = next_column
+        while column:
+            previous = way[column]
+            owner[column] = owner[previous]
+            column = previous
+
+    chosen = [0] * rows
+    for column in range(1, columns + 1):
+        if owner[column]:
+            chosen[owner[column] - 1] = column - 1
+    return chosen
+
+
+def optimal_assignment(needs, rooms):
+    """Exact minimum-cost assignment over _cost, used when room types conflict."""
+    needs = list(needs)
+    # Padding columns stand for "no room", so every section gets exactly one column
+    columns = list(rooms) + [None] * len(needs)
+    chosen = hungarian([[_cost(need, room) for room in columns] for need in needs])
+    return {
+        need['id']: columns[column] if _cost(need, columns[column]) < INFEASIBLE_COST else None
+        for need, column in zip(needs, chosen)
+    }
+
+
+def solve_room_assignment(needs, rooms):
+    """Best-fit matching, or the exact assignment when the greedy pass had to compromise."""
+    assignment, clean = best_fit_assignment(needs, rooms)
+    if not clean:
+        assignment = optimal_assignment(needs, rooms)
+    return {section_id: room.id if room else None for section_id, room in assignment.items()}
+
+
+def _persist(needs, assignment):
+    """Write only the sections whose room changed, in a single bulk_update."""
+    now = timezone.now()
+    changed = [
+        Section(id=section_id, room_id=room_id, updated_at=now)
+        for section_id, room_id in assignment.items() if needs[section_id]['room_id'] != room_id
+    ]
+    if changed:
+        Section.objects.bulk_update(changed, ['room', 'updated_at'])
+        # bulk_update sends no post_save
+        bump_model_version(Section)
+    return len(changed)
+
+
+def assign_section_rooms(sections, rooms):
+    """
+    One room per section: best fit by capacity, lab rooms for sections with lab courses.
+    Returns {section pk: room pk or None}. Results are cached until sections, rooms or
+    courses change, so repeated generations neither recompute nor rewrite Section.room.
+    """
+    section_ids = sorted(section.pk for section in sections)
+    room_ids = sorted(room.pk for room in rooms)
+    key = hashlib.sha1(f"{section_ids}:{room_ids}".encode()).hexdigest()
+
+    def build():
+        needs = section_needs(section_ids)
+        assignment = solve_room_assignment(needs.values(), rooms)
+        changed = _persist(needs, assignment)
+        if changed:
+            # Writing Section.room bumped the Section version the lookup key was built from
+            store_reference('room-assignment', ROOM_ASSIGNMENT_MODELS, key, assignment)
+        unassigned = [needs[section_id]['section_id'] for section_id, room_id in assignment.items() if room_id is None]
+        logger.info("Room assignment for %d sections: %d changed, %d without a room %s",
+                    len(assignment), changed, len(unassigned), unassigned or '')
+        return assignment
+
+    return cached_reference('room-assignment', ROOM_ASSIGNMENT_MODELS, key, build)
@@ -1,6 +1,25 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from .checkpoints import CHECKPOINT_ID_PATTERN
+from .genetic_algorithm import CROSSOVER_OPERATORS
 from .models import Instructor, Room, MeetingTime, Department, Course, Section, Class, Timetable
+from .slot_template import get_slot_template
+
+
+class SparseFieldsetMixin:
+    """
+    Limit a serializer to the comma-separated `?fields=` of the request, e.g. ?fields=id,name,fitness.
+    Unknown names are ignored; without the parameter every field is returned.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        requested = request.query_params.get('fields') if request is not None else None
+        if requested:
+            allowed = {name.strip() for name in requested.split(',') if name.strip()}
+            for name in set(self.fields) - allowed:
+                self.fields.pop(name)
 
 
 # -------------------------
@@ -15,13 +34,31 @@ class UserSerializer(serializers.ModelSerializer):
 # -------------------------
 # Instructor Serializer
 # -------------------------
+class BlockedSlotsField(serializers.ListField):
+    """`unavailable_slots` as readable entries: 'Friday' (whole day) or 'Monday 09:00' (one hour)."""
+    child = serializers.CharField()
+
+    def to_representation(self, value):
+        return get_slot_template().decode_blocked(value or 0)
+
+    def to_internal_value(self, data):
+        try:
+            return get_slot_template().encode_blocked(super().to_internal_value(data))
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc))
+
+
 class InstructorSerializer(serializers.ModelSerializer):
     course_names = serializers.SerializerMethodField()
     course_ids = serializers.SerializerMethodField()
+    blocked_slots = BlockedSlotsField(source='unavailable_slots', required=False)
 
     class Meta:
         model = Instructor
-        fields = ['id', 'instructor_id', 'name', 'email', 'is_available', 'course_names', 'course_ids']
+        fields = [
+            'id', 'instructor_id', 'name', 'email', 'is_available', 'blocked_slots', 'max_hours_per_day',
+            'course_names', 'course_ids'
+        ]
 
     def get_course_names(self, obj):
         return [course.course_name for course in obj.courses_teaching.all()]
@@ -161,7 +198,7 @@ class ClassSerializer(serializers.ModelSerializer):
 # -------------------------
 # Timetable Serializer
 # -------------------------
-class TimetableSerializer(serializers.ModelSerializer):
+class TimetableSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     department_name = serializers.CharField(source='department.name', read_only=True)
     created_by_username = serializers.SerializerMethodField()
     classes_data = ClassSerializer(source='classes', many=True, read_only=True)
@@ -169,9 +206,12 @@ class TimetableSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Timetable
-        fields = ['id', 'name', 'department', 'department_name', 'year', 'semester', 'classes', 'fitness', 'fitness_progression', 'is_active', 'created_by', 'created_by_username', 'created_at', 'updated_at', 'classes_data', 'total_classes']
+        fields = ['id', 'name', 'department', 'department_name', 'year', 'semester', 'classes', 'fitness', 'fitness_progression', 'evolution_stats', 'is_active', 'created_by', 'created_by_username', 'created_at', 'updated_at', 'classes_data', 'total_classes']
 
     def get_created_by_username(self, obj):
+        # Annotated by TimetableViewSet's queryset; fall back to a lookup elsewhere
+        if hasattr(obj, 'created_by_user'):
+            return obj.created_by_user
         try:
             user = User.objects.get(username=obj.created_by)
             return user.username
@@ -179,9 +219,23 @@ class TimetableSerializer(serializers.ModelSerializer):
             return None
 
     def get_total_classes(self, obj):
+        # Annotated by TimetableViewSet's queryset; fall back to a count elsewhere
+        if hasattr(obj, 'classes_count'):
+            return obj.classes_count
         return obj.classes.count()
 
 
+class TimetableSummarySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Timetable listing without the per-class payload; total_classes comes from an annotation."""
+    department_name = serializers.CharField(source='department.name', read_only=True)
+    created_by_username = serializers.CharField(source='created_by_user', read_only=True, default=None)
+    total_classes = serializers.IntegerField(source='classes_count', read_only=True)
+
+    class Meta:
+        model = Timetable
+        fields = ['id', 'name', 'department', 'department_name', 'year', 'semester', 'fitness', 'fitness_progression', 'is_active', 'created_by', 'created_by_username', 'created_at', 'updated_at', 'total_classes']
+
+
 # -------------------------
 # Timetable Generation Serializer
 # -------------------------
@@ -199,6 +253,23 @@ class TimetableGenerationSerializer(serializers.Serializer):
     mutation_rate = serializers.FloatField(default=0.1, min_value=0.01, max_value=0.5)
     elite_rate = serializers.FloatField(default=0.1, min_value=0.05, max_value=0.3)
     generations = serializers.IntegerField(default=500, min_value=50, max_value=2000)
+    # 'section' pins one room per section; 'pool' picks a compatible room per class
+    room_mode = serializers.ChoiceField(choices=['section', 'pool'], default='section')
+    # Treat instructors and rooms booked by active timetables of other sections as busy
+    respect_active = serializers.BooleanField(default=True)
+    # 'conflict_directed' mostly reassigns clashing classes to clash-free slots
+    mutation_operator = serializers.ChoiceField(choices=['random', 'conflict_directed'], default='random')
+    # 'section_block' keeps each section's week from one parent; see CROSSOVER_OPERATORS for the rest
+    crossover_operator = serializers.ChoiceField(choices=list(CROSSOVER_OPERATORS), default='single_point')
+    # What to do when the population collapses to clones
+    diversity_response = serializers.ChoiceField(choices=['restart', 'hypermutation', 'none'], default='none')
+    # Id the run checkpoints under, for resuming it after a worker restart (generated if omitted;
+    # an id whose checkpoint still exists is refused with 409)
+    checkpoint_id = serializers.RegexField(CHECKPOINT_ID_PATTERN, required=False)
+
+
+class TimetableResumeSerializer(serializers.Serializer):
+    checkpoint_id = serializers.RegexField(CHECKPOINT_ID_PATTERN)
 
 
 # -------------------------
@@ -0,0 +1,39 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .caching import bump_model_version
+from .models import Department, Room, MeetingTime, Instructor, Course, Section, Timetable
+
+# Many-to-many relations rendered into list payloads; m2m edits do not save either side
+TRACKED_RELATIONS = {
+    Course.sections.through,
+    Course.instructors.through,
+    Section.instructors.through,
+    Timetable.classes.through,
+}
+
+# Models whose rows feed the reference-data cache (and the cached room assignment)
+CACHED_MODELS = (Department, Room, MeetingTime, Instructor, Course, Section)
+
+
+@receiver(m2m_changed)
+def touch_on_m2m_change(sender, instance, action, model, pk_set, **kwargs):
+    """Bump updated_at on both sides of a relation change so list ETags and cache keys move on."""
+    if sender not in TRACKED_RELATIONS or action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    now = timezone.now()
+    type(instance)._default_manager.filter(pk=instance.pk).update(updated_at=now)
+    instance.updated_at = now
+    if pk_set:
+        model._default_manager.filter(pk__in=pk_set).update(updated_at=now)
+    for changed in (type(instance), model):
+        if changed in CACHED_MODELS:
+            bump_model_version(changed)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_cached_model_version(sender, **kwargs):
+    if sender in CACHED_MODELS:
+        bump_model_version(sender)
@@ -0,0 +1,152 @@
+import datetime
+from functools import lru_cache
+
+from django.conf import settings
+
+# Weekly time layout. Override any key with settings.TIMETABLE_SLOT_TEMPLATE.
+DEFAULT_SLOT_TEMPLATE = {
+    'days': ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'],
+    # Days the GA schedules, free-slot suggestions offer and the PDF/Excel exports render
+    'teaching_days': ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday'],
+    # Days that get the lunch break and the shifted post-lunch slots
+    'lunch_days': ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday'],
+    # Hourly slots from first_start up to last_end, except the hour starting at lunch
+    'first_start': '09:00',
+    'last_end': '19:00',
+    'lunch': ('13:00', '13:45'),
+    'post_lunch_starts': ['13:45', '14:45', '15:45'],
+    # Multi-hour classes must end by this time
+    'latest_multi_hour_end': '17:00',
+    # Lab classes never start at these times
+    'lab_excluded_starts': ['12:00'],
+}
+
+
+def _time(value):
+    return value if isinstance(value, datetime.time) else datetime.datetime.strptime(value, '%H:%M').time()
+
+
+def _plus_hours(start_time, hours):
+    return datetime.time(hour=(start_time.hour + hours) % 24, minute=start_time.minute)
+
+
+# Availability masks are stored in a signed 64-bit column
+AVAILABILITY_BITS = 63
+
+
+class SlotTemplate:
+    """
+    Single definition of the weekly slot grid: which MeetingTime rows exist, where
+    lunch falls, and the slot columns the exports and schedule view render.
+    """
+
+    def __init__(self, **overrides):
+        config = dict(DEFAULT_SLOT_TEMPLATE, **overrides)
+        self.days = list(config['days'])
+        self.teaching_days = [day for day in config['teaching_days'] if day in self.days]
+        self.lunch_days = [day for day in config['lunch_days'] if day in self.days]
+        self.first_start = _time(config['first_start'])
+        self.last_end = _time(config['last_end'])
+        self.lunch_start, self.lunch_end = (_time(value) for value in config['lunch'])
+        self.post_lunch_starts = [_time(value) for value in config['post_lunch_starts']]
+        self.post_lunch_start = self.post_lunch_starts[0] if self.post_lunch_starts else self.lunch_end
+        self.latest_multi_hour_end = _time(config['latest_multi_hour_end'])
+        self.lab_excluded_starts = {_time(value) for value in config['lab_excluded_starts']}
+        # One availability bit per (day, clock hour) between first_start and last_end
+        self.availability_hours = list(range(self.first_start.hour, self.last_end.hour + (self.last_end.minute > 0)))
+        if len(self.days) * len(self.availability_hours) > AVAILABILITY_BITS:
+            raise ValueError(
+                f"Slot template has {len(self.days)} days x {len(self.availability_hours)} hours; "
+                f"availability masks hold at most {AVAILABILITY_BITS} cells"
+            )
+
+    def hourly_starts(self):
+        return [
+            datetime.time(hour=hour) for hour in range(self.first_start.hour, self.last_end.hour)
+            if datetime.time(hour=hour) != self.lunch_start
+        ]
+
+    def meeting_slots(self):
+        """(pid, day, start, end, is_lunch_break) of every MeetingTime the template defines."""
+        slots = []
+        for day in self.days:
+            prefix = f"MT-{day[:3].upper()}"
+            for start in self.hourly_starts():
+                slots.append((f"{prefix}-{start.strftime('%H%M')}", day, start, _plus_hours(start, 1), False))
+            if day in self.lunch_days:
+                slots.append((f"{prefix}-LUNCH", day, self.lunch_start, self.lunch_end, True))
+                for start in self.post_lunch_starts:
+                    slots.append((f"{prefix}-{start.strftime('%H%M')}", day, start, _plus_hours(start, 1), False))
+        return slots
+
+    def grid_time_slots(self):
+        """'HH:MM:SS-HH:MM:SS' columns of the rendered grid: morning hours, lunch, post-lunch slots."""
+        columns = [(start, _plus_hours(start, 1)) for start in self.hourly_starts() if start < self.lunch_start]
+        columns.append((self.lunch_start, self.lunch_end))
+        columns.extend((start, _plus_hours(start, 1)) for start in self.post_lunch_starts)
+        return [f"{start}-{end}" for start, end in columns]
+
+    def lunch_time_slot(self):
+        return f"{self.lunch_start}-{self.lunch_end}"
+
+    def hour_bit(self, day, hour):
+        if day not in self.days or hour not in self.availability_hours:
+            return 0
+        return 1 << (self.days.index(day) * len(self.availability_hours) + self.availability_hours.index(hour))
+
+    def availability_mask(self, day, start_time, duration=1):
+        """Bits of every clock hour a class of `duration` hours starting at start_time touches (13:45 covers 13 and 14)."""
+        start = start_time.hour * 60 + start_time.minute
+        last_hour = (start + 60 * (duration or 1) - 1) // 60
+        mask = 0
+        for hour in range(start_time.hour, last_hour + 1):
+            mask |= self.hour_bit(day, hour)
+        return mask
+
+    def occupancy_mask(self, day, start_time, duration=1):
+        """
+        Quarter-hour bits of a class, for in-memory busy maps where back-to-back 13:45 and
+        14:45 slots must not touch (unbounded Python ints, so never stored).
+        """
+        if day not in self.days:
+            return 0
+        start = (start_time.hour * 60 + start_time.minute) // 15
+        return ((1 << 4 * (duration or 1)) - 1) << (self.days.index(day) * 24 * 4 + start)
+
+    def day_mask(self, day):
+        mask = 0
+        for hour in self.availability_hours:
+            mask |= self.hour_bit(day, hour)
+        return mask
+
+    def encode_blocked(self, entries):
+        """Mask for entries like 'Friday' (whole day) or 'Monday 09:00' (that clock hour)."""
+        mask = 0
+        for entry in entries:
+            day, _, start = entry.strip().partition(' ')
+            if day not in self.days:
+                raise ValueError(f"Unknown day '{day}'")
+            if not start:
+                mask |= self.day_mask(day)
+                continue
+            bit = self.hour_bit(day, _time(start.strip()).hour)
+            if not bit:
+                raise ValueError(f"{entry} is outside the {self.first_start:%H:%M}-{self.last_end:%H:%M} timetable")
+            mask |= bit
+        return mask
+
+    def decode_blocked(self, mask):
+        """Inverse of encode_blocked: whole days collapse to the day name."""
+        entries = []
+        for day in self.days:
+            day_mask = self.day_mask(day)
+            if mask & day_mask == day_mask:
+                entries.append(day)
+                continue
+            entries.extend(f"{day} {hour:02d}:00" for hour in self.availability_hours if mask & self.hour_bit(day, hour))
+        return entries
+
+
+@lru_cache(maxsize=1)
+def get_slot_template():
+    return SlotTemplate(**getattr(settings, 'TIMETABLE_SLOT_TEMPLATE', {}))
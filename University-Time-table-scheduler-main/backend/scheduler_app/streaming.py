@@ -0,0 +1,55 @@
+import json
+
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+# Rows fetched (and prefetched) per database round trip while streaming
+STREAM_CHUNK_SIZE = 500
+
+
+def _encode(data):
+    return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':'))
+
+
+def stream_serialized(queryset, serializer, chunk_size=STREAM_CHUNK_SIZE, ndjson=False):
+    """
+    Yield the serialized rows of a queryset as a JSON array (or NDJSON lines), one
+    encoded chunk per database chunk, so only `chunk_size` rows are in memory at a time.
+    """
+    rows = []
+    first = True
+    if not ndjson:
+        yield b'['
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        rows.append(_encode(serializer.to_representation(obj)))
+        if len(rows) >= chunk_size:
+            yield _join(rows, first, ndjson)
+            first = False
+            rows = []
+    if rows:
+        yield _join(rows, first, ndjson)
+    if not ndjson:
+        yield b']'
+
+
+def _join(rows, first, ndjson):
+    if ndjson:
+        return ('\n'.join(rows) + '\n').encode()
+    return (('' if first else ',') + ','.join(rows)).encode()
+
+
+def wants_ndjson(request):
+    return (request.query_params.get('output') == 'ndjson'
+            or 'application/x-ndjson' in request.META.get('HTTP_ACCEPT', ''))
+
+
+def streaming_json_response(request, queryset, serializer):
+    """
+    Stream a queryset through a (non-`many`) serializer as a JSON array,
+    or as newline-delimited JSON with ?output=ndjson / Accept: application/x-ndjson.
+    """
+    ndjson = wants_ndjson(request)
+    return StreamingHttpResponse(
+        stream_serialized(queryset, serializer, ndjson=ndjson),
+        content_type='application/x-ndjson' if ndjson else 'application/json'
+    )
@@ -0,0 +1,61 @@
+import random
+from unittest import mock
+
+from django.core.cache import cache
+
+from scheduler_app.genetic_algorithm import GeneticAlgorithm
+from scheduler_app.models import Department, Instructor, Room, MeetingTime, Course, Section
+
+
+def with_clash(individual):
+    """Move the second class onto the first one's slot: same section and instructor, so a hard clash."""
+    individual[1]['meeting_time'] = individual[0]['meeting_time']
+    return individual
+
+
+class GASampleMixin:
+    """
+    Small GA sample: sections CSE-1A and CSE-1B of 60 students, three 3-per-week courses each,
+    rooms 101 and 102. One instructor teaches everything unless instructor_per_section is set.
+    With stop_when_complete = False runs never end early on a complete timetable.
+    """
+    seed = None
+    generations = 50
+    instructor_per_section = False
+    stop_when_complete = True
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        if not self.stop_when_complete:
+            patcher = mock.patch.object(GeneticAlgorithm, '_meets_classes_per_week', return_value=False)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        if self.seed is not None:
+            random.seed(self.seed)
+        MeetingTime.generate_default_slots()
+        self.department = Department.objects.create(name='Computer Science', code='CSE')
+        Room.objects.create(room_number='101', capacity=70)
+        Room.objects.create(room_number='102', capacity=70)
+        instructor = None
+        for code in ('A', 'B'):
+            if instructor is None or self.instructor_per_section:
+                name = code if self.instructor_per_section else 'Smith'
+                instructor = Instructor.objects.create(
+                    instructor_id=f'I{code}', name=f'Dr. {name}', email=f'{name.lower()}@example.com'
+                )
+            section = Section.objects.create(
+                section_id=f'CSE-1{code}', department=self.department, year=1, semester=1, num_students=60
+            )
+            for number in range(3):
+                course = Course.objects.create(
+                    course_id=f'CS{number}{code}', course_name=f'Course {number}{code}', classes_per_week=3,
+                    department=self.department, year=1, semester=1
+                )
+                course.instructors.add(instructor)
+                course.sections.add(section)
+
+    def _ga(self, **kwargs):
+        options = {'population_size': 10, 'generations': self.generations, 'progress_bar': False}
+        options.update(kwargs)
+        return GeneticAlgorithm(department_ids=[self.department.id], years=[1], semesters=[1], **options)
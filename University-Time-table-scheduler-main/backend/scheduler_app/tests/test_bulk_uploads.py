@@ -0,0 +1,93 @@
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from scheduler_app.models import Department, Instructor, Room, Course
+
+
+def _upload(text, name='upload.csv'):
+    return {'file': SimpleUploadedFile(name, text.encode())}
+
+
+class BulkUploadTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username='planner', password='testpassword'))
+        self.department = Department.objects.create(name='Computer Science', code='CSE')
+
+    def test_instructor_upload_reports_row_errors(self):
+        Instructor.objects.create(instructor_id='I1', name='Dr. Smith', email='smith@example.com')
+        response = self.client.post('/api/instructors/bulk-upload/', _upload(
+            'instructor_id,name,email,is_available\n'
+            'I1,Dr. Smith,smith@example.com,false\n'
+            'I2,Dr. Jones,jones@example.com,\n'
+            'I3,Dr. Brown,smith@example.com,\n'
+            'I4,Dr. White,not-an-email,\n'
+            'I2,Dr. Jones,jones2@example.com,\n'
+        ), format='multipart')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['created'], response.data['updated']), (1, 1))
+        self.assertEqual([error['row'] for error in response.data['errors']], [3, 4, 5])
+        self.assertFalse(Instructor.objects.get(instructor_id='I1').is_available)
+        self.assertEqual(Instructor.objects.count(), 2)
+
+    def test_room_upload_and_dry_run(self):
+        content = 'room_number,capacity,room_type\n101,60,Classroom\nL1,30,Lab\nX,zero,Lab\n'
+        response = self.client.post('/api/rooms/bulk-upload/?dry_run=true', _upload(content), format='multipart')
+        self.assertEqual(response.data['created'], 2)
+        self.assertFalse(Room.objects.exists())
+
+        response = self.client.post('/api/rooms/bulk-upload/', _upload(content), format='multipart')
+        self.assertEqual(len(response.data['errors']), 1)
+        self.assertEqual(Room.objects.get(room_number='L1').room_type, 'Lab')
+
+    def test_explicit_format_for_files_without_an_extension(self):
+        content = 'room_number,capacity\n201,40\n'
+        response = self.client.post('/api/rooms/bulk-upload/', _upload(content, name='rooms'), format='multipart')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post('/api/rooms/bulk-upload/?file_format=csv', _upload(content, name='rooms'), format='multipart')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(Room.objects.get(room_number='201').capacity, 40)
+
+    def test_malformed_files_are_rejected_or_reported(self):
+        for url in ('/api/instructors/bulk-upload/', '/api/rooms/bulk-upload/', '/api/courses/bulk-assign-instructors/'):
+            response = self.client.post(url, _upload('{"room_number": "301",\n', name='rows.jsonl'), format='multipart')
+            self.assertEqual(response.status_code, 400)
+            response = self.client.post(url, _upload('not a workbook', name='rows.xlsx'), format='multipart')
+            self.assertEqual(response.status_code, 400)
+
+        response = self.client.post('/api/rooms/bulk-upload/', _upload(
+            '[1]\n{"room_number": "301", "capacity": "inf"}\n{"room_number": "302", "capacity": 40}\n', name='rooms.jsonl'
+        ), format='multipart')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([error['row'] for error in response.data['errors']], [1, 2])
+        self.assertEqual(list(Room.objects.values_list('room_number', flat=True)), ['302'])
+
+    def test_course_instructor_links(self):
+        smith = Instructor.objects.create(instructor_id='I1', name='Dr. Smith', email='smith@example.com')
+        jones = Instructor.objects.create(instructor_id='I2', name='Dr. Jones', email='jones@example.com')
+        programming = Course.objects.create(course_id='CS101', course_name='Programming', department=self.department)
+        networks = Course.objects.create(course_id='CS301', course_name='Networks', department=self.department)
+        networks.instructors.add(jones)
+
+        self.client.get('/api/instructors/')
+        response = self.client.post('/api/courses/bulk-assign-instructors/?replace=true', _upload(
+            'course_code,department_code,instructor_ids\n'
+            'CS101,CSE,I1;I2\n'
+            'CS301,,I1\n'
+            'CS999,CSE,I1\n'
+            'CS101,CSE,I9\n'
+        ), format='multipart')
+
+        self.assertEqual((response.data['linked'], response.data['removed']), (3, 1))
+        self.assertEqual([error['row'] for error in response.data['errors']], [3, 4])
+        self.assertEqual(set(programming.instructors.all()), {smith, jones})
+        self.assertEqual(list(networks.instructors.all()), [smith])
+
+        # The cached instructor list reflects the new links
+        listed = {item['instructor_id']: item['course_names'] for item in self.client.get('/api/instructors/').data['results']}
+        self.assertEqual(sorted(listed['I1']), ['Networks', 'Programming'])
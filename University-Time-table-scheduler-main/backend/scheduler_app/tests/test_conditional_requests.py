@@ -0,0 +1,93 @@
+import json
+import time
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from scheduler_app.models import Department, Instructor, MeetingTime, Course
+
+
+class ConditionalListTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='planner', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.department = Department.objects.create(name='Computer Science', code='CSE')
+        self.instructor = Instructor.objects.create(instructor_id='I1', name='Dr. Smith', email='smith@example.com')
+        self.course = Course.objects.create(
+            course_id='CS101', course_name='Introduction to Programming', department=self.department
+        )
+
+    def test_unchanged_list_returns_304(self):
+        first = self.client.get('/api/courses/')
+        self.assertEqual(first.status_code, 200)
+        self.assertNotIn('Last-Modified', first)
+
+        with self.assertNumQueries(1):
+            not_modified = self.client.get('/api/courses/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+        # Different query strings select different representations
+        other = self.client.get('/api/courses/?year=1', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(other.status_code, 200)
+
+    def test_relation_change_and_deletion_change_the_etag(self):
+        etag = self.client.get('/api/courses/')['ETag']
+
+        # m2m edits save neither side; the signal bumps updated_at
+        self.course.instructors.add(self.instructor)
+        response = self.client.get('/api/courses/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['instructor_names'], ['Dr. Smith'])
+
+        etag = response['ETag']
+        Course.objects.create(course_id='CS102', course_name='Data Structures', department=self.department).delete()
+        self.assertEqual(self.client.get('/api/courses/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.instructor.delete()
+        self.assertEqual(self.client.get('/api/courses/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_if_modified_since_never_hides_a_deletion(self):
+        Course.objects.create(course_id='CS102', course_name='Data Structures', department=self.department)
+        since = http_date(time.time() + 60)
+        self.assertEqual(len(self.client.get('/api/courses/', HTTP_IF_MODIFIED_SINCE=since).data['results']), 2)
+
+        # Deleting the older course leaves the newest updated_at as it was; only the ETag notices
+        self.course.delete()
+        response = self.client.get('/api/courses/', HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_unpaginated_listings_are_conditional(self):
+        etag = self.client.get('/api/courses/get_all_courses/')['ETag']
+        self.assertEqual(
+            self.client.get('/api/courses/get_all_courses/', HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+
+
+class CursorPaginationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='planner', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        MeetingTime.generate_default_slots()
+
+    def test_page_numbers_remain_the_default(self):
+        response = self.client.get('/api/rooms/')
+        self.assertIn('count', response.data)
+
+    def test_cursor_pages_walk_the_collection_by_primary_key(self):
+        seen = []
+        url = '/api/meeting-times/?paginate=cursor&page_size=20'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            seen.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, list(MeetingTime.objects.order_by('id').values_list('id', flat=True)))
+
+    def test_meeting_times_stay_unpaginated_without_cursor(self):
+        response = self.client.get('/api/meeting-times/')
+        self.assertEqual(len(json.loads(b''.join(response.streaming_content))), MeetingTime.objects.count())
@@ -0,0 +1,48 @@
+from django.test import TestCase
+
+from scheduler_app.genetic_algorithm import CROSSOVER_OPERATORS, crossover_operator
+from scheduler_app.tests.ga_fixtures import GASampleMixin
+
+
+class CrossoverOperatorTest(GASampleMixin, TestCase):
+    seed = 3
+    instructor_per_section = True
+
+    def _parents(self, operator):
+        ga = self._ga(crossover_operator=operator)
+        parent1, parent2 = ga.generate_initial_population()[:2]
+        return ga, parent1, parent2
+
+    def test_section_block_keeps_each_section_week_from_one_parent(self):
+        ga, parent1, parent2 = self._parents('section_block')
+        for child in ga.crossover(parent1, parent2):
+            for block in ga.section_blocks:
+                week = [child[index] for index in block]
+                self.assertIn(week, ([parent1[index] for index in block], [parent2[index] for index in block]))
+            # Children own their genes, so mutating one cannot leak into a parent
+            self.assertFalse(any(gene is parent_gene for gene, parent_gene in zip(child, parent1)))
+
+        # Clash-free parents give clash-free children: each section's week and instructor are intact
+        self.assertEqual([ga.conflicting_genes(child)[0] for child in ga.crossover(parent1, parent2)], [set(), set()])
+
+    def test_pmx_never_repeats_a_slot_within_a_section(self):
+        ga, parent1, parent2 = self._parents('pmx')
+        for child in ga.crossover(parent1, parent2):
+            for group in ga.slot_groups:
+                slots = [child[index]['meeting_time'] for index in group]
+                self.assertEqual(len(set(slots)), len(slots))
+
+    def test_operators_are_registered_and_selectable(self):
+        self.assertTrue({'single_point', 'section_block', 'uniform', 'pmx'} <= set(CROSSOVER_OPERATORS))
+
+        @crossover_operator('clone')
+        def clone(ga, parent1, parent2):
+            return [dict(gene) for gene in parent1], [dict(gene) for gene in parent2]
+
+        try:
+            ga, parent1, parent2 = self._parents('clone')
+            self.assertEqual(ga.crossover(parent1, parent2), (parent1, parent2))
+        finally:
+            del CROSSOVER_OPERATORS['clone']
+        with self.assertRaises(ValueError):
+            self._parents('clone')
@@ -0,0 +1,150 @@
+import io
+import json
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from openpyxl import Workbook
+from rest_framework.test import APIClient
+
+from scheduler_app.importers import CurriculumImporter, ImportFormatError, import_curriculum_file, read_rows
+from scheduler_app.models import Course, Department, Section
+
+CSV_HEADER = 'department_code,department_name,course_code,course_name,type,credits,semester,sections\n'
+
+
+def _csv(*lines):
+    return io.BytesIO((CSV_HEADER + ''.join(f"{line}\n" for line in lines)).encode())
+
+
+class CurriculumImportTest(TestCase):
+    def test_creates_departments_courses_and_sections(self):
+        report = import_curriculum_file(_csv(
+            'CSE,Computer Science,CS101,Programming,Theory,4,1,CSE-1A;CSE-1B',
+            'CSE,Computer Science,CS101L,Programming Lab,Lab,1,1,CSE-1A',
+        ), filename='curriculum.csv')
+
+        self.assertEqual(report['courses'], {'created': 2, 'updated': 0, 'unchanged': 0})
+        self.assertEqual(report['departments']['created'], 1)
+        self.assertEqual(report['sections'], {'created': 2, 'linked': 3})
+        lab = Course.objects.get(course_id='CS101L')
+        self.assertEqual((lab.duration, lab.year, lab.classes_per_week, lab.department.code), (2, 1, 1, 'CSE'))
+        self.assertEqual(Section.objects.get(section_id='CSE-1B').courses.get().course_id, 'CS101')
+
+    def test_reimport_updates_only_changed_rows(self):
+        department = Department.objects.create(name='Computer Science', code='CSE')
+        Course.objects.create(course_id='CS101', course_name='Programming', credits=4, classes_per_week=4,
+                              semester=1, department=department)
+        Course.objects.create(course_id='CS102', course_name='Old Name', department=department)
+
+        # One pre-fetch each for departments and courses, then one bulk_update in its batch transaction,
+        # all inside the import's transaction
+        with self.assertNumQueries(7):
+            report = import_curriculum_file(_csv(
+                'CSE,Computer Science,CS101,Programming,Theory,4,1,',
+                'CSE,Computer Science,CS102,Data Structures,Theory,3,2,',
+            ), filename='curriculum.csv')
+        self.assertEqual(report['courses'], {'created': 0, 'updated': 1, 'unchanged': 1})
+        self.assertEqual(Course.objects.get(course_id='CS102').course_name, 'Data Structures')
+
+    def test_invalid_and_duplicate_rows_are_reported(self):
+        report = import_curriculum_file(_csv(
+            'CSE,Computer Science,CS101,Programming,Theory,4,1,',
+            'CSE,Computer Science,CS101,Programming Again,Theory,4,1,',
+            'CSE,Computer Science,CS103,Networks,Seminar,3,1,',
+            'CSE,Computer Science,CS104,Compilers,Theory,3,11,',
+        ), filename='curriculum.csv')
+        self.assertEqual([error['row'] for error in report['errors']], [2, 3, 4])
+        self.assertEqual(Course.objects.count(), 1)
+
+    def test_department_name_clash_is_a_row_error(self):
+        Department.objects.create(name='Computer Science', code='CSE')
+        lines = (
+            'CS,Computer Science,CS101,Programming,Theory,4,1,',
+            'AI,Intelligent Systems,AI101,Search,Theory,3,1,',
+            'ML,Intelligent Systems,ML101,Learning,Theory,3,1,',
+        )
+        dry_run = CurriculumImporter(dry_run=True).run(read_rows(_csv(*lines), 'csv'))
+        report = import_curriculum_file(_csv(*lines), filename='curriculum.csv')
+        for result in (dry_run, report):
+            self.assertEqual([error['row'] for error in result['errors']], [1, 3])
+        self.assertEqual(report['departments']['created'], 1)
+        self.assertEqual(list(Course.objects.values_list('course_id', 'department__code')), [('AI101', 'AI')])
+
+    def test_large_import_uses_constant_queries(self):
+        lines = [f'U{n % 10},University {n % 10},C{n:04d},Course {n},Theory,3,{n % 8 + 1},' for n in range(2000)]
+        with CaptureQueriesContext(connection) as queries:
+            report = CurriculumImporter(batch_size=1000).run(read_rows(_csv(*lines), 'csv'))
+        # Multi-row INSERTs (split at SQLite's variable limit) rather than a get_or_create per row
+        self.assertLess(len(queries), 50)
+        self.assertEqual(report['courses']['created'], 2000)
+        self.assertEqual(Course.objects.count(), 2000)
+
+    def test_json_program_layout_and_xlsx(self):
+        programs = [{'program': 'Data Science', 'department_code': 'DS', 'curriculum': [
+            {'semester': 3, 'course_code': 'UDS001', 'course_name': 'Data Mining', 'credits': 3, 'type': 'Theory'},
+        ]}]
+        import_curriculum_file(io.BytesIO(json.dumps(programs).encode()), filename='programs.json')
+        self.assertEqual(Course.objects.get(course_id='UDS001').year, 2)
+
+        workbook = Workbook()
+        workbook.active.append(['department_code', 'course_code', 'course_name', 'semester'])
+        workbook.active.append(['DS', 'UDS002', 'Cryptography', 5])
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        buffer.seek(0)
+        report = import_curriculum_file(buffer, filename='catalogue.xlsx')
+        self.assertEqual(report['courses']['created'], 1)
+
+    def test_rows_that_are_not_objects_or_numbers_are_row_errors(self):
+        lines = [
+            [1],
+            {'department_code': 'CSE', 'course_code': 'CS101', 'semester': 1, 'credits': 'inf'},
+            {'department_code': 'CSE', 'course_code': 'CS102', 'semester': 1},
+        ]
+        content = ''.join(f"{json.dumps(line)}\n" for line in lines).encode()
+        report = import_curriculum_file(io.BytesIO(content), filename='curriculum.jsonl')
+        self.assertEqual([error['row'] for error in report['errors']], [1, 2])
+        self.assertEqual(list(Course.objects.values_list('course_id', flat=True)), ['CS102'])
+
+    def test_unreadable_files_raise_format_errors(self):
+        content = b'{"department_code": "CSE", "course_code": "CS101", "semester": 1}\n{"department_code": \n'
+        with self.assertRaisesMessage(ImportFormatError, 'line 2'):
+            import_curriculum_file(io.BytesIO(content), filename='curriculum.jsonl')
+        self.assertFalse(Course.objects.exists())
+        with self.assertRaises(ImportFormatError):
+            import_curriculum_file(io.BytesIO(b'not a workbook'), filename='curriculum.xlsx')
+
+
+class CurriculumImportAPITest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username='admin', password='testpassword', is_staff=True))
+
+    def test_upload_and_dry_run(self):
+        content = (CSV_HEADER + 'IT,Information Technology,IT201,Databases,Theory,3,3,\n').encode()
+        response = self.client.post('/api/curriculum/import/?dry_run=true',
+                                    {'file': SimpleUploadedFile('curriculum.csv', content)}, format='multipart')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['courses']['created'], 1)
+        self.assertFalse(Course.objects.exists())
+
+        response = self.client.post('/api/curriculum/import/',
+                                    {'file': SimpleUploadedFile('curriculum.csv', content)}, format='multipart')
+        self.assertEqual(response.data['courses']['created'], 1)
+        self.assertTrue(Course.objects.filter(course_id='IT201', department__code='IT').exists())
+
+    def test_rejects_unknown_format_and_non_staff(self):
+        response = self.client.post('/api/curriculum/import/',
+                                    {'file': SimpleUploadedFile('curriculum.txt', b'x')}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/curriculum/import/',
+                                    {'file': SimpleUploadedFile('curriculum.xlsx', b'x')}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+
+        self.client.force_authenticate(user=User.objects.create_user(username='planner', password='testpassword'))
+        response = self.client.post('/api/curriculum/import/',
+                                    {'file': SimpleUploadedFile('curriculum.csv', b'')}, format='multipart')
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,21 @@
+from django.db import connection, transaction
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from scheduler_app.models import Department
+
+
+class SQLiteTuningTest(TransactionTestCase):
+    def test_pragmas_are_applied_to_new_connections(self):
+        connection.close()
+        with connection.cursor() as cursor:
+            synchronous = cursor.execute('PRAGMA synchronous').fetchone()[0]
+            busy_timeout = cursor.execute('PRAGMA busy_timeout').fetchone()[0]
+        self.assertEqual(synchronous, 1)  # NORMAL
+        self.assertEqual(busy_timeout, connection.pragmas['busy_timeout'])
+
+    def test_write_transactions_take_the_lock_up_front(self):
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                Department.objects.create(name='Computer Science', code='CSE')
+        self.assertEqual(queries.captured_queries[0]['sql'], f'BEGIN {connection.transaction_mode}')
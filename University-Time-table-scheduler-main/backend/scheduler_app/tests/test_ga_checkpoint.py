@@ -0,0 +1,137 @@
+import os
+import random
+import shutil
+import tempfile
+import threading
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from scheduler_app.checkpoints import CheckpointWriter, checkpoint_path, list_checkpoints, read_checkpoint
+from scheduler_app.genetic_algorithm import GeneticAlgorithm
+from scheduler_app.models import Course, Timetable
+from scheduler_app.tests.ga_fixtures import GASampleMixin
+
+
+class GACheckpointTest(GASampleMixin, TestCase):
+    generations = 15
+    stop_when_complete = False  # Every run has generations to checkpoint
+
+    def setUp(self):
+        super().setUp()
+        self.checkpoint_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.checkpoint_dir)
+        settings_override = override_settings(GA_CHECKPOINT_DIR=self.checkpoint_dir, GA_CHECKPOINT_INTERVAL=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _crash_after(self, ga, generations):
+        # Simulates a worker killed mid-run: selection runs once per generation
+        calls = []
+        selection = ga.selection
+
+        def crashing_selection(population, fitness_scores):
+            calls.append(1)
+            if len(calls) > generations:
+                raise RuntimeError('worker restarted')
+            return selection(population, fitness_scores)
+        ga.selection = crashing_selection
+
+    def _join_writers(self):
+        for thread in threading.enumerate():
+            if thread.name.startswith('ga-checkpoint-'):
+                thread.join()
+
+    def test_resumed_run_matches_an_uninterrupted_one(self):
+        random.seed(11)
+        best, fitness, progression = self._ga(mutation_rate=0.3, diversity_response='none').evolve()
+        self.assertGreater(len(progression), 5)
+
+        random.seed(11)
+        ga = self._ga(mutation_rate=0.3, diversity_response='none', checkpoint_id='run-1')
+        self._crash_after(ga, 5)
+        with self.assertRaises(RuntimeError):
+            ga.evolve()
+        self._join_writers()
+
+        header, state = read_checkpoint('run-1')
+        self.assertEqual(header['department_ids'], [self.department.id])
+        self.assertTrue(0 < state['generation'] <= 5)
+        self.assertEqual(len(state['fitness_progression']), state['generation'])
+
+        resumed = GeneticAlgorithm.from_checkpoint('run-1', progress_bar=False)
+        resumed_best, resumed_fitness, resumed_progression = resumed.evolve()
+        # Same population and random state: the resumed run retraces the original one
+        self.assertEqual(resumed_progression, progression)
+        self.assertEqual(resumed_fitness, fitness)
+        self.assertEqual(GeneticAlgorithm._genome(resumed_best), GeneticAlgorithm._genome(best))
+        self.assertEqual(resumed.run_stats['resumed_at'], [state['generation']])
+
+    def test_changed_classes_refuse_to_resume(self):
+        random.seed(11)
+        ga = self._ga(checkpoint_id='run-2')
+        self._crash_after(ga, 1)
+        with self.assertRaises(RuntimeError):
+            ga.evolve()
+        self._join_writers()
+        self.assertEqual([header['checkpoint_id'] for header in list_checkpoints()], ['run-2'])
+
+        Course.objects.filter(course_id='CS0A').update(classes_per_week=4)
+        with self.assertRaises(ValueError):
+            GeneticAlgorithm.from_checkpoint('run-2')
+        with self.assertRaises(FileNotFoundError):
+            GeneticAlgorithm.from_checkpoint('missing')
+        with self.assertRaises(ValueError):
+            self._ga(checkpoint_id='../escape')
+
+    def test_writes_are_rate_limited(self):
+        writer = CheckpointWriter('run-3', interval=60)
+        self.assertFalse(writer.maybe_save(lambda: self.fail('snapshot taken before the interval passed')))
+
+        ga = self._ga(checkpoint_id='run-4')
+        ga.evolve()
+        stats = ga.run_stats['checkpoints']
+        self.assertGreaterEqual(stats['writes'], 1)
+        self.assertLess(stats['snapshot_seconds'], ga.run_stats['seconds'])
+
+    def test_resume_api_finishes_the_run_and_drops_its_checkpoint(self):
+        ga = self._ga(checkpoint_id='run-5')
+        self._crash_after(ga, 2)
+        with self.assertRaises(RuntimeError):
+            ga.evolve()
+        self._join_writers()
+
+        client = APIClient()
+        client.force_authenticate(user=User.objects.create_user(username='planner', password='testpassword'))
+        listed = client.get('/api/timetables/checkpoints/').json()
+        self.assertEqual([header['checkpoint_id'] for header in listed], ['run-5'])
+
+        response = client.post('/api/timetables/resume/', {'checkpoint_id': 'run-5'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        timetable = Timetable.objects.get(id=response.json()['timetable_id'])
+        self.assertEqual(timetable.evolution_stats['resumed_at'], [listed[0]['generation']])
+        self.assertEqual(client.get('/api/timetables/checkpoints/').json(), [])
+        self.assertEqual(client.post('/api/timetables/resume/', {'checkpoint_id': 'run-5'}, format='json').status_code, 404)
+
+    def test_generate_refuses_a_checkpoint_id_in_use_and_stale_ones_are_pruned(self):
+        ga = self._ga(checkpoint_id='run-6')
+        self._crash_after(ga, 1)
+        with self.assertRaises(RuntimeError):
+            ga.evolve()
+        self._join_writers()
+
+        client = APIClient()
+        client.force_authenticate(user=User.objects.create_user(username='planner', password='testpassword'))
+        response = client.post('/api/timetables/generate/', {
+            'department_ids': [self.department.id], 'years': [1], 'semester': '1', 'checkpoint_id': 'run-6'
+        }, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(read_checkpoint('run-6')[0]['checkpoint_id'], 'run-6')
+
+        # A checkpoint nobody resumed within GA_CHECKPOINT_MAX_AGE is removed on the next listing
+        with override_settings(GA_CHECKPOINT_MAX_AGE=60):
+            self.assertEqual(len(list_checkpoints()), 1)
+            os.utime(checkpoint_path('run-6'), (0, 0))
+            self.assertEqual(list_checkpoints(), [])
+        self.assertFalse(os.path.exists(checkpoint_path('run-6')))
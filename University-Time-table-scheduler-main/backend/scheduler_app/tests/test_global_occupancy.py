@@ -0,0 +1,91 @@
+import datetime
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from scheduler_app.genetic_algorithm import GeneticAlgorithm
+from scheduler_app.global_occupancy import active_busy_masks
+from scheduler_app.models import Department, Instructor, Room, MeetingTime, Course, Section, Class, Timetable
+from scheduler_app.slot_template import SlotTemplate
+
+
+class GlobalOccupancyTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        MeetingTime.generate_default_slots()
+        self.instructor = Instructor.objects.create(instructor_id='I1', name='Dr. Shared', email='shared@example.com')
+        self.room = Room.objects.create(room_number='101', capacity=70)
+        self.cse, self.ds = (
+            Department.objects.create(name='Computer Science', code='CSE'),
+            Department.objects.create(name='Data Science', code='DS'),
+        )
+        self.cse_section = self._section_with_course(self.cse, 'CSE-1A', 'CS101')
+        self.ds_section = self._section_with_course(self.ds, 'DS-2A', 'DS201')
+
+        # The DS timetable already keeps the shared instructor and room busy all of Monday and Tuesday
+        course = self.ds_section.courses.get()
+        self.active = Timetable.objects.create(name='DS Year 2', department=self.ds, year=2, semester=1, is_active=True)
+        slots = MeetingTime.objects.filter(day__in=['Monday', 'Tuesday'], is_lunch_break=False)
+        classes = Class.objects.bulk_create([
+            Class(class_id=f'DS-2A_DS201_{i}', course=course, instructor=self.instructor, room=self.room,
+                  meeting_time=mt, section=self.ds_section)
+            for i, mt in enumerate(slots)
+        ])
+        self.active.classes.add(*classes)
+
+    def _section_with_course(self, department, section_id, course_id):
+        section = Section.objects.create(section_id=section_id, department=department, year=1, semester=1, num_students=60)
+        course = Course.objects.create(
+            course_id=course_id, course_name=course_id, classes_per_week=4, department=department, year=1, semester=1
+        )
+        course.instructors.add(self.instructor)
+        course.sections.add(section)
+        return section
+
+    def _ga(self, department, **kwargs):
+        options = {'semesters': [1], 'population_size': 10, 'generations': 50, 'progress_bar': False}
+        options.update(kwargs)
+        return GeneticAlgorithm(department_ids=[department.id], years=[1], **options)
+
+    def test_separate_run_avoids_resources_of_active_timetables(self):
+        for room_mode in ('section', 'pool'):
+            ga = self._ga(self.cse, room_mode=room_mode)
+            for individual in ga.generate_initial_population():
+                self.assertFalse({class_obj['meeting_time'].day for class_obj in individual} & {'Monday', 'Tuesday'})
+                self.assertEqual({class_obj['room'] for class_obj in individual}, {self.room})
+
+            individual[0]['meeting_time'] = MeetingTime.objects.get(day='Monday', start_time=datetime.time(9, 0))
+            self.assertLess(ga.calculate_fitness(individual), ga.calculate_fitness(ga.generate_initial_population()[0]))
+
+    def test_regenerating_sections_replaces_their_own_timetable(self):
+        ga = self._ga(self.ds)
+        self.assertEqual(ga.external_busy, {'instructor': {}, 'room': {}})
+        self.assertEqual(self._ga(self.cse, respect_active=False).external_busy, {'instructor': {}, 'room': {}})
+
+    def test_active_timetables_of_the_other_semester_parity_do_not_block(self):
+        section = Section.objects.create(section_id='CSE-1B', department=self.cse, year=1, semester=2, num_students=60)
+        course = Course.objects.create(
+            course_id='CS102', course_name='CS102', classes_per_week=4, department=self.cse, year=1, semester=2
+        )
+        course.instructors.add(self.instructor)
+        course.sections.add(section)
+
+        ga = self._ga(self.cse, semesters=[2])
+        self.assertEqual(ga.external_busy, {'instructor': {}, 'room': {}})
+        self.assertEqual(set(active_busy_masks([section.id], semesters=[1, 3])['instructor']), {self.instructor.id})
+
+    def test_masks_cached_until_active_timetables_change(self):
+        masks = active_busy_masks([self.cse_section.id])
+        self.assertEqual(set(masks['instructor']), {self.instructor.id})
+        with self.assertNumQueries(1):
+            self.assertEqual(active_busy_masks([self.cse_section.id]), masks)
+
+        self.active.is_active = False
+        self.active.save()
+        self.assertEqual(active_busy_masks([self.cse_section.id]), {'instructor': {}, 'room': {}})
+
+    def test_back_to_back_shifted_slots_do_not_overlap(self):
+        template = SlotTemplate()
+        first = template.occupancy_mask('Monday', datetime.time(13, 45))
+        self.assertFalse(first & template.occupancy_mask('Monday', datetime.time(14, 45)))
+        self.assertTrue(first & template.occupancy_mask('Monday', datetime.time(14, 0)))
@@ -0,0 +1,85 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from scheduler_app.genetic_algorithm import GeneticAlgorithm
+from scheduler_app.models import Department, Instructor, Room, MeetingTime, Course, Section
+from scheduler_app.slot_template import SlotTemplate
+
+
+class AvailabilityMaskTest(TestCase):
+    def test_blocked_entries_round_trip(self):
+        template = SlotTemplate()
+        mask = template.encode_blocked(['Friday', 'Monday 09:00', 'Monday 14:00'])
+        self.assertEqual(template.decode_blocked(mask), ['Monday 09:00', 'Monday 14:00', 'Friday'])
+        self.assertLess(mask, 1 << 63)
+        with self.assertRaises(ValueError):
+            template.encode_blocked(['Monday 20:00'])
+
+    def test_shifted_slots_cover_both_clock_hours(self):
+        template = SlotTemplate()
+        post_lunch = template.availability_mask('Monday', datetime.time(13, 45))
+        self.assertEqual(post_lunch, template.hour_bit('Monday', 13) | template.hour_bit('Monday', 14))
+        self.assertFalse(post_lunch & template.availability_mask('Monday', datetime.time(12, 0)))
+
+    def test_instructor_api_accepts_blocked_slots(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username='planner', password='testpassword'))
+        response = client.post('/api/instructors/', {
+            'instructor_id': 'P1', 'name': 'Part Timer', 'email': 'pt@example.com',
+            'blocked_slots': ['Wednesday', 'Thursday 10:00'], 'max_hours_per_day': 3
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['blocked_slots'], ['Wednesday', 'Thursday 10:00'])
+        instructor = Instructor.objects.get(instructor_id='P1')
+        self.assertTrue(instructor.is_blocked('Thursday', datetime.time(9, 0), duration=2))
+        self.assertFalse(instructor.is_blocked('Thursday', datetime.time(11, 0)))
+
+        response = client.post('/api/instructors/', {
+            'instructor_id': 'P2', 'name': 'Bad', 'email': 'bad@example.com', 'blocked_slots': ['Someday']
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class GeneticAlgorithmAvailabilityTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        MeetingTime.generate_default_slots()
+        template = SlotTemplate()
+        self.department = Department.objects.create(name='Computer Science', code='CSE')
+        self.instructor = Instructor.objects.create(
+            instructor_id='I1', name='Dr. Smith', email='smith@example.com', max_hours_per_day=2,
+            unavailable_slots=template.encode_blocked(['Monday', 'Tuesday', 'Wednesday 09:00'])
+        )
+        Room.objects.create(room_number='101', capacity=70)
+        section = Section.objects.create(section_id='CSE-1A', department=self.department, year=1, semester=1)
+        course = Course.objects.create(
+            course_id='CS101', course_name='Programming', classes_per_week=4,
+            department=self.department, year=1, semester=1
+        )
+        course.instructors.add(self.instructor)
+        course.sections.add(section)
+        self.ga = GeneticAlgorithm(
+            department_ids=[self.department.id], years=[1], semesters=[1], population_size=10,
+            generations=50, progress_bar=False
+        )
+
+    def test_seeded_timetables_respect_blocked_hours_and_daily_limit(self):
+        for individual in self.ga.generate_initial_population():
+            days = [class_obj['meeting_time'].day for class_obj in individual]
+            self.assertFalse({'Monday', 'Tuesday'} & set(days))
+            self.assertTrue(all(days.count(day) <= 2 for day in days))
+            self.assertFalse(any(
+                self.instructor.is_blocked(class_obj['meeting_time'].day, class_obj['meeting_time'].start_time)
+                for class_obj in individual
+            ))
+
+    def test_fitness_penalises_blocked_hours(self):
+        individual = self.ga.generate_initial_population()[0]
+        clean = self.ga.calculate_fitness(individual)
+        individual[0]['meeting_time'] = MeetingTime.objects.get(day='Monday', start_time=datetime.time(10, 0))
+        self.assertLess(self.ga.calculate_fitness(individual), clean)
+
@@ -0,0 +1,54 @@
+import copy
+
+from django.test import TestCase
+
+from scheduler_app.tests.ga_fixtures import GASampleMixin, with_clash
+
+
+class ConflictDirectedMutationTest(GASampleMixin, TestCase):
+    seed = 7
+
+    def _clashing_individual(self, ga):
+        return with_clash(ga.generate_initial_population()[0])
+
+    def test_conflicting_genes_reports_both_sides_of_a_clash(self):
+        ga = self._ga()
+        individual = self._clashing_individual(ga)
+        hard, _ = ga.conflicting_genes(individual)
+        self.assertTrue({0, 1} <= hard)
+
+    def test_conflict_directed_operator_repairs_clashes(self):
+        ga = self._ga(mutation_operator='conflict_directed', mutation_rate=0.01)
+        individual = self._clashing_individual(ga)
+        untouched = [class_obj['meeting_time'] for class_obj in individual[2:]]
+        for _ in range(10):
+            individual = ga.mutate(individual)
+            if not ga.conflicting_genes(individual)[0]:
+                break
+        self.assertEqual(ga.conflicting_genes(individual)[0], set())
+        # Clean classes are mostly left alone
+        moved = sum(a != class_obj['meeting_time'] for a, class_obj in zip(untouched, individual[2:]))
+        self.assertLess(moved, len(untouched) // 2)
+
+    def test_run_reports_time_to_feasible(self):
+        ga = self._ga(mutation_operator='conflict_directed')
+        ga.evolve()
+        self.assertEqual(ga.run_stats['mutation_operator'], 'conflict_directed')
+        self.assertIsNotNone(ga.run_stats['feasible_generation'])
+        self.assertLessEqual(ga.run_stats['feasible_seconds'], ga.run_stats['seconds'])
+
+        with self.assertRaises(ValueError):
+            self._ga(mutation_operator='guided')
+
+    def test_only_conflict_directed_runs_wait_for_a_conflict_free_timetable(self):
+        for operator in ('random', 'conflict_directed'):
+            ga = self._ga(mutation_operator=operator)
+            clashing = self._clashing_individual(ga)
+            ga.generate_initial_population = lambda: [copy.deepcopy(clashing) for _ in range(ga.population_size)]
+            ga.evolve()
+            if operator == 'random':
+                # A complete timetable ends a random-mutation run, clashes or not
+                self.assertEqual(ga.run_stats['generations'], 1)
+            else:
+                self.assertGreater(ga.run_stats['generations'], 1)
+                self.assertIsNotNone(ga.run_stats['feasible_generation'])
@@ -0,0 +1,46 @@
+import copy
+
+from django.test import TestCase
+
+from scheduler_app.tests.ga_fixtures import GASampleMixin, with_clash
+
+
+class PopulationDiversityTest(GASampleMixin, TestCase):
+    seed = 5
+    generations = 20
+    stop_when_complete = False
+
+    def _converge(self, ga):
+        # Clones of one clashing timetable: nothing left to recombine
+        clone = with_clash(ga.generate_initial_population()[0])
+        ga.generate_initial_population = lambda: [copy.deepcopy(clone) for _ in range(ga.population_size)]
+
+    def test_clones_have_no_diversity(self):
+        ga = self._ga()
+        population = ga.generate_initial_population()
+        distinct, diversity = ga.population_diversity(population)
+        self.assertGreater(distinct, 0.5)
+        self.assertGreater(diversity, 0.5)
+        self.assertEqual(ga.population_diversity([population[0]] * 5), (0.2, 0.0))
+
+    def test_collapsed_population_is_restarted_and_recorded(self):
+        ga = self._ga(mutation_rate=0.01, diversity_response='restart')
+        self._converge(ga)
+        ga.evolve()
+        events = ga.run_stats['diversity_events']
+        self.assertEqual(events[0]['generation'], 0)
+        self.assertEqual(events[0]['action'], 'restart')
+        self.assertEqual(ga.run_stats['diversity'][0], 0.0)
+        # Fresh timetables let the next generation escape the clash the clones shared
+        self.assertGreater(ga.run_stats['feasible_generation'], 0)
+
+    def test_hypermutation_burst_raises_and_restores_mutation_rate(self):
+        ga = self._ga(mutation_rate=0.01, diversity_response='hypermutation')
+        self._converge(ga)
+        rates = []
+        mutate = ga.mutate
+        ga.mutate = lambda individual: rates.append(ga.mutation_rate) or mutate(individual)
+        ga.evolve()
+        self.assertEqual(ga.run_stats['diversity_events'][0]['action'], 'hypermutation')
+        self.assertAlmostEqual(rates[0], 0.05)
+        self.assertEqual(ga.mutation_rate, 0.01)
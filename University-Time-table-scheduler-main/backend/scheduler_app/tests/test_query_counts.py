@@ -0,0 +1,110 @@
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from scheduler_app.models import (
+    Department, Instructor, Room, MeetingTime, Course, Section, Class, Timetable
+)
+
+
+class ListEndpointQueryCountTest(TestCase):
+    """
+    List endpoints must run a fixed number of queries however many rows they return.
+    Counts include the single conditional-GET validator query.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='planner', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+
+        MeetingTime.generate_default_slots()
+        self.meeting_times = list(MeetingTime.objects.filter(is_lunch_break=False))
+        self.room = Room.objects.create(room_number='101', capacity=60)
+        self.rows = 0
+
+    def _add_rows(self, count):
+        """Add `count` departments, each with a fully linked section, course, class and timetable."""
+        for _ in range(count):
+            self.rows += 1
+            n = self.rows
+            head = Instructor.objects.create(instructor_id=f'H{n}', name=f'Head {n}', email=f'h{n}@example.com')
+            department = Department.objects.create(name=f'Department {n}', code=f'D{n}', head_of_department=head)
+            instructor = Instructor.objects.create(instructor_id=f'I{n}', name=f'Instructor {n}', email=f'i{n}@example.com')
+            section = Section.objects.create(section_id=f'S{n}', department=department, year=1, semester=1)
+            section.instructors.add(instructor)
+            course = Course.objects.create(
+                course_id=f'C{n}', course_name=f'Course {n}', department=department, year=1, semester=1
+            )
+            course.sections.add(section)
+            course.instructors.add(instructor, head)
+            timetable = Timetable.objects.create(
+                name=f'Timetable {n}', department=department, year=1, semester=1, created_by='planner'
+            )
+            for index in range(2):
+                timetable.classes.add(Class.objects.create(
+                    class_id=f'S{n}_C{n}_{index}', course=course, instructor=instructor, room=self.room,
+                    section=section, meeting_time=self.meeting_times[(n + index) % len(self.meeting_times)]
+                ))
+
+    def _get(self, url):
+        response = self.client.get(url)
+        if response.streaming:
+            # Streamed rows are only queried while the body is consumed
+            response.content_rows = json.loads(b''.join(response.streaming_content))
+        return response
+
+    def assertConstantQueries(self, url, expected):
+        self._add_rows(2)
+        with self.assertNumQueries(expected):
+            small = self._get(url)
+        self._add_rows(3)
+        with self.assertNumQueries(expected):
+            large = self._get(url)
+        self.assertEqual(small.status_code, 200)
+        self.assertEqual(large.status_code, 200)
+        return large
+
+    def test_instructor_list(self):
+        response = self.assertConstantQueries('/api/instructors/', 4)
+        self.assertEqual(response.data['results'][0]['course_names'], ['Course 1'])
+
+    def test_department_list(self):
+        self.assertConstantQueries('/api/departments/', 3)
+
+    def test_course_list(self):
+        response = self.assertConstantQueries('/api/courses/', 5)
+        self.assertEqual(response.data['results'][0]['section_names'], ['S1'])
+
+    def test_all_courses(self):
+        self.assertConstantQueries('/api/courses/get_all_courses/', 4)
+
+    def test_section_list(self):
+        response = self.assertConstantQueries('/api/sections/', 6)
+        self.assertEqual(len(response.data['results'][0]['courses_detail'][0]['instructors']), 2)
+
+    def test_class_list(self):
+        self.assertConstantQueries('/api/classes/', 3)
+
+    def test_timetable_list(self):
+        response = self.assertConstantQueries('/api/timetables/', 3)
+        timetable = response.data['results'][0]
+        self.assertEqual(timetable['created_by_username'], 'planner')
+        self.assertEqual(timetable['total_classes'], 2)
+        self.assertNotIn('classes_data', timetable)
+
+    def test_timetable_list_with_classes(self):
+        response = self.assertConstantQueries('/api/timetables/?include=classes', 4)
+        timetable = response.data['results'][0]
+        self.assertEqual(timetable['total_classes'], 2)
+        self.assertEqual(len(timetable['classes_data']), 2)
+
+    def test_timetable_list_sparse_fieldset(self):
+        response = self.assertConstantQueries('/api/timetables/?fields=id,name,fitness_progression', 3)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'name', 'fitness_progression'})
+
+        response = self.client.get('/api/timetables/?fields=id,classes_data')
+        self.assertEqual(set(response.data['results'][0]), {'id', 'classes_data'})
+        self.assertEqual(len(response.data['results'][0]['classes_data']), 2)
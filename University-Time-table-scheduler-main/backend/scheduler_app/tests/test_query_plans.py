@@ -0,0 +1,37 @@
+import datetime
+import unittest
+
+from django.db import connection
+from django.test import TestCase
+
+from scheduler_app.models import MeetingTime, Course, Section, Class, Timetable
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'Query plan assertions are written for SQLite')
+class SchedulingIndexPlanTest(TestCase):
+    """The scheduling hot paths should be answered by index searches, not table scans."""
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(f'USING INDEX {index_name}', plan, plan)
+
+    def test_meeting_time_lookup(self):
+        self.assertUsesIndex(
+            MeetingTime.objects.filter(day='Monday', start_time=datetime.time(9, 0)), 'meetingtime_day_start_idx'
+        )
+
+    def test_generation_setup_filters(self):
+        self.assertUsesIndex(Section.objects.filter(department_id=1, year=1, semester=1), 'section_dept_year_sem_idx')
+        self.assertUsesIndex(
+            Course.objects.filter(department_id=1, year=1, semester__in=[1, 3, 5, 7]), 'course_dept_year_sem_idx'
+        )
+
+    def test_conflict_check_filters(self):
+        self.assertUsesIndex(Class.objects.filter(meeting_time_id=1, instructor_id=1), 'class_time_instructor_idx')
+        self.assertUsesIndex(Class.objects.filter(section_id=1, meeting_time_id=1), 'class_section_time_idx')
+
+    def test_activation_filter(self):
+        self.assertUsesIndex(
+            Timetable.objects.filter(department_id=1, year=1, semester__in=[1, 3, 5, 7], is_active=True),
+            'timetable_dept_year_sem_idx'
+        )
@@ -0,0 +1,54 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from scheduler_app.caching import cache_stats, cached_reference
+from scheduler_app.models import Department, Instructor, Room, Course
+
+
+class ReferenceCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='admin', password='testpassword', is_staff=True)
+        self.client.force_authenticate(user=self.user)
+        self.instructor = Instructor.objects.create(instructor_id='I1', name='Dr. Smith', email='smith@example.com')
+        self.department = Department.objects.create(name='Computer Science', code='CSE')
+
+    def test_second_list_is_served_from_cache(self):
+        first = self.client.get('/api/departments/')
+        # Only the conditional-GET validator query runs on a hit
+        with self.assertNumQueries(1):
+            second = self.client.get('/api/departments/')
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(cache_stats()['department-list'], {'hit': 1, 'miss': 1, 'hit_rate': 0.5})
+
+    def test_saves_and_relation_changes_invalidate(self):
+        self.client.get('/api/departments/')
+        Department.objects.create(name='Mathematics', code='MTH')
+        self.assertEqual(self.client.get('/api/departments/').data['count'], 2)
+
+        self.assertEqual(self.client.get('/api/instructors/').data['results'][0]['course_names'], [])
+        course = Course.objects.create(course_id='CS101', course_name='Introduction to Programming', department=self.department)
+        course.instructors.add(self.instructor)
+        self.assertEqual(
+            self.client.get('/api/instructors/').data['results'][0]['course_names'], ['Introduction to Programming']
+        )
+
+    def test_ga_reference_loader_reads_through_cache(self):
+        Room.objects.create(room_number='101', capacity=60)
+        load = lambda: cached_reference('ga-rooms', (Room,), 'available', lambda: list(Room.objects.filter(is_available=True)))
+        self.assertEqual(len(load()), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(len(load()), 1)
+
+        Room.objects.create(room_number='102', capacity=30)
+        self.assertEqual(len(load()), 2)
+
+    def test_stats_endpoint_is_staff_only(self):
+        self.client.get('/api/rooms/')
+        self.assertIn('room-list', self.client.get('/api/cache/stats/').data)
+
+        self.client.force_authenticate(user=User.objects.create_user(username='planner', password='testpassword'))
+        self.assertEqual(self.client.get('/api/cache/stats/').status_code, 403)
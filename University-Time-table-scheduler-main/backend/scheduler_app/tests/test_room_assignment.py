@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from scheduler_app.models import Department, Room, Course, Section
+from scheduler_app.room_assignment import assign_section_rooms, hungarian, optimal_assignment
+
+
+class RoomAssignmentTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.department = Department.objects.create(name='Computer Science', code='CSE')
+        self.small = Room.objects.create(room_number='101', capacity=40)
+        self.medium = Room.objects.create(room_number='102', capacity=65)
+        self.large = Room.objects.create(room_number='103', capacity=120)
+        self.lab = Room.objects.create(room_number='L1', capacity=70, room_type='Lab')
+        self.theory_section = Section.objects.create(
+            section_id='CSE-1A', department=self.department, year=1, semester=1, num_students=60
+        )
+        self.lab_section = Section.objects.create(
+            section_id='CSE-1B', department=self.department, year=1, semester=1, num_students=60
+        )
+        lab_course = Course.objects.create(
+            course_id='CS101L', course_name='Programming Lab', course_type='Lab', department=self.department
+        )
+        lab_course.sections.add(self.lab_section)
+
+    def _assign(self, sections=None, rooms=None):
+        return assign_section_rooms(sections or list(Section.objects.all()), rooms or list(Room.objects.all()))
+
+    def test_best_fit_by_capacity_and_lab_needs(self):
+        # One annotated read, one bulk_update (plus its transaction savepoints)
+        with self.assertNumQueries(4):
+            assignment = self._assign()
+        self.assertEqual(assignment, {self.theory_section.id: self.medium.id, self.lab_section.id: self.lab.id})
+        self.theory_section.refresh_from_db()
+        self.assertEqual(self.theory_section.room, self.medium)
+
+    def test_cached_until_rooms_change_and_not_rewritten(self):
+        self._assign()
+        sections, rooms = list(Section.objects.all()), list(Room.objects.all())
+        # The first run rewrote Section.room and cached its result under the bumped Section version
+        with self.assertNumQueries(0):
+            self._assign(sections, rooms)
+
+        self.medium.capacity = 50
+        self.medium.save()
+        assignment = self._assign()
+        self.assertEqual(assignment[self.theory_section.id], self.large.id)
+
+    def test_exact_assignment_resolves_type_conflicts(self):
+        self.assertEqual(hungarian([[4, 1, 3], [2, 0, 5], [3, 2, 2]]), [1, 0, 2])
+
+        needs = [
+            {'id': 1, 'section_id': 'A', 'num_students': 60, 'has_labs': False, 'room_id': None},
+            {'id': 2, 'section_id': 'B', 'num_students': 60, 'has_labs': True, 'room_id': None},
+            {'id': 3, 'section_id': 'C', 'num_students': 200, 'has_labs': False, 'room_id': None},
+        ]
+        assignment = optimal_assignment(needs, [self.lab, self.large])
+        self.assertEqual(assignment, {1: self.large, 2: self.lab, 3: None})
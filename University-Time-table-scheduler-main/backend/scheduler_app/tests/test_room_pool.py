@@ -0,0 +1,70 @@
+import datetime
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from scheduler_app.genetic_algorithm import GeneticAlgorithm, RoomSlotIndex, WEEKLY_ROOM_HOURS
+from scheduler_app.models import Department, Instructor, Room, MeetingTime, Course, Section
+
+
+class RoomPoolTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        MeetingTime.generate_default_slots()
+        self.department = Department.objects.create(name='Computer Science', code='CSE')
+        instructor = Instructor.objects.create(instructor_id='I1', name='Dr. Smith', email='smith@example.com')
+        self.small = Room.objects.create(room_number='101', capacity=30)
+        self.large = Room.objects.create(room_number='102', capacity=70)
+        self.lab = Room.objects.create(room_number='L1', capacity=70, room_type='Lab')
+        for code in ('A', 'B', 'C'):
+            section = Section.objects.create(
+                section_id=f'CSE-1{code}', department=self.department, year=1, semester=1, num_students=60
+            )
+            course = Course.objects.create(
+                course_id=f'CS10{code}', course_name=f'Course {code}', classes_per_week=3,
+                department=self.department, year=1, semester=1
+            )
+            course.instructors.add(instructor)
+            course.sections.add(section)
+
+    def _ga(self, room_mode):
+        return GeneticAlgorithm(
+            department_ids=[self.department.id], years=[1], semesters=[1], population_size=10,
+            generations=50, progress_bar=False, room_mode=room_mode
+        )
+
+    def test_pool_mode_shares_compatible_rooms_without_clashes(self):
+        ga = self._ga('pool')
+        for individual in ga.generate_initial_population():
+            # Only the theory room seating 60 qualifies, so classes spread over time instead of rooms
+            self.assertEqual({class_obj['room'] for class_obj in individual}, {self.large})
+            index = RoomSlotIndex()
+            for class_obj in individual:
+                self.assertTrue(index.is_free(class_obj['room'], class_obj))
+                index.add(class_obj)
+
+        utilisation = ga.room_utilisation(individual)
+        self.assertEqual(utilisation['rooms_used'], 1)
+        self.assertEqual(utilisation['per_room'], {'102': round(100 * 9 / WEEKLY_ROOM_HOURS, 1)})
+        self.assertEqual(utilisation['overall'], round(100 * 9 / (3 * WEEKLY_ROOM_HOURS), 1))
+
+    def test_section_mode_pins_rooms_per_section(self):
+        ga = self._ga('section')
+        individual = ga.generate_initial_population()[0]
+        self.assertEqual(ga.room_utilisation(individual)['room_mode'], 'section')
+        with self.assertRaises(ValueError):
+            self._ga('shared')
+
+    def test_index_detects_overlap_across_shifted_slots(self):
+        # A two-hour class from 13:45 overlaps a class starting at 14:45 but not one ending at 13:45
+        lab_class = {'room': self.lab, 'duration': 2,
+                     'meeting_time': MeetingTime.objects.get(day='Monday', start_time=datetime.time(13, 45))}
+        index = RoomSlotIndex([lab_class])
+        later = {'meeting_time': MeetingTime.objects.get(day='Monday', start_time=datetime.time(14, 45)), 'duration': 1}
+        morning = {'meeting_time': MeetingTime.objects.get(day='Monday', start_time=datetime.time(12, 0)), 'duration': 1}
+        self.assertFalse(index.is_free(self.lab, later))
+        self.assertTrue(index.is_free(self.lab, morning))
+        self.assertTrue(index.is_free(self.large, later))
+
+        index.remove(lab_class)
+        self.assertTrue(index.is_free(self.lab, later))
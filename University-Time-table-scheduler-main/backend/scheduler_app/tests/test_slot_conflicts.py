@@ -0,0 +1,210 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from scheduler_app.models import (
+    Department, Instructor, Room, MeetingTime, Course, Section, Class, Timetable
+)
+from scheduler_app.slot_template import SlotTemplate
+from scheduler_app.utils import check_slot_conflicts
+
+
+class SlotMoveTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='planner', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+
+        MeetingTime.generate_default_slots()
+        self.department = Department.objects.create(name='Computer Science', code='CSE')
+        self.instructor = Instructor.objects.create(instructor_id='I1', name='Dr. Smith', email='smith@example.com')
+        self.room = Room.objects.create(room_number='101', capacity=60)
+        self.section = Section.objects.create(section_id='CSE-1A', department=self.department, year=1, semester=1)
+        self.theory = Course.objects.create(
+            course_id='CS101', course_name='Introduction to Programming',
+            department=self.department, year=1, semester=1
+        )
+        self.lab = Course.objects.create(
+            course_id='CS101L', course_name='Programming Lab', course_type='Lab', duration=2,
+            department=self.department, year=1, semester=1
+        )
+        self.timetable = Timetable.objects.create(name='CSE Year 1', department=self.department, year=1, semester=1)
+        self.theory_class = self._add_class('CSE-1A_CS101_0', self.theory, 'Monday', '09:00')
+        self.lab_class = self._add_class('CSE-1A_CS101L_0', self.lab, 'Tuesday', '10:00')
+
+    def _add_class(self, class_id, course, day, start_time):
+        class_obj = Class.objects.create(
+            class_id=class_id, course=course, instructor=self.instructor, room=self.room, section=self.section,
+            meeting_time=MeetingTime.objects.get(day=day, start_time=start_time)
+        )
+        self.timetable.classes.add(class_obj)
+        return class_obj
+
+    def _move(self, class_obj, day, time_slot):
+        return self.client.patch(
+            reverse('class-update-slot'), {'class_id': class_obj.class_id, 'day': day, 'time_slot': time_slot},
+            format='json'
+        )
+
+
+class SlotConflictTest(SlotMoveTestCase):
+    def test_reports_every_conflict_type(self):
+        response = self._move(self.theory_class, 'Tuesday', '11:00-12:00')
+        self.assertEqual(response.status_code, 409)
+        conflicts = response.data['conflicts']
+        self.assertEqual([conflict['type'] for conflict in conflicts], ['instructor', 'room', 'section'])
+        self.assertEqual({conflict['class_id'] for conflict in conflicts}, {self.lab_class.class_id})
+        self.assertEqual(conflicts[0]['time'], '10:00-11:00')
+
+    def test_multi_hour_move_checks_every_occupied_hour(self):
+        conflicts = check_slot_conflicts(
+            self.timetable, 'Friday', datetime.time(9, 0), self.instructor.id, self.room.id, self.section.id,
+            exclude_class_id=self.lab_class.class_id, duration=2
+        )
+        self.assertEqual(conflicts, [])
+
+        self._add_class('CSE-1A_CS101_1', self.theory, 'Friday', '10:00')
+        self.timetable.save(update_fields=['updated_at'])
+        conflicts = check_slot_conflicts(
+            self.timetable, 'Friday', datetime.time(9, 0), self.instructor.id, self.room.id, self.section.id,
+            exclude_class_id=self.lab_class.class_id, duration=2
+        )
+        self.assertEqual({conflict['class_id'] for conflict in conflicts}, {'CSE-1A_CS101_1'})
+
+    def test_index_is_cached_and_follows_moves(self):
+        with self.assertNumQueries(1):
+            check_slot_conflicts(self.timetable, 'Friday', datetime.time(9, 0), 0, 0, 0)
+        with self.assertNumQueries(0):
+            check_slot_conflicts(self.timetable, 'Friday', datetime.time(9, 0), 0, 0, 0)
+
+        response = self._move(self.theory_class, 'Wednesday', '09:00-10:00')
+        self.assertEqual(response.status_code, 200)
+
+        # The moved class now blocks Wednesday and no longer blocks Monday
+        self.timetable.refresh_from_db()
+        with self.assertNumQueries(0):
+            blocked = check_slot_conflicts(
+                self.timetable, 'Wednesday', datetime.time(9, 0), self.instructor.id, 0, 0
+            )
+            freed = check_slot_conflicts(
+                self.timetable, 'Monday', datetime.time(9, 0), self.instructor.id, 0, 0
+            )
+        self.assertEqual([conflict['class_id'] for conflict in blocked], [self.theory_class.class_id])
+        self.assertEqual(freed, [])
+
+
+class SlotAvailabilityConflictTest(SlotMoveTestCase):
+    def test_moves_into_blocked_hours_or_past_daily_limit_are_rejected(self):
+        self.instructor.unavailable_slots = SlotTemplate().encode_blocked(['Friday 09:00'])
+        self.instructor.max_hours_per_day = 2
+        self.instructor.save()
+
+        conflicts = check_slot_conflicts(
+            self.timetable, 'Friday', datetime.time(9, 0), self.instructor.id, 0, 0,
+            exclude_class_id=self.theory_class.class_id
+        )
+        self.assertEqual([conflict['type'] for conflict in conflicts], ['availability'])
+        self.assertEqual(conflicts[0]['course'], 'Introduction to Programming')
+
+        # The two-hour lab already fills Tuesday, so another hour there breaks the limit
+        response = self._move(self.theory_class, 'Tuesday', '14:00-15:00')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual([conflict['type'] for conflict in response.data['conflicts']], ['max_hours'])
+
+        response = self._move(self.theory_class, 'Friday', '10:00-11:00')
+        self.assertEqual(response.status_code, 200)
+
+    def test_classes_outside_a_timetable_still_respect_availability(self):
+        self.instructor.unavailable_slots = SlotTemplate().encode_blocked(['Friday'])
+        self.instructor.save()
+        self.timetable.classes.clear()
+
+        conflicts = check_slot_conflicts(None, 'Friday', datetime.time(9, 0), self.instructor.id, self.room.id, self.section.id)
+        self.assertEqual([conflict['type'] for conflict in conflicts], ['availability'])
+        response = self.client.patch(reverse('class-update-slots'), {'moves': [
+            {'class_id': self.theory_class.class_id, 'day': 'Friday', 'time_slot': '10:00-11:00'}
+        ]}, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self._move(self.theory_class, 'Thursday', '10:00-11:00').status_code, 200)
+
+
+class BatchSlotMoveTest(SlotMoveTestCase):
+    def _move_batch(self, moves):
+        return self.client.patch(reverse('class-update-slots'), {'moves': moves}, format='json')
+
+    def test_swapping_two_classes_is_applied_atomically(self):
+        # Each move alone would clash with the other class's current slot
+        response = self._move_batch([
+            {'class_id': self.theory_class.class_id, 'day': 'Tuesday', 'time_slot': '10:00-11:00'},
+            {'class_id': self.lab_class.class_id, 'day': 'Monday', 'time_slot': '09:00-10:00'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.theory_class.refresh_from_db()
+        self.lab_class.refresh_from_db()
+        self.assertEqual((self.theory_class.meeting_time.day, self.theory_class.meeting_time.start_time),
+                         ('Tuesday', datetime.time(10, 0)))
+        self.assertEqual(self.lab_class.meeting_time.day, 'Monday')
+
+    def test_clash_between_moves_rejects_whole_batch(self):
+        response = self._move_batch([
+            {'class_id': self.lab_class.class_id, 'day': 'Thursday', 'time_slot': '09:00-10:00'},
+            {'class_id': self.theory_class.class_id, 'day': 'Thursday', 'time_slot': '10:00-11:00'},
+        ])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(
+            {(conflict['moved_class_id'], conflict['class_id']) for conflict in response.data['conflicts']},
+            {(self.theory_class.class_id, self.lab_class.class_id)}
+        )
+        self.assertEqual(len(response.data['conflicts']), 3)
+
+        self.lab_class.refresh_from_db()
+        self.assertEqual(self.lab_class.meeting_time.day, 'Tuesday')
+
+    def test_unknown_class_is_rejected(self):
+        response = self._move_batch([{'class_id': 'missing', 'day': 'Monday', 'time_slot': '09:00-10:00'}])
+        self.assertEqual(response.status_code, 404)
+
+    def test_malformed_moves_are_rejected(self):
+        for moves in (['CSE-1A_CS101_0'], [{'class_id': 'CSE-1A_CS101_0', 'day': 'Monday', 'time_slot': 900}]):
+            self.assertEqual(self._move_batch(moves).status_code, 400)
+
+
+class FreeSlotTest(SlotMoveTestCase):
+    def test_lists_clash_free_slots_ranked_by_soft_penalty(self):
+        response = self.client.get(reverse('class-free-slots', args=[self.lab_class.class_id]))
+        self.assertEqual(response.status_code, 200)
+        slots = response.data['free_slots']
+        starts = {(slot['day'], slot['start_time']) for slot in slots}
+
+        # Monday 09:00 clashes with the theory class, labs never start at 12:00 or run past 17:00
+        self.assertNotIn(('Monday', '09:00'), starts)
+        self.assertIn(('Monday', '10:00'), starts)
+        self.assertFalse(any(start in ('12:00', '15:45') for _, start in starts))
+        self.assertIn(('Tuesday', '10:00'), {(slot['day'], slot['start_time']) for slot in slots if slot['is_current']})
+
+        self.assertEqual([slot['penalty'] for slot in slots], sorted(slot['penalty'] for slot in slots))
+        before_lunch = next(slot for slot in slots if slot['day'] == 'Monday' and slot['start_time'] == '11:00')
+        self.assertEqual(before_lunch['time_slot'], '11:00-13:00')
+        self.assertGreaterEqual(before_lunch['penalty'], 100)
+
+    def test_suggested_slot_is_accepted_by_update_slot(self):
+        response = self.client.get(reverse('class-free-slots', args=[self.theory_class.class_id]))
+        best = response.data['free_slots'][0]
+        moved = self._move(self.theory_class, best['day'], best['time_slot'])
+        self.assertEqual(moved.status_code, 200)
+
+    def test_class_outside_a_timetable_keeps_its_instructors_blocked_hours(self):
+        self.instructor.unavailable_slots = SlotTemplate().encode_blocked(['Monday', 'Wednesday 10:00'])
+        self.instructor.save()
+        self.timetable.classes.remove(self.theory_class)
+
+        response = self.client.get(reverse('class-free-slots', args=[self.theory_class.class_id]))
+        starts = {(slot['day'], slot['start_time']) for slot in response.data['free_slots']}
+        self.assertFalse(any(day == 'Monday' for day, _ in starts))
+        self.assertNotIn(('Wednesday', '10:00'), starts)
+        self.assertIn(('Wednesday', '11:00'), starts)
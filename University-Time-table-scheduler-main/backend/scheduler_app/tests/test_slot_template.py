@@ -0,0 +1,45 @@
+import datetime
+
+from django.test import TestCase
+
+from scheduler_app.models import MeetingTime
+from scheduler_app.slot_template import SlotTemplate
+from scheduler_app.timetable_grid import EXPORT_DAYS, LUNCH_TIME_SLOT, STANDARD_TIME_SLOTS
+
+
+class SlotTemplateTest(TestCase):
+    def test_default_slots_are_created_in_one_insert(self):
+        with self.assertNumQueries(2):
+            created = MeetingTime.generate_default_slots()
+        self.assertEqual(created, 74)
+        self.assertEqual(MeetingTime.objects.filter(is_lunch_break=True).count(), 5)
+        self.assertTrue(MeetingTime.objects.filter(pid='MT-MON-1345', end_time=datetime.time(14, 45)).exists())
+        self.assertFalse(MeetingTime.objects.filter(day='Saturday', start_time=datetime.time(13, 45)).exists())
+
+    def test_generation_is_idempotent(self):
+        MeetingTime.objects.filter(pid='MT-TUE-LUNCH').delete()
+        MeetingTime.generate_default_slots()
+        with self.assertNumQueries(1):
+            self.assertEqual(MeetingTime.generate_default_slots(), 0)
+        self.assertEqual(MeetingTime.objects.count(), 74)
+
+    def test_default_grid_matches_rendered_columns(self):
+        template = SlotTemplate()
+        self.assertEqual(template.grid_time_slots(), STANDARD_TIME_SLOTS)
+        self.assertEqual(template.lunch_time_slot(), LUNCH_TIME_SLOT)
+
+    def test_custom_template(self):
+        template = SlotTemplate(
+            days=['Monday', 'Tuesday'], lunch_days=['Monday'], teaching_days=['Monday', 'Friday'],
+            first_start='08:00', last_end='12:00',
+            lunch=('12:00', '12:30'), post_lunch_starts=['12:30']
+        )
+        self.assertEqual(
+            [(pid, start.strftime('%H:%M')) for pid, day, start, _, _ in template.meeting_slots() if day == 'Monday'],
+            [('MT-MON-0800', '08:00'), ('MT-MON-0900', '09:00'), ('MT-MON-1000', '10:00'), ('MT-MON-1100', '11:00'),
+             ('MT-MON-LUNCH', '12:00'), ('MT-MON-1230', '12:30')]
+        )
+        self.assertEqual(template.grid_time_slots()[-2:], ['12:00:00-12:30:00', '12:30:00-13:30:00'])
+        self.assertEqual(template.post_lunch_start, datetime.time(12, 30))
+        self.assertEqual(template.teaching_days, ['Monday'])
+        self.assertEqual(EXPORT_DAYS, ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday'])
@@ -0,0 +1,36 @@
+import json
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from scheduler_app.models import Department, Course
+from scheduler_app.serializers import CourseSerializer
+from scheduler_app.streaming import stream_serialized
+
+
+class StreamingCourseListTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.department = Department.objects.create(name='Computer Science', code='CSE')
+        for n in range(5):
+            Course.objects.create(course_id=f'CS10{n}', course_name=f'Course {n}', department=self.department)
+
+    def test_all_courses_stream_as_json_array(self):
+        response = self.client.get('/api/courses/get_all_courses/')
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        courses = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(courses, CourseSerializer(Course.objects.all(), many=True).data)
+
+    def test_ndjson_output(self):
+        response = self.client.get('/api/courses/get_all_courses/', {'output': 'ndjson'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['course_id'] for line in lines], [f'CS10{n}' for n in range(5)])
+
+    def test_chunks_join_into_valid_json(self):
+        chunks = list(stream_serialized(Course.objects.all(), CourseSerializer(), chunk_size=2))
+        # '[', three chunks of at most two rows, ']'
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual(len(json.loads(b''.join(chunks))), 5)
+        self.assertEqual(json.loads(b''.join(stream_serialized(Course.objects.none(), CourseSerializer()))), [])
@@ -0,0 +1,183 @@
+import zipfile
+from io import BytesIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from openpyxl import load_workbook
+from rest_framework.test import APIClient
+
+from scheduler_app.models import (
+    Department, Instructor, Room, MeetingTime, Course, Section, Class, Timetable
+)
+
+
+class TimetableExportTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='planner', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+
+        MeetingTime.generate_default_slots()
+        self.department = Department.objects.create(name='Computer Science', code='CSE')
+        self.instructor = Instructor.objects.create(instructor_id='I1', name='Dr. Smith', email='smith@example.com')
+        self.room = Room.objects.create(room_number='101', capacity=60)
+        self.section = Section.objects.create(section_id='CSE-1A', department=self.department, year=1, semester=1)
+        self.course = Course.objects.create(
+            course_id='CS101', course_name='Introduction to Programming',
+            department=self.department, year=1, semester=1
+        )
+        self.class_obj = Class.objects.create(
+            class_id='CSE-1A_CS101_0',
+            course=self.course,
+            instructor=self.instructor,
+            room=self.room,
+            section=self.section,
+            meeting_time=MeetingTime.objects.get(day='Monday', start_time='09:00')
+        )
+        self.timetable = Timetable.objects.create(
+            name='CSE Year 1', department=self.department, year=1, semester=1
+        )
+        self.timetable.classes.add(self.class_obj)
+
+
+@override_settings(EXPORT_PRERENDER_IN_BACKGROUND=False)
+class ExportArtifactCacheTest(TimetableExportTestCase):
+    def test_pdf_download_is_rendered_once_and_revalidated_with_etag(self):
+        url = reverse('timetable-export-pdf', args=[self.timetable.id])
+        with mock.patch.dict(
+            'scheduler_app.export_cache.EXPORT_RENDERERS', {'pdf': mock.Mock(return_value=b'%PDF-1.4 test')}
+        ) as renderers:
+            first = self.client.get(url)
+            second = self.client.get(url)
+            self.assertEqual(renderers['pdf'].call_count, 1)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.content, b'%PDF-1.4 test')
+        self.assertEqual(first['ETag'], second['ETag'])
+
+        not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_slot_edit_invalidates_cached_artifacts(self):
+        url = reverse('timetable-export-excel', args=[self.timetable.id])
+        etag = self.client.get(url)['ETag']
+
+        response = self.client.patch(reverse('class-update-slot'), {
+            'class_id': self.class_obj.class_id,
+            'day': 'Tuesday',
+            'time_slot': '10:00-11:00',
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        refreshed = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(refreshed.status_code, 200)
+        self.assertNotEqual(refreshed['ETag'], etag)
+
+    def test_renaming_a_printed_row_changes_the_artifact(self):
+        url = reverse('timetable-export-pdf', args=[self.timetable.id])
+        etag = self.client.get(url)['ETag']
+        for obj, field, value in ((self.course, 'course_name', 'Programming I'), (self.instructor, 'name', 'Dr. Jones'),
+                                  (self.room, 'room_number', '102')):
+            setattr(obj, field, value)
+            obj.save()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+            etag = response['ETag']
+
+    def test_activation_prerenders_every_format(self):
+        renderers = {'pdf': mock.Mock(return_value=b'pdf'), 'excel': mock.Mock(return_value=b'xlsx')}
+        with mock.patch.dict('scheduler_app.export_cache.EXPORT_RENDERERS', renderers):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(reverse('timetable-activate', args=[self.timetable.id]))
+            self.assertEqual(response.status_code, 200)
+            renderers['pdf'].assert_called_once()
+            renderers['excel'].assert_called_once()
+
+            # Downloads after activation are served from the pre-rendered store
+            self.client.get(reverse('timetable-export-pdf', args=[self.timetable.id]))
+            renderers['pdf'].assert_called_once()
+
+
+class StreamingExcelExportTest(TimetableExportTestCase):
+    def test_streaming_excel_export_writes_one_sheet_per_section(self):
+        other_section = Section.objects.create(section_id='CSE-1B', department=self.department, year=1, semester=1)
+        other_class = Class.objects.create(
+            class_id='CSE-1B_CS101_0',
+            course=self.course,
+            instructor=self.instructor,
+            room=self.room,
+            section=other_section,
+            meeting_time=MeetingTime.objects.get(day='Friday', start_time='14:45')
+        )
+        self.timetable.classes.add(other_class)
+
+        response = self.client.get(reverse('timetable-export-excel', args=[self.timetable.id]), {'stream': 'true'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+
+        workbook = load_workbook(BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(workbook.sheetnames, ['CSE-1A', 'CSE-1B', 'Instructor Information'])
+        rows = list(workbook['CSE-1B'].iter_rows(values_only=True))
+        self.assertEqual(rows[2], ('Time', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday'))
+        self.assertEqual(rows[9][5], 'ITP\nDr. Smith')
+
+
+@override_settings(EXPORT_BUNDLE_WORKERS=1)
+class BundleExportTest(TimetableExportTestCase):
+    def setUp(self):
+        super().setUp()
+        other_section = Section.objects.create(section_id='CSE-1B', department=self.department, year=1, semester=1)
+        self.other_class = Class.objects.create(
+            class_id='CSE-1B_CS101_0',
+            course=self.course,
+            instructor=self.instructor,
+            room=self.room,
+            section=other_section,
+            meeting_time=MeetingTime.objects.get(day='Friday', start_time='14:45')
+        )
+        self.timetable.classes.add(self.other_class)
+        self.url = reverse('timetable-export-bundle', args=[self.timetable.id])
+        # Page keys are content-addressed, so drop pages cached by earlier tests
+        caches['default'].clear()
+
+    def _download(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return zipfile.ZipFile(BytesIO(b''.join(response.streaming_content)))
+
+    def test_bundle_contains_section_and_instructor_pages(self):
+        bundle = self._download(instructors='true')
+        self.assertEqual(
+            bundle.namelist(),
+            ['sections/CSE-1A.pdf', 'sections/CSE-1B.pdf', 'instructors/Dr__Smith__I1.pdf']
+        )
+        self.assertTrue(bundle.read('sections/CSE-1A.pdf').startswith(b'%PDF'))
+
+    def test_sections_with_clashing_archive_names_get_distinct_paths(self):
+        for number, section_id in enumerate(('CSE 1C', 'CSE_1C')):
+            section = Section.objects.create(section_id=section_id, department=self.department, year=1, semester=1)
+            self.timetable.classes.add(Class.objects.create(
+                class_id=f'{section_id}_CS101_0', course=self.course, instructor=self.instructor, room=self.room,
+                section=section, meeting_time=MeetingTime.objects.get(day='Thursday', start_time='09:00')
+            ))
+        with mock.patch('scheduler_app.export_cache.render_page_pdf', return_value=b'%PDF-1.4 page'):
+            names = self._download().namelist()
+        self.assertEqual(names, ['sections/CSE_1C.pdf', 'sections/CSE-1A.pdf', 'sections/CSE-1B.pdf', 'sections/CSE_1C-2.pdf'])
+
+    def test_slot_edit_rerenders_only_affected_pages(self):
+        with mock.patch('scheduler_app.export_cache.render_page_pdf', return_value=b'%PDF-1.4 page') as render:
+            self._download(instructors='true')
+            self.assertEqual(render.call_count, 3)
+
+            self.other_class.meeting_time = MeetingTime.objects.get(day='Tuesday', start_time='10:00')
+            self.other_class.save()
+            render.reset_mock()
+            self._download(instructors='true')
+
+        # CSE-1A is untouched; CSE-1B and the shared instructor page change
+        rendered_headings = sorted(call.args[0]['heading'] for call in render.call_args_list)
+        self.assertEqual(rendered_headings, ['Timetable for CSE-1B (Room: 101)', 'Timetable for Dr. Smith (I1) (Room: 101)'])
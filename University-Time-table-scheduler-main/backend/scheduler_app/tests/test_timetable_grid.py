@@ -0,0 +1,48 @@
+import datetime
+
+from django.test import SimpleTestCase
+
+from scheduler_app.models import Instructor, Room, MeetingTime, Course, Section, Class
+from scheduler_app.timetable_grid import EXPORT_DAYS, STANDARD_TIME_SLOTS, build_timetable_grid, render_cell
+
+
+class TimetableGridTest(SimpleTestCase):
+    def setUp(self):
+        self.section = Section(id=1, section_id='CSE-1A', year=1, semester=1)
+        self.instructor = Instructor(id=1, instructor_id='I1', name='Dr. Smith', email='smith@example.com')
+        self.room = Room(id=1, room_number='101', capacity=60)
+
+    def _class(self, class_id, course, day, hour, minute=0):
+        meeting_time = MeetingTime(day=day, start_time=datetime.time(hour, minute), end_time=datetime.time(hour + 1, minute))
+        return Class(class_id=class_id, course=course, instructor=self.instructor, room=self.room,
+                     section=self.section, meeting_time=meeting_time)
+
+    def test_multi_hour_class_spans_following_slots(self):
+        lab = Course(id=1, course_id='CS101L', course_name='Programming Lab', course_type='Lab', duration=2)
+        theory = Course(id=2, course_id='CS102', course_name='Discrete Maths', duration=1)
+        grid = build_timetable_grid([
+            self._class('lab', lab, 'Monday', 10),
+            self._class('theory', theory, 'Monday', 14, 45),
+        ], days=EXPORT_DAYS)
+
+        section = grid.sections['CSE-1A']
+        self.assertEqual(section.covered['Monday'], [False, False, True, False, False, False, False, False])
+        self.assertEqual(render_cell(section, 'Monday', 1), "PL\nDr. Smith\n(10:00 - 12:00)")
+        self.assertEqual(render_cell(section, 'Monday', 2), "")
+        self.assertEqual(render_cell(section, 'Monday', 4), "LUNCH BREAK")
+        self.assertEqual(render_cell(section, 'Monday', 6), "DM\nDr. Smith")
+        self.assertEqual(len(section.schedule['Monday'][STANDARD_TIME_SLOTS[2]]), 1)
+
+    def test_legend_and_section_summaries_are_collected_in_the_same_pass(self):
+        course = Course(id=1, course_id='CS101', course_name='Introduction to Programming')
+        grid = build_timetable_grid([
+            self._class('a', course, 'Monday', 9),
+            self._class('b', course, 'Saturday', 9),
+        ], days=EXPORT_DAYS)
+
+        self.assertEqual(grid.course_legend(), [{'course_short': 'ITP', 'course': 'Introduction to Programming', 'instructors': ['Dr. Smith']}])
+        section = grid.sections['CSE-1A']
+        self.assertEqual(section.rooms, {'101'})
+        self.assertEqual(section.courses['CS101']['instructors'], {'Dr. Smith'})
+        # Saturday is not an export day, so only Monday has a cell
+        self.assertNotIn('Saturday', section.schedule)
@@ -0,0 +1,194 @@
+import datetime
+import re
+from functools import lru_cache
+
+from .slot_template import get_slot_template
+
+# Days rendered by the PDF/Excel exports (teaching days) and by the schedule view (every day)
+EXPORT_DAYS = get_slot_template().teaching_days
+SCHEDULE_DAYS = get_slot_template().days
+
+# Grid columns from the slot template: morning hours, lunch break, post-lunch slots
+STANDARD_TIME_SLOTS = get_slot_template().grid_time_slots()
+LUNCH_TIME_SLOT = get_slot_template().lunch_time_slot()
+
+_SLOT_INDEX = {time_slot: index for index, time_slot in enumerate(STANDARD_TIME_SLOTS)}
+
+
+@lru_cache(maxsize=4096)
+def abbreviate_course_name(course_name):
+    """Abbreviate course name by taking first letter of each word."""
+    if not course_name:
+        return "UNK"  # Unknown if no name
+    words = re.findall(r'\b\w+\b', course_name)
+    if not words:
+        return course_name.upper()[:3]  # Fallback to first 3 chars
+    return ''.join(word[0].upper() for word in words)
+
+
+@lru_cache(maxsize=256)
+def hourly_slots(start_time, duration_hours):
+    """'HH:MM:SS-HH:MM:SS' keys of each hour a class starting at start_time occupies."""
+    slots = []
+    for i in range(duration_hours):
+        slot_start = datetime.time(hour=(start_time.hour + i) % 24, minute=start_time.minute)
+        slot_end = datetime.time(hour=(slot_start.hour + 1) % 24, minute=slot_start.minute)
+        slots.append(f"{slot_start}-{slot_end}")
+    return tuple(slots)
+
+
+def slot_label(time_slot):
+    """Header label for a time slot, e.g. '09:00-10:00' or '13:00-13:45 (LUNCH)'."""
+    start, end = time_slot.split('-')
+    return f"{start[:5]}-{end[:5]}" + (" (LUNCH)" if time_slot == LUNCH_TIME_SLOT else "")
+
+
+class SectionGrid:
+    """
+    Schedule of a single section (or of one instructor, for instructor-grouped grids).
+
+    `schedule[day][time_slot]` lists the hourly entries of every class touching
+    that slot, and `covered[day][i]` is True when standard slot `i` continues a
+    multi-hour class that started in an earlier slot (the colspan "skip").
+    """
+
+    __slots__ = ('section_id', 'rooms', 'schedule', 'covered', 'courses', 'instructors', 'class_ids')
+
+    def __init__(self, section_id, days):
+        self.section_id = section_id
+        self.rooms = set()
+        self.schedule = {day: {} for day in days}
+        self.covered = {day: [False] * len(STANDARD_TIME_SLOTS) for day in days}
+        self.courses = {}
+        self.instructors = {}
+        self.class_ids = set()
+
+
+# How classes are grouped into pages: one per section, or one per instructor
+GROUP_KEYS = {
+    'section': lambda cls: cls.section.section_id,
+    'instructor': lambda cls: f"{cls.instructor.name} ({cls.instructor.instructor_id})",
+}
+
+
+class TimetableGrid:
+    """Section x day x slot view of a timetable, built in a single pass over its classes."""
+
+    def __init__(self, days=SCHEDULE_DAYS, group_by='section'):
+        self.days = days
+        self.group_key = GROUP_KEYS[group_by]
+        self.sections = {}
+        self.legend = {}
+
+    def add_class(self, cls):
+        section_id = cls.section.section_id
+        group_id = self.group_key(cls)
+        section = self.sections.get(group_id)
+        if section is None:
+            section = self.sections[group_id] = SectionGrid(group_id, self.days)
+        if cls.class_id in section.class_ids:
+            return
+        section.class_ids.add(cls.class_id)
+        section.rooms.add(cls.room.room_number)
+
+        course = cls.course
+        instructor = cls.instructor
+
+        # Course legend shared by the exports
+        key = abbreviate_course_name(course.course_name)
+        if key not in self.legend:
+            self.legend[key] = {'course_short': key, 'course': course.course_name, 'instructors': set()}
+        self.legend[key]['instructors'].add(instructor.name)
+
+        # Per-section course and instructor summaries used by the schedule view
+        if course.course_id not in section.courses:
+            section.courses[course.course_id] = {'course_code': course.course_id, 'course_name': course.course_name, 'instructors': set()}
+        section.courses[course.course_id]['instructors'].add(instructor.name)
+        if instructor.id not in section.instructors:
+            section.instructors[instructor.id] = {'name': instructor.name, 'email': instructor.email, 'courses': set()}
+        section.instructors[instructor.id]['courses'].add(course.course_name)
+
+        day = cls.meeting_time.day
+        if day not in section.schedule:
+            return
+        day_schedule = section.schedule[day]
+        duration_hours = getattr(course, 'duration', 1)
+        start_time = cls.meeting_time.start_time
+
+        # For multi-hour classes, split into individual 1-hour slots
+        time_slots = hourly_slots(start_time, duration_hours)
+        for i, time_slot in enumerate(time_slots):
+            is_start = (i == 0)
+            day_schedule.setdefault(time_slot, []).append({
+                'class_id': cls.class_id,
+                'course': course.course_name,
+                'course_id': course.course_id,
+                'instructor': instructor.name,
+                'room': cls.room.room_number,
+                'section': section_id,
+                'course_type': course.course_type,
+                'duration': duration_hours,
+                'is_start': is_start,
+                'colspan': duration_hours if is_start else 1
+            })
+
+        # Precompute which later standard slots this class spans
+        start_index = _SLOT_INDEX.get(time_slots[0]) if time_slots else None
+        if start_index is not None and duration_hours > 1:
+            covered = section.covered[day]
+            for index in range(start_index + 1, min(start_index + duration_hours, len(covered))):
+                covered[index] = True
+
+    def course_legend(self):
+        return [{
+            'course_short': item['course_short'],
+            'course': item['course'],
+            'instructors': sorted(item['instructors'])
+        } for item in self.legend.values()]
+
+
+def build_timetable_grid(classes, days=SCHEDULE_DAYS, group_by='section'):
+    """Expand classes (with course, instructor, room, meeting_time and section loaded) into a TimetableGrid."""
+    grid = TimetableGrid(days, group_by=group_by)
+    for cls in classes:
+        grid.add_class(cls)
+    return grid
+
+
+def render_cell(section, day, slot_index, detail='instructor'):
+    """
+    Text of one export cell: lunch marker, empty colspan continuation, or the classes in that slot.
+    `detail` is the entry field printed under each course ('instructor', or 'section' on instructor pages).
+    """
+    time_slot = STANDARD_TIME_SLOTS[slot_index]
+    if time_slot == LUNCH_TIME_SLOT:
+        return "LUNCH BREAK"
+    if section.covered[day][slot_index]:
+        return ""
+
+    day_classes = section.schedule[day].get(time_slot, [])
+    # A multi-hour class starting here gets its full time range printed
+    has_multi_hour_class = any(cls['is_start'] and cls['colspan'] > 1 for cls in day_classes)
+
+    cell_content_lines = []
+    for cls in day_classes:
+        cell_content_lines.append(abbreviate_course_name(cls['course']))
+        cell_content_lines.append(cls[detail])
+        if has_multi_hour_class and cls['is_start']:
+            end_slot = STANDARD_TIME_SLOTS[min(slot_index + cls['colspan'] - 1, len(STANDARD_TIME_SLOTS) - 1)]
+            cell_content_lines.append(f"({time_slot.split('-')[0][:5]} - {end_slot.split('-')[1][:5]})")
+        cell_content_lines.append("")
+    return "\n".join(cell_content_lines).strip()
+
+
+def section_heading(section):
+    """Page heading with the rooms used, e.g. 'Timetable for CSE-1A (Room: 101)'."""
+    return f"Timetable for {section.section_id} (Room: {', '.join(sorted(section.rooms))})"
+
+
+def schedule_table_data(section, detail='instructor'):
+    """Rows of the day x slot table printed on a PDF page, header row first."""
+    table_data = [['Day'] + [slot_label(slot) for slot in STANDARD_TIME_SLOTS]]
+    for day in section.schedule:
+        table_data.append([day] + [render_cell(section, day, slot_index, detail) for slot_index in range(len(STANDARD_TIME_SLOTS))])
+    return table_data
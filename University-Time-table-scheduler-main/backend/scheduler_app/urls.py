@@ -41,6 +41,12 @@ urlpatterns = [
     # Optional profile endpoint
     path('auth/profile/', views.UserProfileView.as_view(), name='user_profile'),
 
+    # Reference-data cache hit/miss counters (staff only)
+    path('cache/stats/', views.cache_statistics, name='cache_statistics'),
+
+    # Bulk curriculum import (staff only)
+    path('curriculum/import/', views.import_curriculum, name='import_curriculum'),
+
     # Change password endpoint
     path('auth/change-password/', views.ChangePasswordView.as_view(), name='change_password'),
 ]
@@ -1,12 +1,16 @@
 # backend/scheduler_app/views.py
 from rest_framework import viewsets, status, permissions
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import action, api_view, parser_classes, permission_classes
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.http import HttpResponse
+from django.http import HttpResponse, FileResponse
 from django.contrib.auth.models import User
 from django.db import transaction
+from django.db.models import Count, OuterRef, Prefetch, Subquery
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils import timezone
 import json
 import logging
 import uuid
@@ -18,7 +22,26 @@ from .models import (
 )
 from .serializers import *
 from .genetic_algorithm import GeneticAlgorithm
-from .utils import export_timetable_pdf, export_timetable_excel, check_instructor_conflicts, check_slot_conflicts
+from .timetable_grid import SCHEDULE_DAYS, build_timetable_grid
+from .utils import (
+    export_timetable_excel_stream,
+    check_instructor_conflicts, check_slot_conflicts
+)
+from .caching import ReferenceCacheMixin, cache_stats
+from .checkpoints import checkpoint_exists, discard_checkpoint, list_checkpoints
+from .conditional import ConditionalListMixin
+from .importers import (
+    CourseInstructorImporter, CurriculumImporter, ImportFormatError, InstructorImporter, RoomImporter, import_file
+)
+from .pagination import OptionalCursorPagination
+from .streaming import streaming_json_response
+from .occupancy import (
+    WEEKDAYS, TimetableOccupancy, class_details, get_timetable_occupancy, store_timetable_occupancy, suggest_free_slots
+)
+from .export_cache import (
+    export_artifact_etag, export_timetable_bundle, get_export_artifact, invalidate_export_artifacts,
+    schedule_export_prerender
+)
 
 logger = logging.getLogger(__name__)
 
@@ -62,23 +85,54 @@ class ChangePasswordView(APIView):
 # ----------------------------------------
 # ✅ Scheduler App Endpoints
 # ----------------------------------------
-class InstructorViewSet(viewsets.ModelViewSet):
-    queryset = Instructor.objects.all()
+class InstructorViewSet(ConditionalListMixin, ReferenceCacheMixin, viewsets.ModelViewSet):
+    queryset = Instructor.objects.prefetch_related(
+        Prefetch('courses_teaching', queryset=Course.objects.only('id', 'course_name'))
+    )
     serializer_class = InstructorSerializer
     permission_classes = [permissions.IsAuthenticated]
+    conditional_dependencies = (Course,)
+    cache_models = (Instructor, Course)
+
+    @action(detail=False, methods=['post'], url_path='bulk-upload', parser_classes=[MultiPartParser])
+    def bulk_upload(self, request):
+        """
+        Create or update instructors from a CSV/JSON/XLSX `file`
+        (instructor_id, name, email, is_available). ?file_format= overrides the format
+        taken from the file name; ?dry_run=true only validates.
+        """
+        return _import_upload(request, InstructorImporter(dry_run=_query_flag(request, 'dry_run')))
 
 
-class RoomViewSet(viewsets.ModelViewSet):
+class RoomViewSet(ConditionalListMixin, ReferenceCacheMixin, viewsets.ModelViewSet):
     queryset = Room.objects.all()
     serializer_class = RoomSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    @action(detail=False, methods=['post'], url_path='bulk-upload', parser_classes=[MultiPartParser])
+    def bulk_upload(self, request):
+        """
+        Create or update rooms from a CSV/JSON/XLSX `file`
+        (room_number, capacity, room_type, is_available). ?file_format= overrides the format
+        taken from the file name; ?dry_run=true only validates.
+        """
+        return _import_upload(request, RoomImporter(dry_run=_query_flag(request, 'dry_run')))
 
-class MeetingTimeViewSet(viewsets.ModelViewSet):
+
+class MeetingTimeViewSet(ConditionalListMixin, ReferenceCacheMixin, viewsets.ModelViewSet):
     queryset = MeetingTime.objects.all().order_by('day', 'start_time')
     serializer_class = MeetingTimeSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = None  # no pagination for meeting-times listing
+    pagination_class = OptionalCursorPagination  # no pagination for meeting-times listing unless ?paginate=cursor
+
+    def list(self, request, *args, **kwargs):
+        if self.paginator.is_paginating(request):
+            return super().list(request, *args, **kwargs)
+        # Full listing: stream rows instead of building the whole payload in memory
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.conditional_response(
+            request, queryset, lambda: streaming_json_response(request, queryset, self.get_serializer())
+        )
 
     @action(detail=False, methods=['post'])
     def populate_default_slots(self, request):
@@ -95,23 +149,29 @@ class MeetingTimeViewSet(viewsets.ModelViewSet):
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class DepartmentViewSet(viewsets.ModelViewSet):
-    queryset = Department.objects.all()
+class DepartmentViewSet(ConditionalListMixin, ReferenceCacheMixin, viewsets.ModelViewSet):
+    queryset = Department.objects.select_related('head_of_department')
     serializer_class = DepartmentSerializer
     permission_classes = []
+    conditional_dependencies = (Instructor,)
+    cache_models = (Department, Instructor)
 
 
-class CourseViewSet(viewsets.ModelViewSet):
-    queryset = Course.objects.all()
+class CourseViewSet(ConditionalListMixin, viewsets.ModelViewSet):
+    queryset = Course.objects.select_related('department').prefetch_related(
+        Prefetch('sections', queryset=Section.objects.only('id', 'section_id')),
+        Prefetch('instructors', queryset=Instructor.objects.only('id', 'name', 'instructor_id'))
+    )
     serializer_class = CourseSerializer
     permission_classes = []
+    conditional_dependencies = (Department, Section, Instructor)
 
     def get_queryset(self):
         """
         Optionally filter by department (id) and year.
         Example: /api/courses/?department=1&year=2
         """
-        queryset = Course.objects.all()
+        queryset = super().get_queryset()
         department = self.request.query_params.get('department')
         year = self.request.query_params.get('year')
         if department:
@@ -128,11 +188,25 @@ class CourseViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def get_all_courses(self, request):
         """
-        Get all courses without pagination.
+        Get all courses without pagination, streamed as a JSON array
+        (or NDJSON with ?output=ndjson).
         """
-        queryset = Course.objects.all()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        queryset = self.queryset.all()
+        return self.conditional_response(
+            request, queryset, lambda: streaming_json_response(request, queryset, self.get_serializer())
+        )
+
+    @action(detail=False, methods=['post'], url_path='bulk-assign-instructors', parser_classes=[MultiPartParser])
+    def bulk_assign_instructors(self, request):
+        """
+        Link instructors to many courses from a CSV/JSON/XLSX `file`
+        (course_code, department_code, instructor_id or ";"-separated instructor_ids).
+        ?replace=true drops links of the listed courses that are not in the file; ?file_format= overrides
+        the format taken from the file name; ?dry_run=true only validates.
+        """
+        return _import_upload(request, CourseInstructorImporter(
+            replace=_query_flag(request, 'replace'), dry_run=_query_flag(request, 'dry_run')
+        ))
 
     @action(detail=True, methods=['post'], url_path='assign-instructors')
     def assign_instructors(self, request, pk=None):
@@ -159,13 +233,19 @@ class CourseViewSet(viewsets.ModelViewSet):
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class SectionViewSet(viewsets.ModelViewSet):
-    queryset = Section.objects.all()
+class SectionViewSet(ConditionalListMixin, viewsets.ModelViewSet):
+    queryset = Section.objects.select_related('department').prefetch_related(
+        'instructors',
+        Prefetch('courses', queryset=Course.objects.prefetch_related(
+            Prefetch('instructors', queryset=Instructor.objects.only('id', 'name', 'instructor_id'))
+        ))
+    )
     serializer_class = SectionSerializer
     permission_classes = []
+    conditional_dependencies = (Department, Course, Instructor)
 
     def get_queryset(self):
-        queryset = Section.objects.all()
+        queryset = super().get_queryset()
         department = self.request.query_params.get('department')
         year = self.request.query_params.get('year')
         if department:
@@ -230,6 +310,7 @@ class SectionViewSet(viewsets.ModelViewSet):
             section.courses.add(*courses)
 
         # Re-serialize to include updated instructor assignments
+        section._prefetched_objects_cache = {}
         serializer = self.get_serializer(section)
         return Response(serializer.data)
 
@@ -392,11 +473,56 @@ class SectionViewSet(viewsets.ModelViewSet):
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class ClassViewSet(viewsets.ModelViewSet):
-    queryset = Class.objects.all()
+class ClassViewSet(ConditionalListMixin, viewsets.ModelViewSet):
+    queryset = Class.objects.select_related('course', 'instructor', 'room', 'section', 'meeting_time')
     serializer_class = ClassSerializer
     permission_classes = [permissions.IsAuthenticated]
     lookup_field = 'class_id'  # Use class_id instead of pk for URL lookups
+    conditional_dependencies = (Course, Instructor, Room, Section, MeetingTime)
+
+    def perform_update(self, serializer):
+        class_obj = serializer.save()
+        for timetable in class_obj.timetables.all():
+            invalidate_export_artifacts(timetable)
+
+    def perform_destroy(self, instance):
+        timetables = list(instance.timetables.all())
+        instance.delete()
+        for timetable in timetables:
+            invalidate_export_artifacts(timetable)
+
+    @action(detail=True, methods=['get'])
+    def free_slots(self, request, class_id=None):
+        """
+        List every weekday slot this class can move to without an instructor, room or
+        section clash or an instructor availability breach, ranked by the GA's soft
+        penalties (lowest first).
+        """
+        class_obj = self.get_object()
+        timetable = class_obj.timetables.first()
+        occupancy = get_timetable_occupancy(timetable) if timetable is not None else TimetableOccupancy()
+        details = occupancy.classes.get(class_obj.class_id) or class_details(class_obj)
+        meeting_times = sorted(
+            MeetingTime.objects.filter(is_lunch_break=False, day__in=WEEKDAYS),
+            key=lambda mt: (WEEKDAYS.index(mt.day), mt.start_time)
+        )
+
+        slots = suggest_free_slots(occupancy, class_obj.class_id, details, class_obj.course, meeting_times)
+        return Response({
+            'class_id': class_obj.class_id,
+            'course': class_obj.course.course_name,
+            'duration': details['duration'],
+            'free_slots': slots
+        })
+
+    @staticmethod
+    def _parse_start_time(start_time_str):
+        # Try parsing with seconds first, then fallback to minutes only
+        try:
+            return datetime.datetime.strptime(start_time_str.strip(), '%H:%M:%S').time()
+        except ValueError:
+            # Fallback to HH:MM format
+            return datetime.datetime.strptime(start_time_str.strip(), '%H:%M').time()
 
     @action(detail=False, methods=['patch'])
     def update_slot(self, request):
@@ -432,12 +558,7 @@ class ClassViewSet(viewsets.ModelViewSet):
             start_time_str, end_time_str = time_slot.split('-')
             logger.info(f"Parsing time_slot: {time_slot}, start_time_str: {start_time_str}")
 
-            # Try parsing with seconds first, then fallback to minutes only
-            try:
-                start_time = datetime.datetime.strptime(start_time_str.strip(), '%H:%M:%S').time()
-            except ValueError:
-                # Fallback to HH:MM format
-                start_time = datetime.datetime.strptime(start_time_str.strip(), '%H:%M').time()
+            start_time = self._parse_start_time(start_time_str)
 
             # Find the meeting time that matches the day and start time
             meeting_time = MeetingTime.objects.get(
@@ -446,14 +567,17 @@ class ClassViewSet(viewsets.ModelViewSet):
             )
 
             # Check for conflicts before updating
+            timetables = list(class_obj.timetables.all())
+            timetable = timetables[0] if timetables else None  # The timetable this class belongs to
             conflicts = check_slot_conflicts(
-                timetable=class_obj.timetables.first(),  # Get the timetable this class belongs to
+                timetable=timetable,
                 new_day=day,
                 new_start_time=start_time,
                 instructor_id=class_obj.instructor_id,
                 room_id=class_obj.room_id,
                 section_id=class_obj.section_id,
-                exclude_class_id=class_obj.class_id
+                exclude_class_id=class_obj.class_id,
+                duration=class_obj.course.duration or 1
             )
 
             if conflicts:
@@ -478,6 +602,18 @@ class ClassViewSet(viewsets.ModelViewSet):
             class_obj.meeting_time = meeting_time
             class_obj.save()
 
+            # Move the class in the occupancy index (read before invalidation bumps updated_at)
+            occupancy = get_timetable_occupancy(timetable) if timetable is not None else None
+
+            # Cached PDF/Excel downloads no longer match the schedule
+            for affected in timetables:
+                invalidate_export_artifacts(affected)
+
+            # Keep the index warm for the next drag-and-drop move
+            if occupancy is not None:
+                occupancy.move_class(class_obj.class_id, day, meeting_time.start_time, meeting_time.end_time)
+                store_timetable_occupancy(timetable, occupancy)
+
             return Response({
                 'message': 'Class slot updated successfully',
                 'class_id': class_obj.class_id,
@@ -502,14 +638,174 @@ class ClassViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=False, methods=['patch'])
+    def update_slots(self, request):
+        """
+        Move several classes of one timetable at once.
+        Expected payload: { "moves": [{ "class_id": "...", "day": "Monday", "time_slot": "09:00-10:00" }, ...] }
+        The moves are checked together (including clashes among themselves) and either all
+        applied in one transaction or all rejected with 409 and the full conflict report.
+        """
+        moves = request.data.get('moves')
+        if not isinstance(moves, list) or not moves:
+            return Response({'error': 'moves must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+
+        parsed = []
+        for move in moves:
+            if not isinstance(move, dict):
+                return Response({'error': 'Each move must be an object'}, status=status.HTTP_400_BAD_REQUEST)
+            class_id, day, time_slot = move.get('class_id'), move.get('day'), move.get('time_slot')
+            if not all(isinstance(value, str) and value for value in (class_id, day, time_slot)):
+                return Response(
+                    {'error': 'Each move requires class_id, day and time_slot as strings'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            try:
+                start_time = self._parse_start_time(time_slot.split('-')[0])
+            except ValueError as e:
+                return Response({'error': f'Invalid time format: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
+            parsed.append((class_id, day, start_time))
+
+        class_ids = [class_id for class_id, _, _ in parsed]
+        if len(set(class_ids)) != len(class_ids):
+            return Response({'error': 'Each class can only be moved once per batch'}, status=status.HTTP_400_BAD_REQUEST)
+
+        def fetch_classes():
+            return {
+                cls.class_id: cls
+                for cls in Class.objects.filter(class_id__in=class_ids).select_related(
+                    'course', 'section', 'room', 'instructor', 'meeting_time'
+                )
+            }
+
+        classes = fetch_classes()
+        missing = [class_id for class_id in class_ids if class_id not in classes]
+        if missing:
+            return Response(
+                {'error': f"Classes not found: {', '.join(missing)}"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        meeting_times = {
+            (mt.day, mt.start_time): mt
+            for mt in MeetingTime.objects.filter(
+                day__in={day for _, day, _ in parsed}, start_time__in={start for _, _, start in parsed}
+            )
+        }
+        unknown = [f"{day} at {start.strftime('%H:%M')}" for _, day, start in parsed if (day, start) not in meeting_times]
+        if unknown:
+            return Response(
+                {'error': f"No meeting time found for {', '.join(unknown)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        timetable_ids = list(Timetable.objects.filter(classes__class_id__in=class_ids).values_list('id', flat=True).distinct())
+        if len(timetable_ids) > 1:
+            return Response(
+                {'error': 'All moved classes must belong to the same timetable'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with transaction.atomic():
+            timetable = None
+            if timetable_ids:
+                # Concurrent batches on one timetable queue here, so each checks the state the
+                # previous one committed: the index below is keyed on the locked row's updated_at
+                timetable = Timetable.objects.select_for_update().get(pk=timetable_ids[0])
+                classes = fetch_classes()
+
+            # Evaluate every move against one snapshot: lift all moved classes out,
+            # then place them one by one so clashes among the moves are caught too.
+            # Classes outside any timetable still get their instructors' availability checks.
+            occupancy = get_timetable_occupancy(timetable) if timetable is not None else TimetableOccupancy()
+            conflicts = []
+            lifted = {class_id: occupancy.remove_class(class_id) or class_details(classes[class_id]) for class_id in class_ids}
+            for class_id, day, start_time in parsed:
+                meeting_time = meeting_times[(day, start_time)]
+                details = dict(lifted[class_id], day=day, start_time=meeting_time.start_time, end_time=meeting_time.end_time)
+                occupancy.track_availability(details)
+                for conflict in occupancy.conflicts(day, start_time, details['duration'], details, exclude_class_id=class_id):
+                    conflict['moved_class_id'] = class_id
+                    conflicts.append(conflict)
+                occupancy.add_class(class_id, details)
+
+            if conflicts:
+                conflict_messages = [
+                    f"{conflict['type'].title()} conflict for {conflict['moved_class_id']}: {conflict['course']} "
+                    f"({conflict['section']}) at {conflict['day']} {conflict['time']}"
+                    for conflict in conflicts
+                ]
+                return Response(
+                    {
+                        'error': 'Cannot move classes due to conflicts',
+                        'conflicts': conflicts,
+                        'conflict_messages': conflict_messages
+                    },
+                    status=status.HTTP_409_CONFLICT
+                )
+
+            # bulk_update skips auto_now, so stamp updated_at explicitly
+            now = timezone.now()
+            for class_id, day, start_time in parsed:
+                classes[class_id].meeting_time = meeting_times[(day, start_time)]
+                classes[class_id].updated_at = now
+            Class.objects.bulk_update(list(classes.values()), ['meeting_time', 'updated_at'])
+
+            # Cached PDF/Excel downloads no longer match the schedule
+            if timetable is not None:
+                invalidate_export_artifacts(timetable)
+
+        # The snapshot already reflects the applied moves
+        if timetable is not None:
+            store_timetable_occupancy(timetable, occupancy)
 
-class TimetableViewSet(viewsets.ModelViewSet):
-    queryset = Timetable.objects.all()
+        return Response({
+            'message': f'{len(parsed)} class slots updated successfully',
+            'moves': [
+                {'class_id': class_id, 'new_day': day, 'new_start_time': start_time.strftime('%H:%M')}
+                for class_id, day, start_time in parsed
+            ]
+        })
+
+class TimetableViewSet(ConditionalListMixin, viewsets.ModelViewSet):
+    queryset = Timetable.objects.select_related('department').annotate(
+        created_by_user=Subquery(User.objects.filter(username=OuterRef('created_by')).values('username')[:1])
+    )
     serializer_class = TimetableSerializer
     permission_classes = []
+    conditional_dependencies = (Department, Class)
+
+    def _query_param_set(self, name):
+        value = self.request.query_params.get(name, '')
+        return {item.strip() for item in value.split(',') if item.strip()}
+
+    def _includes_classes(self):
+        """
+        Whether the response carries each timetable's classes. Lists are summaries unless
+        ?include=classes is passed or ?fields= names classes/classes_data.
+        """
+        fields = self._query_param_set('fields')
+        if fields:
+            return bool(fields & {'classes', 'classes_data'})
+        return self.action == 'retrieve' or 'classes' in self._query_param_set('include')
+
+    def get_serializer_class(self):
+        if self.action == 'list' and not self._includes_classes():
+            return TimetableSummarySerializer
+        return super().get_serializer_class()
 
     def get_queryset(self):
-        queryset = Timetable.objects.all()
+        queryset = super().get_queryset()
+        if self.action in ('list', 'retrieve'):
+            # Meta.ordering is not applied to aggregate queries, so restate it
+            queryset = queryset.annotate(classes_count=Count('classes', distinct=True)).order_by('-created_at')
+            if self._includes_classes():
+                # Serialized classes_data needs every class with its relations
+                queryset = queryset.prefetch_related(
+                    Prefetch('classes', queryset=Class.objects.select_related(
+                        'course', 'instructor', 'room', 'section', 'meeting_time'
+                    ))
+                )
         department = self.request.query_params.get('department')
         year = self.request.query_params.get('year')
         if department:
@@ -569,8 +865,15 @@ class TimetableViewSet(viewsets.ModelViewSet):
                 year_courses = Course.objects.filter(year=section.year, department=section.department, semester=section.semester)
                 section.courses.set(year_courses)
 
+        checkpoint_id = data.get('checkpoint_id') or uuid.uuid4().hex
+        if checkpoint_exists(checkpoint_id):
+            # Starting over would overwrite, then discard, the checkpoint of another run
+            return Response(
+                {'error': f'Checkpoint {checkpoint_id} belongs to another run; resume it or pick a new id'},
+                status=status.HTTP_409_CONFLICT
+            )
         try:
-            logger.info(f"Starting GA with department_ids={department_ids}, years={years}, semesters={semesters}")
+            logger.info(f"Starting GA with department_ids={department_ids}, years={years}, semesters={semesters}, checkpoint_id={checkpoint_id}")
 
             ga = GeneticAlgorithm(
                 department_ids=department_ids,
@@ -579,78 +882,126 @@ class TimetableViewSet(viewsets.ModelViewSet):
                 population_size=data.get('population_size', 100),
                 mutation_rate=data.get('mutation_rate', 0.1),
                 elite_rate=data.get('elite_rate', 0.1),
-                generations=data.get('generations', 1000)
+                generations=data.get('generations', 1000),
+                room_mode=data.get('room_mode', 'section'),
+                respect_active=data.get('respect_active', True),
+                mutation_operator=data.get('mutation_operator', 'random'),
+                crossover_operator=data.get('crossover_operator', 'single_point'),
+                diversity_response=data.get('diversity_response', 'none'),
+                checkpoint_id=checkpoint_id
             )
             logger.info(f"GA initialized with {len(ga.all_classes)} classes")
-            best_solution, fitness, fitness_progression = ga.evolve()
-            logger.info(f"GA completed with fitness {fitness}, best_solution length: {len(best_solution) if best_solution else 0}")
+            return self._run_generation(request, ga, semester_param)
 
-            # Log details about generated classes for troubleshooting
-            logger.info(f"Number of classes in best_solution: {len(best_solution) if best_solution else 0}")
-
-            missing_assignments = 0
-            if best_solution:
-                for class_obj in best_solution:
-                    keys = ('instructor', 'room', 'meeting_time', 'course', 'section')
-                    if not all(k in class_obj and class_obj[k] is not None for k in keys):
-                        missing_assignments += 1
-
-            logger.info(f"Classes skipped due to missing assignments: {missing_assignments}")
-
-            # naming metadata
-            departments_qs = Department.objects.filter(id__in=department_ids)
-            department_names = [d.name for d in departments_qs]
-            year_names = [f"Year {y}" for y in sorted(years)]
-            timetable_name = f"Combined Timetable - {', '.join(department_names)} - {', '.join(year_names)} - Semesters {semester_param} - {uuid.uuid4().hex[:8]}"
-
-            primary_department = departments_qs.first()
-
-            with transaction.atomic():
-                timetable = Timetable.objects.create(
-                    name=timetable_name,
-                    department=primary_department,
-                    year=min(years),
-                    semester=semesters[0],  # Use the first semester for the record
-                    fitness=fitness,
-                    fitness_progression=fitness_progression,
-                    created_by=request.user.username if request.user.is_authenticated else "admin"
-                )
+        except Exception as e:
+            logger.exception("Timetable generation failed")
+            return Response({'error': f'Failed to generate timetable: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-                if best_solution:
-                    for class_data in best_solution:
-                        keys = ('instructor', 'room', 'meeting_time', 'course', 'section')
-                        if not all(k in class_data and class_data[k] is not None for k in keys):
-                            continue
-
-                        class_id = f"{class_data['id']}_{uuid.uuid4().hex[:4]}"
-                        class_obj = Class.objects.create(
-                            class_id=class_id,
-                            course=class_data['course'],
-                            instructor=class_data['instructor'],
-                            meeting_time=class_data['meeting_time'],
-                            room=class_data['room'],
-                            section=class_data['section']
-                        )
-                        timetable.classes.add(class_obj)
-
-                if fitness >= 80:
-                    timetable.is_active = True
-                    timetable.save()
+    @action(detail=False, methods=['post'], permission_classes=[])
+    def resume(self, request):
+        """
+        Continue a generation run from its last checkpoint: { "checkpoint_id": "..." }.
+        Runs cut short by a worker restart or timeout leave their checkpoint behind;
+        GET checkpoints lists them.
+        """
+        serializer = TimetableResumeSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        checkpoint_id = serializer.validated_data['checkpoint_id']
 
-            return Response({
-                'message': 'Combined timetable generated successfully',
-                'timetable_id': timetable.id,
-                'fitness': fitness,
-                'total_classes': len(best_solution) if best_solution else 0,
-                'departments': department_names,
-                'years': sorted(years),
-                'semester': semester_param
-            }, status=status.HTTP_201_CREATED)
+        try:
+            ga = GeneticAlgorithm.from_checkpoint(checkpoint_id, progress_bar=False)
+        except FileNotFoundError:
+            return Response({'error': f'No checkpoint {checkpoint_id}'}, status=status.HTTP_404_NOT_FOUND)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+        # The checkpoint keeps the semester list; name the timetable the way generate did
+        semester_param = {(1, 3, 5, 7): 'odd', (2, 4, 6, 8): 'even'}.get(tuple(ga.semesters), str(ga.semesters[0]))
+        try:
+            logger.info(f"Resuming GA from checkpoint {checkpoint_id}")
+            return self._run_generation(request, ga, semester_param)
         except Exception as e:
             logger.exception("Timetable generation failed")
             return Response({'error': f'Failed to generate timetable: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @action(detail=False, methods=['get'], permission_classes=[])
+    def checkpoints(self, request):
+        """Generation runs that can be resumed, most recently checkpointed first"""
+        return Response(list_checkpoints())
+
+    def _run_generation(self, request, ga, semester_param):
+        """Evolve, save the best timetable and drop the run's checkpoint once it is stored."""
+        department_ids, years, semesters = ga.department_ids, ga.years, ga.semesters
+        best_solution, fitness, fitness_progression = ga.evolve()
+        logger.info(f"GA completed with fitness {fitness}, best_solution length: {len(best_solution) if best_solution else 0}")
+
+        # Log details about generated classes for troubleshooting
+        logger.info(f"Number of classes in best_solution: {len(best_solution) if best_solution else 0}")
+
+        missing_assignments = 0
+        if best_solution:
+            for class_obj in best_solution:
+                keys = ('instructor', 'room', 'meeting_time', 'course', 'section')
+                if not all(k in class_obj and class_obj[k] is not None for k in keys):
+                    missing_assignments += 1
+
+        logger.info(f"Classes skipped due to missing assignments: {missing_assignments}")
+
+        # naming metadata
+        departments_qs = Department.objects.filter(id__in=department_ids)
+        department_names = [d.name for d in departments_qs]
+        year_names = [f"Year {y}" for y in sorted(years)]
+        timetable_name = f"Combined Timetable - {', '.join(department_names)} - {', '.join(year_names)} - Semesters {semester_param} - {uuid.uuid4().hex[:8]}"
+
+        primary_department = departments_qs.first()
+
+        with transaction.atomic():
+            timetable = Timetable.objects.create(
+                name=timetable_name,
+                department=primary_department,
+                year=min(years),
+                semester=semesters[0],  # Use the first semester for the record
+                fitness=fitness,
+                fitness_progression=fitness_progression,
+                evolution_stats=ga.run_stats,
+                created_by=request.user.username if request.user.is_authenticated else "admin"
+            )
+
+            if best_solution:
+                for class_data in best_solution:
+                    keys = ('instructor', 'room', 'meeting_time', 'course', 'section')
+                    if not all(k in class_data and class_data[k] is not None for k in keys):
+                        continue
+
+                    class_id = f"{class_data['id']}_{uuid.uuid4().hex[:4]}"
+                    class_obj = Class.objects.create(
+                        class_id=class_id,
+                        course=class_data['course'],
+                        instructor=class_data['instructor'],
+                        meeting_time=class_data['meeting_time'],
+                        room=class_data['room'],
+                        section=class_data['section']
+                    )
+                    timetable.classes.add(class_obj)
+
+            if fitness >= 80:
+                timetable.is_active = True
+                timetable.save()
+                schedule_export_prerender(timetable)
+        discard_checkpoint(ga.checkpoint_id)
+
+        return Response({
+            'message': 'Combined timetable generated successfully',
+            'timetable_id': timetable.id,
+            'fitness': fitness,
+            'total_classes': len(best_solution) if best_solution else 0,
+            'departments': department_names,
+            'years': sorted(years),
+            'semester': semester_param,
+            'room_utilisation': ga.room_utilisation(best_solution or [])
+        }, status=status.HTTP_201_CREATED)
+
     # ----------------------------------------
     # View Timetable Schedule
     # ----------------------------------------
@@ -658,64 +1009,21 @@ class TimetableViewSet(viewsets.ModelViewSet):
     def view_schedule(self, request, pk=None):
         timetable = self.get_object()
         classes = timetable.classes.all().select_related('course', 'instructor', 'room', 'meeting_time', 'section')
-
-        sections_data = {}
-
-        for cls in classes:
-            if not all([cls.section, cls.meeting_time, cls.course, cls.instructor, cls.room]):
-                continue
-
-            section_id = cls.section.section_id
-            if section_id not in sections_data:
-                sections_data[section_id] = {
-                    'section_id': section_id,
-                    'section_name': cls.section.section_id,
-                    'schedule': {day: {} for day in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']},
-                    'courses': {},
-                    'instructors': {}
-                }
-
-            # Populate schedule
-            day = cls.meeting_time.day
-            duration_hours = getattr(cls.course, 'duration', 1)
-            start_time = cls.meeting_time.start_time
-            for i in range(duration_hours):
-                slot_start = (datetime.datetime.combine(datetime.date.today(), start_time) + datetime.timedelta(hours=i)).time()
-                slot_end = (datetime.datetime.combine(datetime.date.today(), slot_start) + datetime.timedelta(hours=1)).time()
-                time_slot = f"{slot_start.strftime('%H:%M:%S')}-{slot_end.strftime('%H:%M:%S')}"
-                is_start = (i == 0)
-
-                schedule_for_section = sections_data[section_id]['schedule']
-                schedule_for_section.setdefault(day, {})
-                schedule_for_section[day].setdefault(time_slot, [])
-                if not any(c['class_id'] == cls.class_id for c in schedule_for_section[day][time_slot]):
-                    schedule_for_section[day][time_slot].append({
-                        'class_id': cls.class_id, 'course': cls.course.course_name, 'course_id': cls.course.course_id,
-                        'instructor': cls.instructor.name, 'room': cls.room.room_number, 'section': cls.section.section_id,
-                        'course_type': cls.course.course_type, 'duration': duration_hours, 'is_start': is_start,
-                        'colspan': duration_hours if is_start else 1
-                    })
-
-            # Populate courses and instructors
-            course_key = cls.course.course_id
-            instructor_obj = cls.instructor
-            if course_key not in sections_data[section_id]['courses']:
-                sections_data[section_id]['courses'][course_key] = {'course_code': cls.course.course_id, 'course_name': cls.course.course_name, 'instructors': set()}
-            sections_data[section_id]['courses'][course_key]['instructors'].add(instructor_obj.name)
-
-            if instructor_obj.id not in sections_data[section_id]['instructors']:
-                sections_data[section_id]['instructors'][instructor_obj.id] = {'name': instructor_obj.name, 'email': instructor_obj.email, 'courses': set()}
-            sections_data[section_id]['instructors'][instructor_obj.id]['courses'].add(cls.course.course_name)
+        grid = build_timetable_grid(classes, days=SCHEDULE_DAYS)
 
         # Finalize data structure
         final_sections = []
-        for section_id, data in sorted(sections_data.items()):
-            courses_list = [{'course_code': c['course_code'], 'course_name': c['course_name'], 'instructors': sorted(list(c['instructors']))} for c in sorted(data['courses'].values(), key=lambda x: x['course_code'])]
-            instructors_list = [{'name': i['name'], 'email': i['email'], 'courses': sorted(list(i['courses']))} for i in sorted(data['instructors'].values(), key=lambda x: x['name'])]
-            
-            data['courses'] = courses_list
-            data['instructors'] = instructors_list
-            final_sections.append(data)
+        for section_id, section in sorted(grid.sections.items()):
+            courses_list = [{'course_code': c['course_code'], 'course_name': c['course_name'], 'instructors': sorted(list(c['instructors']))} for c in sorted(section.courses.values(), key=lambda x: x['course_code'])]
+            instructors_list = [{'name': i['name'], 'email': i['email'], 'courses': sorted(list(i['courses']))} for i in sorted(section.instructors.values(), key=lambda x: x['name'])]
+
+            final_sections.append({
+                'section_id': section_id,
+                'section_name': section_id,
+                'schedule': section.schedule,
+                'courses': courses_list,
+                'instructors': instructors_list
+            })
 
         return Response({
             'timetable_name': timetable.name, 'fitness': timetable.fitness,
@@ -728,20 +1036,55 @@ class TimetableViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def export_pdf(self, request, pk=None):
         timetable = self.get_object()
-        pdf_content = export_timetable_pdf(timetable)
-        response = HttpResponse(pdf_content, content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="{timetable.name}.pdf"'
-        return response
+        return self._export_response(request, timetable, 'pdf', 'application/pdf', 'pdf')
 
     @action(detail=True, methods=['get'])
     def export_excel(self, request, pk=None):
+        """
+        Download the timetable as Excel.
+        Pass ?stream=true for large timetables: one write-only sheet per section,
+        streamed from a temporary file instead of being built in memory.
+        """
+        timetable = self.get_object()
+        if request.query_params.get('stream', '').lower() in ('1', 'true', 'yes'):
+            return FileResponse(
+                export_timetable_excel_stream(timetable),
+                as_attachment=True,
+                filename=f"{timetable.name}.xlsx",
+                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            )
+        return self._export_response(
+            request, timetable, 'excel',
+            'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'
+        )
+
+    @action(detail=True, methods=['get'])
+    def export_bundle(self, request, pk=None):
+        """
+        Download a ZIP with one PDF per section (sections/<id>.pdf).
+        ?instructors=true also adds one PDF per instructor (instructors/<name>.pdf);
+        ?merged=true returns the single combined PDF instead of a ZIP.
+        """
         timetable = self.get_object()
-        excel_content = export_timetable_excel(timetable)
-        response = HttpResponse(
-            excel_content,
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        if request.query_params.get('merged', '').lower() in ('1', 'true', 'yes'):
+            return self._export_response(request, timetable, 'pdf', 'application/pdf', 'pdf')
+        include_instructors = request.query_params.get('instructors', '').lower() in ('1', 'true', 'yes')
+        return FileResponse(
+            export_timetable_bundle(timetable, include_instructors=include_instructors),
+            as_attachment=True,
+            filename=f"{timetable.name}.zip",
+            content_type='application/zip'
         )
-        response['Content-Disposition'] = f'attachment; filename="{timetable.name}.xlsx"'
+
+    def _export_response(self, request, timetable, fmt, content_type, extension):
+        """Serve a cached export artifact, answering If-None-Match with 304."""
+        etag = export_artifact_etag(timetable, fmt)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(get_export_artifact(timetable, fmt), content_type=content_type)
+            response['Content-Disposition'] = f'attachment; filename="{timetable.name}.{extension}"'
+        response['ETag'] = etag
+        response['Cache-Control'] = 'no-cache'
         return response
 
     # ----------------------------------------
@@ -767,6 +1110,9 @@ class TimetableViewSet(viewsets.ModelViewSet):
         # Activate the selected timetable
         timetable.is_active = True
         timetable.save()
+
+        # Warm the PDF/Excel downloads students are about to request
+        schedule_export_prerender(timetable)
         return Response({'message': 'Timetable activated successfully'})
 
 
@@ -785,3 +1131,45 @@ def get_user(request):
         'last_name': user.last_name,
         'is_staff': user.is_staff,
     })
+
+
+# ----------------------------------------
+# ✅ Reference-data cache statistics
+# ----------------------------------------
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def cache_statistics(request):
+    """Hit/miss counters of the reference-data cache, per endpoint and GA loader."""
+    return Response(cache_stats())
+
+
+# ----------------------------------------
+# ✅ Curriculum import (CSV / JSON / JSON Lines / XLSX)
+# ----------------------------------------
+@api_view(['POST'])
+@permission_classes([permissions.IsAdminUser])
+@parser_classes([MultiPartParser])
+def import_curriculum(request):
+    """
+    Upload a curriculum file as multipart field `file`; format comes from the file name
+    or `?file_format=` (DRF reserves `?format=` for renderers). Pass `?dry_run=true` to
+    validate without writing.
+    Returns created/updated counts and per-row errors.
+    """
+    return _import_upload(request, CurriculumImporter(dry_run=_query_flag(request, 'dry_run')))
+
+
+def _query_flag(request, name):
+    return request.query_params.get(name, '').lower() in ('1', 'true', 'yes')
+
+
+def _import_upload(request, importer):
+    """Run an importer over the multipart `file` upload (format from its name or ?file_format=)."""
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({'error': 'Upload the data as the "file" field'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        report = import_file(importer, upload.file, filename=upload.name, fmt=request.query_params.get('file_format'))
+    except (ImportFormatError, UnicodeDecodeError) as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(report)